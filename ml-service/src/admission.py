@@ -0,0 +1,213 @@
+"""
+Admission Control Module
+Bounds concurrent inference work per client and globally, and sheds load fast when saturated.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+# Request priorities (lower value is served first)
+INTERACTIVE = 0
+BULK = 1
+
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BULK: 'bulk'}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, status_code, detail, retry_after):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Priority admission queue for the event loop
+
+    At most max_concurrent requests run at once and each identified client
+    may hold at most max_per_client running or queued slots (anonymous
+    requests, client_id None, are only bounded globally). Excess requests wait in a
+    bounded queue where interactive requests are served before bulk ones; a
+    full queue, a long wait or an exhausted client quota is answered
+    immediately with 429/503 and a Retry-After hint.
+
+    All state is only touched from the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, max_concurrent=8, max_per_client=4, max_queue=64, queue_timeout=2.0):
+        """
+        Args:
+            max_concurrent: Requests allowed to run at the same time
+            max_per_client: Running plus queued requests allowed per client
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout: Seconds a request may wait before being shed
+        """
+        self.max_concurrent = max_concurrent
+        self.max_per_client = max_per_client
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.active = 0
+        self._per_client = defaultdict(int)
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._service_time = 0.05  # EWMA of request service time (seconds)
+
+        self.counters = {
+            'admitted': {name: 0 for name in PRIORITY_NAMES.values()},
+            'enqueued': {name: 0 for name in PRIORITY_NAMES.values()},
+            'shed': {
+                'client_limit': 0,
+                'queue_full': 0,
+                'queue_timeout': 0,
+                'preempted': 0
+            }
+        }
+
+    def _retry_after(self):
+        """Seconds until the current queue is expected to drain"""
+        backlog = len(self._waiters) + self.active
+        return max(1, math.ceil(backlog * self._service_time / self.max_concurrent))
+
+    def _reject(self, reason, status_code, detail):
+        self.counters['shed'][reason] += 1
+        return AdmissionRejected(status_code, detail, self._retry_after())
+
+    @asynccontextmanager
+    async def admit(self, client_id, priority=INTERACTIVE):
+        """
+        Hold an execution slot for the duration of the block
+
+        Args:
+            client_id: Caller counted against max_per_client, or None to skip
+                the per-client quota
+            priority: INTERACTIVE or BULK
+
+        Raises:
+            AdmissionRejected: if the request is shed
+        """
+        await self._acquire(client_id, priority)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._service_time = 0.9 * self._service_time + 0.1 * elapsed
+            self._release(client_id)
+
+    async def _acquire(self, client_id, priority):
+        if client_id is not None and self._per_client[client_id] >= self.max_per_client:
+            raise self._reject(
+                'client_limit', 429,
+                f"Too many concurrent requests from this client (limit {self.max_per_client})"
+            )
+
+        if self.active < self.max_concurrent and not self._has_waiter_at_or_above(priority):
+            self._grant(client_id, priority)
+            return
+
+        if len(self._waiters) >= self.max_queue and not self._preempt_for(priority):
+            raise self._reject('queue_full', 503, "Service overloaded; request queue is full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._sequence), client_id, future]
+        heapq.heappush(self._waiters, entry)
+        if client_id is not None:
+            self._per_client[client_id] += 1
+        self.counters['enqueued'][PRIORITY_NAMES[priority]] += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Granted just as the wait timed out: keep the slot
+                return
+            self._remove_waiter(entry)
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+            raise self._reject('queue_timeout', 503, "Service overloaded; timed out waiting for a slot")
+        except asyncio.CancelledError:
+            # Client went away while queued
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._release(client_id)
+            else:
+                self._remove_waiter(entry)
+            raise
+
+    def _has_waiter_at_or_above(self, priority):
+        return bool(self._waiters) and self._waiters[0][0] <= priority
+
+    def _grant(self, client_id, priority, queued=False):
+        self.active += 1
+        if not queued and client_id is not None:
+            self._per_client[client_id] += 1
+        self.counters['admitted'][PRIORITY_NAMES[priority]] += 1
+
+    def _remove_waiter(self, entry):
+        """Drop a waiter that gave up (no-op if it was already dispatched or preempted)"""
+        if entry in self._waiters:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._decrement_client(entry[2])
+
+    def _preempt_for(self, priority):
+        """
+        Make room in a full queue by shedding the newest lower-priority waiter
+
+        Returns:
+            True if a waiter was shed
+        """
+        lower = [entry for entry in self._waiters if entry[0] > priority]
+        if not lower:
+            return False
+        victim = max(lower, key=lambda entry: (entry[0], entry[1]))
+        self._waiters.remove(victim)
+        heapq.heapify(self._waiters)
+        self._decrement_client(victim[2])
+        victim[3].set_exception(self._reject(
+            'preempted', 503, "Service overloaded; bulk request shed in favour of interactive traffic"
+        ))
+        return True
+
+    def _release(self, client_id):
+        self.active -= 1
+        self._decrement_client(client_id)
+        self._dispatch()
+
+    def _decrement_client(self, client_id):
+        if client_id is None:
+            return
+        self._per_client[client_id] -= 1
+        if self._per_client[client_id] <= 0:
+            del self._per_client[client_id]
+
+    def _dispatch(self):
+        """Hand free slots to the highest-priority waiters"""
+        while self.active < self.max_concurrent and self._waiters:
+            priority, _, client_id, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._grant(client_id, priority, queued=True)
+            future.set_result(True)
+
+    def stats(self):
+        """Return current load and shed counters"""
+        return {
+            'active': self.active,
+            'queued': len(self._waiters),
+            'max_concurrent': self.max_concurrent,
+            'max_per_client': self.max_per_client,
+            'max_queue': self.max_queue,
+            'queue_timeout': self.queue_timeout,
+            'avg_service_ms': self._service_time * 1000,
+            **self.counters,
+            'shed_total': sum(self.counters['shed'].values())
+        }
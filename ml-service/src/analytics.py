@@ -0,0 +1,177 @@
+"""
+Cohort Analytics Module
+Placement, salary and skill-gap summaries of scored cohorts computed with NumPy aggregations.
+"""
+
+import numpy as np
+import pandas as pd
+
+from predict import PlacementPredictor, LOW_PROBABILITY
+
+SALARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Two-sided 95% normal interval
+Z_95 = 1.959964
+
+
+def _group_codes(keys):
+    """
+    Factorize group key columns
+
+    Returns:
+        (int array of group codes, list of key dicts in code order)
+    """
+    codes, uniques = pd.MultiIndex.from_frame(keys.astype(str)).factorize(sort=True)
+    return codes.astype(np.int64), [dict(zip(keys.columns, values)) for values in uniques]
+
+
+def _binned_counts(codes, bins, n_groups, n_bins):
+    """Per-group histogram counts as an (n_groups, n_bins) array"""
+    return np.bincount(codes * n_bins + bins, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+
+
+def _group_quantiles(codes, values, n_groups, quantiles):
+    """
+    Linear-interpolated quantiles of values within each group
+
+    Returns:
+        (n_groups, len(quantiles)) array, NaN for empty groups
+    """
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    positions = starts[:, None] + np.asarray(quantiles)[None, :] * np.maximum(sizes - 1, 0)[:, None]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    result = np.full(positions.shape, np.nan)
+    present = sizes > 0
+    if present.any():
+        lo_values = sorted_values[lower[present]]
+        hi_values = sorted_values[upper[present]]
+        result[present] = lo_values + (hi_values - lo_values) * (positions[present] - lower[present])
+    return result
+
+
+def _float(value):
+    """JSON-safe float (None for NaN)"""
+    return None if np.isnan(value) else float(value)
+
+
+def summarize_cohort(inputs, outputs, keys=None, probability_bins=10, salary_bins=20):
+    """
+    Summarize a scored cohort overall and per group
+
+    Expected placement counts treat students as independent Bernoulli trials:
+    the expectation is the sum of probabilities and the variance the sum of
+    p * (1 - p).
+
+    Args:
+        inputs: DataFrame of raw student inputs
+        outputs: dict of arrays from PlacementPredictor.column_outputs
+        keys: Optional DataFrame of group key columns aligned with the rows
+        probability_bins: Number of equal-width placement probability bins
+        salary_bins: Number of equal-width expected salary bins
+
+    Returns:
+        dict with bin edges, an overall summary and one summary per group
+    """
+    probability = np.asarray(outputs['probability'], dtype=np.float64)
+    placed = np.asarray(outputs['placed'], dtype=bool)
+    salary = np.asarray(outputs['expected_salary'], dtype=np.float64)
+    n_rows = len(probability)
+
+    probability_edges = np.linspace(0, 1, probability_bins + 1)
+    probability_bin = np.clip((probability * probability_bins).astype(np.int64), 0, probability_bins - 1)
+
+    has_salary = ~np.isnan(salary)
+    salaries = salary[has_salary]
+    if len(salaries):
+        salary_edges = np.linspace(salaries.min(), salaries.max(), salary_bins + 1)
+        if salary_edges[0] == salary_edges[-1]:
+            salary_edges = salary_edges + np.arange(salary_bins + 1)
+        salary_bin = np.clip(
+            np.searchsorted(salary_edges, salaries, side='right') - 1, 0, salary_bins - 1
+        )
+    else:
+        salary_edges = np.zeros(0)
+        salary_bin = np.zeros(0, dtype=np.int64)
+
+    masks, overall_score = PlacementPredictor.skill_gap_masks(inputs)
+    n_gaps = np.sum(list(masks.values()), axis=0)
+    # 0 = low, 1 = medium, 2 = high, as in analyze_skill_gaps
+    potential = np.where(n_gaps > 2, 2, np.where(n_gaps > 0, 1, 0))
+    low_probability = probability < LOW_PROBABILITY
+
+    def summaries(codes, n_groups):
+        students = np.bincount(codes, minlength=n_groups)
+        expected = np.bincount(codes, weights=probability, minlength=n_groups)
+        variance = np.bincount(codes, weights=probability * (1 - probability), minlength=n_groups)
+        predicted = np.bincount(codes, weights=placed, minlength=n_groups)
+        probability_counts = _binned_counts(codes, probability_bin, n_groups, probability_bins)
+
+        salary_codes = codes[has_salary]
+        with_salary = np.bincount(salary_codes, minlength=n_groups)
+        salary_sum = np.bincount(salary_codes, weights=salaries, minlength=n_groups)
+        salary_counts = _binned_counts(salary_codes, salary_bin, n_groups, salary_bins)
+        salary_quantiles = _group_quantiles(salary_codes, salaries, n_groups, SALARY_QUANTILES)
+
+        gap_counts = {area: np.bincount(codes, weights=mask, minlength=n_groups) for area, mask in masks.items()}
+        potential_counts = _binned_counts(codes, potential, n_groups, 3)
+        low_counts = np.bincount(codes, weights=low_probability, minlength=n_groups)
+        score_sum = np.bincount(codes, weights=overall_score, minlength=n_groups)
+
+        results = []
+        for g in range(n_groups):
+            n = int(students[g])
+            std = float(np.sqrt(variance[g]))
+            rate = expected[g] / n if n else np.nan
+            results.append({
+                'students': n,
+                'placement': {
+                    'predicted_placed': int(predicted[g]),
+                    'expected_placed': float(expected[g]),
+                    'expected_placed_variance': float(variance[g]),
+                    'expected_placed_std': std,
+                    'expected_rate': _float(rate),
+                    'expected_rate_interval': [
+                        _float(max(rate - Z_95 * std / n, 0.0)), _float(min(rate + Z_95 * std / n, 1.0))
+                    ] if n else [None, None],
+                    'probability_histogram': probability_counts[g].tolist()
+                },
+                'salary': {
+                    'students_with_salary': int(with_salary[g]),
+                    'mean': _float(salary_sum[g] / with_salary[g]) if with_salary[g] else None,
+                    'quantiles': {
+                        str(q): _float(value) for q, value in zip(SALARY_QUANTILES, salary_quantiles[g])
+                    },
+                    'histogram': salary_counts[g].tolist()
+                },
+                'skill_gaps': {
+                    area: {'count': int(counts[g]), 'rate': float(counts[g] / n) if n else None}
+                    for area, counts in gap_counts.items()
+                },
+                'improvement_potential': {
+                    'low': int(potential_counts[g][0]),
+                    'medium': int(potential_counts[g][1]),
+                    'high': int(potential_counts[g][2])
+                },
+                'low_probability_students': int(low_counts[g]),
+                'mean_overall_score': float(score_sum[g] / n) if n else None
+            })
+        return results
+
+    summary = {
+        'rows': n_rows,
+        'probability_bin_edges': probability_edges.tolist(),
+        'salary_bin_edges': salary_edges.tolist(),
+        'overall': summaries(np.zeros(n_rows, dtype=np.int64), 1)[0]
+    }
+    if keys is not None:
+        codes, key_dicts = _group_codes(keys)
+        summary['groups'] = [
+            {'group': key, **group_summary}
+            for key, group_summary in zip(key_dicts, summaries(codes, len(key_dicts)))
+        ]
+    return summary
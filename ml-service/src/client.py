@@ -0,0 +1,128 @@
+"""
+Columnar Scoring Client
+Pooled HTTP client for /predict/columnar with automatic chunking, for internal batch jobs.
+
+Usage:
+    client = ColumnarScoringClient("http://localhost:8000")
+    scores = client.score(students)  # list of dicts, DataFrame or dict of columns
+    scores['probability']            # numpy array in input order
+    scores['errors']                 # [{'row': i, 'errors': [...]}] for rejected rows
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import columnar
+from preprocessing import INPUT_COLUMNS
+
+
+class ColumnarScoringClient:
+    """Score large cohorts over the binary columnar transport"""
+
+    def __init__(self, base_url='http://localhost:8000', chunk_size=5000, max_workers=4,
+                 timeout=60, retries=3, client_id=None):
+        """
+        Args:
+            base_url: ML service base URL
+            chunk_size: Rows per request
+            max_workers: Concurrent requests (also the connection pool size)
+            timeout: Per-request timeout in seconds
+            retries: Retries on connection errors and 429/503 (honouring Retry-After)
+            client_id: Optional X-Client-Id sent for admission control
+        """
+        self.url = base_url.rstrip('/') + '/predict/columnar'
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset({'POST'}),
+            respect_retry_after_header=True
+        )
+        self.session = requests.Session()
+        self.session.mount(
+            'http://', HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        )
+        self.session.mount(
+            'https://', HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        )
+        self.session.headers['Content-Type'] = columnar.MEDIA_TYPE
+        self.session.headers['Accept'] = columnar.MEDIA_TYPE
+        if client_id:
+            self.session.headers['X-Client-Id'] = client_id
+
+    @staticmethod
+    def _to_columns(students):
+        """Convert records, a DataFrame or a dict of columns to column arrays"""
+        if isinstance(students, dict):
+            return {col: np.asarray(students[col]) for col in INPUT_COLUMNS}
+        df = students if isinstance(students, pd.DataFrame) else pd.DataFrame(students)
+        return {col: df[col].to_numpy() for col in INPUT_COLUMNS}
+
+    def _score_chunk(self, columns):
+        """Send one chunk and decode its result columns"""
+        response = self.session.post(
+            self.url, data=columnar.encode_columns(columns), timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"Scoring failed with HTTP {response.status_code}: {response.text[:200]}")
+        result, extra = columnar.decode_columns(response.content)
+        result['model_version'] = extra.get('model_version')
+        result['errors'] = extra.get('errors', [])
+        return result
+
+    def score(self, students):
+        """
+        Score students, splitting them into chunks sent concurrently
+
+        Args:
+            students: list of dicts, DataFrame or dict of column arrays
+
+        Returns:
+            dict of numpy arrays (placed, probability, confidence,
+            expected_salary, valid) in input order, plus model_version and
+            the errors of rejected rows (row indices into students)
+        """
+        columns = self._to_columns(students)
+        n_rows = len(columns[INPUT_COLUMNS[0]])
+        chunks = [
+            {col: values[start:start + self.chunk_size] for col, values in columns.items()}
+            for start in range(0, n_rows, self.chunk_size)
+        ]
+        if not chunks:
+            return {'placed': np.zeros(0, dtype=bool), 'probability': np.zeros(0),
+                    'confidence': np.zeros(0), 'expected_salary': np.zeros(0),
+                    'valid': np.zeros(0, dtype=bool), 'model_version': None, 'errors': []}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._score_chunk, chunks))
+
+        versions = {result.pop('model_version') for result in results}
+        errors = [
+            {**error, 'row': start + error['row']}
+            for start, result in zip(range(0, n_rows, self.chunk_size), results)
+            for error in result.pop('errors')
+        ]
+        merged = {name: np.concatenate([result[name] for result in results]) for name in results[0]}
+        merged['errors'] = errors
+        # A model reload between chunks would mix versions; report all of them
+        merged['model_version'] = versions.pop() if len(versions) == 1 else sorted(versions)
+        return merged
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
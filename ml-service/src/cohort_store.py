@@ -0,0 +1,517 @@
+"""
+Cohort Store Module
+Memory-mapped columnar store of scored cohorts with incremental re-scoring on model update.
+
+Each cohort is a directory holding .npy arrays that are opened with mmap:
+
+    features.npy                  float64 (n_rows, n_features) encoded features
+    student_ids.npy               optional unicode ids (one per row)
+    outputs-<model_version>.npy   structured array of model outputs
+    changes-<from>-<to>.npy       rows changed by the last re-score
+    meta.json                     model version, feature columns, encoder classes, row count
+
+Usage:
+    python cohort_store.py ingest <name> <students.csv|parquet|ndjson> [--id-column COL]
+    python cohort_store.py rescore <name> [--models-dir DIR] [--salary-threshold INR]
+    python cohort_store.py list
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: writers are only serialized within a process
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+
+OUTPUT_DTYPE = np.dtype([
+    ('placed', '?'),
+    ('probability', '<f8'),
+    ('confidence', '<f8'),
+    ('expected_salary', '<f8')
+])
+
+CHANGE_DTYPE = np.dtype([
+    ('row', '<i8'),
+    ('old_placed', '?'),
+    ('new_placed', '?'),
+    ('old_probability', '<f8'),
+    ('new_probability', '<f8'),
+    ('old_expected_salary', '<f8'),
+    ('new_expected_salary', '<f8')
+])
+
+# Rows scored per vectorized chunk
+CHUNK_SIZE = 50000
+
+# Default absolute change in expected salary (INR) that counts as changed
+SALARY_CHANGE_THRESHOLD = 50000
+
+COHORT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$')
+
+# Attempts to map a cohort while a concurrent re-score or replace swaps its files
+OPEN_ATTEMPTS = 5
+
+
+class IncompatibleCohortError(ValueError):
+    """Raised when models encode features differently from a stored cohort"""
+
+
+def encodings(preprocessor):
+    """Classes of every fitted label encoder, in code order"""
+    return {col: [str(value) for value in le.classes_] for col, le in preprocessor.label_encoders.items()}
+
+
+def check_compatible(meta, predictor):
+    """
+    Check that predictor encodes features the way a stored cohort was encoded
+
+    Stored rows hold label codes, so a model whose encoders have different
+    classes would silently score and decode them as other categories.
+
+    Raises:
+        IncompatibleCohortError: if the feature columns or encoder classes differ
+    """
+    if meta['feature_columns'] != list(predictor.preprocessor.feature_columns):
+        raise IncompatibleCohortError("Model features do not match the cohort's stored features")
+    stored = meta.get('encodings')
+    if stored is None:
+        # Cohorts stored before encodings were recorded can only be trusted
+        # with the models that scored them
+        if meta['model_version'] != predictor.model_version:
+            raise IncompatibleCohortError(
+                "Cohort was stored without its encoder classes; re-ingest it to use it with other models"
+            )
+        return
+    current = encodings(predictor.preprocessor)
+    for col in sorted(set(stored) | set(current)):
+        if stored.get(col) != current.get(col):
+            raise IncompatibleCohortError(f"Model encodes '{col}' differently from the cohort's stored features")
+
+
+def _write_atomic(path, write):
+    """Write a file through a temporary file and an atomic rename"""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+class CohortStore:
+    """Directory of scored cohorts"""
+
+    def __init__(self, root):
+        """
+        Args:
+            root: Directory holding one subdirectory per cohort
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        # Serializes writers (create, rescore, delete); readers use the mmapped files
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _writer(self):
+        """
+        Hold the store's write lock across threads and processes
+
+        Pre-forked workers re-scoring on reload and the CLI share the store
+        directory, so the thread lock is backed by a flock on .lock in the root.
+        """
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _cohort_dir(self, name):
+        if not COHORT_NAME_PATTERN.match(name):
+            raise ValueError(
+                "Cohort names may only contain letters, digits, '_', '.' and '-' (max 64 characters)"
+            )
+        return os.path.join(self.root, name)
+
+    def _meta(self, name):
+        path = os.path.join(self._cohort_dir(name), 'meta.json')
+        if not os.path.exists(path):
+            raise KeyError(name)
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, name, meta):
+        _write_atomic(
+            os.path.join(self._cohort_dir(name), 'meta.json'),
+            lambda f: f.write(json.dumps(meta, indent=2).encode())
+        )
+
+    def list(self):
+        """Return the metadata of every stored cohort"""
+        cohorts = []
+        for name in sorted(os.listdir(self.root)):
+            try:
+                cohorts.append(self._meta(name))
+            except (KeyError, ValueError):
+                continue
+        return cohorts
+
+    def info(self, name):
+        """
+        Return a cohort's metadata
+
+        Raises:
+            KeyError: if the cohort does not exist
+        """
+        return self._meta(name)
+
+    def create(self, name, predictor, columns, student_ids=None, chunk_size=CHUNK_SIZE):
+        """
+        Encode, score and store a cohort (replacing any cohort with the same name)
+
+        Args:
+            name: Cohort name
+            predictor: PlacementPredictor used for encoding and scoring
+            columns: dict mapping each input column to an array (or a DataFrame)
+            student_ids: Optional ids aligned with the rows
+            chunk_size: Rows encoded and scored per chunk
+
+        Returns:
+            The cohort's metadata
+        """
+        with self._writer():
+            return self._create(name, predictor, columns, student_ids, chunk_size)
+
+    def _create(self, name, predictor, columns, student_ids, chunk_size):
+        cohort_dir = self._cohort_dir(name)
+        if isinstance(columns, pd.DataFrame):
+            columns = {col: columns[col].to_numpy() for col in columns.columns}
+        columns = {col: np.asarray(values) for col, values in columns.items()}
+        n_rows = len(next(iter(columns.values()))) if columns else 0
+        if student_ids is not None and len(student_ids) != n_rows:
+            raise ValueError(f"Got {len(student_ids)} student ids for {n_rows} rows")
+
+        feature_columns = list(predictor.preprocessor.feature_columns)
+        model_version = predictor.model_version
+
+        # Build the new cohort next to the old one and swap directories at the end
+        staging_dir = os.path.join(self.root, f".staging-{name}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        try:
+            features = open_memmap(
+                os.path.join(staging_dir, 'features.npy'), mode='w+',
+                dtype=np.float64, shape=(n_rows, len(feature_columns))
+            )
+            outputs = open_memmap(
+                os.path.join(staging_dir, f'outputs-{model_version}.npy'), mode='w+',
+                dtype=OUTPUT_DTYPE, shape=(n_rows,)
+            )
+            for start in range(0, n_rows, chunk_size):
+                chunk = {col: values[start:start + chunk_size] for col, values in columns.items()}
+                X = predictor.preprocessor.preprocess_columns(chunk)
+                features[start:start + len(X)] = X.to_numpy(dtype=np.float64)
+                self._fill_outputs(outputs, start, predictor.column_outputs(predictor.score_features(X)))
+            features.flush()
+            outputs.flush()
+            del features, outputs
+
+            if student_ids is not None:
+                np.save(os.path.join(staging_dir, 'student_ids.npy'), np.asarray(student_ids, dtype=str))
+
+            now = time.time()
+            meta = {
+                'name': name,
+                'rows': n_rows,
+                'feature_columns': feature_columns,
+                'encodings': encodings(predictor.preprocessor),
+                'model_version': model_version,
+                'has_student_ids': student_ids is not None,
+                'created_at': now,
+                'scored_at': now,
+                'last_rescore': None
+            }
+            with open(os.path.join(staging_dir, 'meta.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+
+            if os.path.exists(cohort_dir):
+                retired_dir = os.path.join(self.root, f".retired-{name}")
+                shutil.rmtree(retired_dir, ignore_errors=True)
+                os.replace(cohort_dir, retired_dir)
+                os.replace(staging_dir, cohort_dir)
+                shutil.rmtree(retired_dir, ignore_errors=True)
+            else:
+                os.replace(staging_dir, cohort_dir)
+            return meta
+        finally:
+            # Only left behind when building failed (it is renamed into place otherwise)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    @staticmethod
+    def _fill_outputs(outputs, start, scores):
+        stop = start + len(scores['placed'])
+        for field in OUTPUT_DTYPE.names:
+            outputs[field][start:stop] = scores[field]
+
+    def delete(self, name):
+        """
+        Remove a cohort
+
+        Raises:
+            KeyError: if the cohort does not exist
+        """
+        with self._writer():
+            self._meta(name)
+            shutil.rmtree(self._cohort_dir(name))
+
+    def open(self, name):
+        """
+        Map a cohort's arrays read-only
+
+        A re-score deletes the superseded outputs file and a replace swaps the
+        whole directory; if a file disappears between reading the metadata
+        and mapping it, the metadata is read again. Once mapped, arrays stay
+        readable even if their files are removed.
+
+        Returns:
+            dict with meta, features, outputs and student_ids (or None)
+
+        Raises:
+            KeyError: if the cohort does not exist
+        """
+        cohort_dir = self._cohort_dir(name)
+        ids_path = os.path.join(cohort_dir, 'student_ids.npy')
+        for attempt in range(OPEN_ATTEMPTS):
+            meta = self._meta(name)
+            try:
+                return {
+                    'meta': meta,
+                    'features': np.load(os.path.join(cohort_dir, 'features.npy'), mmap_mode='r'),
+                    'outputs': np.load(
+                        os.path.join(cohort_dir, f"outputs-{meta['model_version']}.npy"), mmap_mode='r'
+                    ),
+                    'student_ids': np.load(ids_path, mmap_mode='r') if meta['has_student_ids'] else None
+                }
+            except FileNotFoundError:
+                if attempt == OPEN_ATTEMPTS - 1:
+                    raise
+                time.sleep(0.01 * (attempt + 1))
+
+    def rescore(self, name, predictor, salary_threshold=SALARY_CHANGE_THRESHOLD, chunk_size=CHUNK_SIZE):
+        """
+        Apply predictor's models to a stored cohort and record the rows whose
+        placement decision or expected salary changed
+
+        Stored features are reused as-is, so the new models must share the
+        cohort's feature columns and encoder classes (IncompatibleCohortError
+        otherwise). New outputs are written to a separate file and the cohort
+        switches to them in one metadata rename, so readers never see a half
+        re-scored cohort.
+
+        Args:
+            name: Cohort name
+            predictor: PlacementPredictor holding the new models
+            salary_threshold: Minimum absolute change in expected salary (INR)
+            chunk_size: Rows scored per vectorized chunk
+
+        Returns:
+            Summary dict of the re-score
+        """
+        with self._writer():
+            return self._rescore(name, predictor, salary_threshold, chunk_size)
+
+    def _rescore(self, name, predictor, salary_threshold, chunk_size):
+        cohort = self.open(name)
+        meta = cohort['meta']
+        check_compatible(meta, predictor)
+
+        old_version = meta['model_version']
+        new_version = predictor.model_version
+        cohort_dir = self._cohort_dir(name)
+        if new_version == old_version:
+            return {
+                'cohort': name, 'from_version': old_version, 'to_version': new_version,
+                'rows': meta['rows'], 'changed': 0, 'skipped': True
+            }
+
+        start_time = time.perf_counter()
+        features, old_outputs = cohort['features'], cohort['outputs']
+        n_rows = meta['rows']
+        new_path = os.path.join(cohort_dir, f'outputs-{new_version}.npy')
+        tmp_path = f"{new_path}.tmp.{os.getpid()}"
+        new_outputs = open_memmap(tmp_path, mode='w+', dtype=OUTPUT_DTYPE, shape=(n_rows,))
+
+        changes = []
+        counts = {'placement_flips': 0, 'salary_changes': 0}
+        for start in range(0, n_rows, chunk_size):
+            X = pd.DataFrame(
+                np.asarray(features[start:start + chunk_size]), columns=meta['feature_columns']
+            )
+            scores = predictor.column_outputs(predictor.score_features(X))
+            self._fill_outputs(new_outputs, start, scores)
+
+            old = old_outputs[start:start + len(X)]
+            flipped = old['placed'] != scores['placed']
+            old_salary, new_salary = old['expected_salary'], scores['expected_salary']
+            # A salary appearing or disappearing counts as a change
+            salary_changed = np.where(
+                np.isnan(old_salary) | np.isnan(new_salary),
+                np.isnan(old_salary) != np.isnan(new_salary),
+                np.abs(new_salary - old_salary) >= salary_threshold
+            )
+            counts['placement_flips'] += int(flipped.sum())
+            counts['salary_changes'] += int(salary_changed.sum())
+
+            rows = np.flatnonzero(flipped | salary_changed)
+            if len(rows):
+                chunk_changes = np.empty(len(rows), dtype=CHANGE_DTYPE)
+                chunk_changes['row'] = rows + start
+                chunk_changes['old_placed'] = old['placed'][rows]
+                chunk_changes['new_placed'] = scores['placed'][rows]
+                chunk_changes['old_probability'] = old['probability'][rows]
+                chunk_changes['new_probability'] = scores['probability'][rows]
+                chunk_changes['old_expected_salary'] = old_salary[rows]
+                chunk_changes['new_expected_salary'] = new_salary[rows]
+                changes.append(chunk_changes)
+
+        new_outputs.flush()
+        del new_outputs
+        os.replace(tmp_path, new_path)
+
+        changes = np.concatenate(changes) if changes else np.empty(0, dtype=CHANGE_DTYPE)
+        changes_file = f'changes-{old_version}-{new_version}.npy'
+        _write_atomic(
+            os.path.join(cohort_dir, changes_file),
+            lambda f: np.save(f, changes)
+        )
+
+        summary = {
+            'cohort': name,
+            'from_version': old_version,
+            'to_version': new_version,
+            'rows': n_rows,
+            'changed': len(changes),
+            **counts,
+            'salary_threshold': salary_threshold,
+            'changes_file': changes_file,
+            'duration_ms': (time.perf_counter() - start_time) * 1000
+        }
+        self._write_meta(name, {
+            **meta,
+            'encodings': encodings(predictor.preprocessor),
+            'model_version': new_version,
+            'scored_at': time.time(),
+            'last_rescore': summary
+        })
+
+        # Drop files superseded by this re-score
+        del cohort, features, old_outputs
+        for filename in os.listdir(cohort_dir):
+            if (filename.startswith('outputs-') and filename != f'outputs-{new_version}.npy') or \
+                    (filename.startswith('changes-') and filename != changes_file):
+                os.remove(os.path.join(cohort_dir, filename))
+        return summary
+
+    def changes(self, name, offset=0, limit=1000):
+        """
+        Page through the rows changed by the last re-score
+
+        Returns:
+            dict with the re-score summary, total and a list of change records
+            (including student_id when the cohort has ids)
+        """
+        meta = self._meta(name)
+        summary = meta['last_rescore']
+        if summary is None:
+            return {'last_rescore': None, 'total': 0, 'changes': []}
+
+        cohort_dir = self._cohort_dir(name)
+        changes = np.load(os.path.join(cohort_dir, summary['changes_file']), mmap_mode='r')
+        page = np.asarray(changes[offset:offset + limit])
+        records = [
+            {field: None if value != value else value.item() for field, value in zip(CHANGE_DTYPE.names, row)}
+            for row in page
+        ]
+        if meta['has_student_ids'] and len(page):
+            ids = np.load(os.path.join(cohort_dir, 'student_ids.npy'), mmap_mode='r')
+            for record, student_id in zip(records, ids[page['row']]):
+                record['student_id'] = str(student_id)
+
+        return {'last_rescore': summary, 'total': len(changes), 'changes': records}
+
+
+def main():
+    """Command-line entry point"""
+    from generate_data import infer_format
+    from predict import PlacementPredictor
+
+    parser = argparse.ArgumentParser(description="Manage memory-mapped scored cohorts")
+    parser.add_argument('--root', default=os.environ.get('COHORT_STORE_DIR', '../data/cohorts'),
+                        help="Cohort store directory")
+    parser.add_argument('--models-dir', default='../models', help="Models used for scoring")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="Score and store a cohort file")
+    ingest.add_argument('name')
+    ingest.add_argument('path', help="CSV, Parquet or NDJSON file of student records")
+    ingest.add_argument('--id-column', help="Column holding student ids")
+
+    rescore = commands.add_parser('rescore', help="Re-score a cohort with the current models")
+    rescore.add_argument('name')
+    rescore.add_argument('--salary-threshold', type=float, default=SALARY_CHANGE_THRESHOLD,
+                         help="Minimum expected salary change (INR) reported as changed")
+    rescore.add_argument('--output', help="Write changed rows to this CSV file")
+
+    commands.add_parser('list', help="List stored cohorts")
+
+    args = parser.parse_args()
+    store = CohortStore(args.root)
+
+    if args.command == 'list':
+        for meta in store.list():
+            print(f"{meta['name']}: {meta['rows']} rows, model {meta['model_version']}")
+        return
+
+    predictor = PlacementPredictor(models_dir=args.models_dir)
+
+    if args.command == 'ingest':
+        fmt = infer_format(args.path)
+        if fmt == 'csv':
+            df = pd.read_csv(args.path)
+        elif fmt == 'parquet':
+            df = pd.read_parquet(args.path)
+        else:
+            df = pd.read_json(args.path, lines=True)
+        student_ids = df.pop(args.id_column).astype(str).to_numpy() if args.id_column else None
+        meta = store.create(args.name, predictor, df, student_ids=student_ids)
+        print(f"✓ Stored cohort '{args.name}' ({meta['rows']} rows, model {meta['model_version']})")
+        return
+
+    summary = store.rescore(args.name, predictor, salary_threshold=args.salary_threshold)
+    if summary.get('skipped'):
+        print(f"Cohort '{args.name}' is already scored with model {summary['to_version']}")
+        return
+    print(f"✓ Re-scored {summary['rows']} rows in {summary['duration_ms']:.0f}ms: "
+          f"{summary['changed']} changed ({summary['placement_flips']} placement flips, "
+          f"{summary['salary_changes']} salary changes)")
+    if args.output:
+        changes = store.changes(args.name, limit=summary['changed'])['changes']
+        pd.DataFrame(changes).to_csv(args.output, index=False)
+        print(f"✓ Changed rows written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Columnar Transport Module
+Compact MessagePack encoding of column arrays for service-to-service batch scoring.
+
+A payload is a MessagePack map {"n_rows": int, "columns": {name: column}} where
+each column is either a list of strings or a typed array
+{"dtype": "<f8", "data": <little-endian bytes>}.
+"""
+
+import msgpack
+import numpy as np
+
+MEDIA_TYPE = 'application/x-msgpack'
+
+# Only plain numeric dtypes may be decoded from raw bytes
+ALLOWED_DTYPES = {'<f8', '<f4', '<i8', '<i4', '<i2', '|i1', '|u1', '|b1'}
+
+
+def _encode_column(values):
+    """Encode one column as a typed byte array or a list of strings"""
+    array = np.asarray(values)
+    if array.dtype.kind in 'biuf':
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+        return {'dtype': array.dtype.str, 'data': array.tobytes()}
+    return [None if value is None else str(value) for value in array.tolist()]
+
+
+def _decode_column(column, name):
+    """Decode one column back into a numpy array"""
+    if isinstance(column, dict):
+        dtype = column.get('dtype')
+        if dtype not in ALLOWED_DTYPES:
+            raise ValueError(f"Column '{name}' has unsupported dtype {dtype!r}")
+        data = column.get('data')
+        if not isinstance(data, (bytes, bytearray)):
+            raise ValueError(f"Column '{name}' must hold its values as bytes in 'data'")
+        if len(data) % np.dtype(dtype).itemsize:
+            raise ValueError(f"Column '{name}' has {len(data)} bytes, not a multiple of {dtype}")
+        return np.frombuffer(data, dtype=np.dtype(dtype))
+    if isinstance(column, list):
+        return np.asarray(column, dtype=object)
+    raise ValueError(f"Column '{name}' must be a list or a typed array")
+
+
+def encode_columns(columns, **extra):
+    """
+    Pack column arrays into a MessagePack payload
+
+    Args:
+        columns: dict mapping column name to an array-like of equal length
+        **extra: Additional top-level fields (e.g. model_version)
+
+    Returns:
+        bytes
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+
+    return msgpack.packb({
+        'n_rows': lengths.pop() if lengths else 0,
+        'columns': {name: _encode_column(values) for name, values in columns.items()},
+        **extra
+    }, use_bin_type=True)
+
+
+def decode_columns(payload):
+    """
+    Unpack a MessagePack payload into column arrays
+
+    Args:
+        payload: bytes produced by encode_columns
+
+    Returns:
+        (dict mapping column name to numpy array, dict of extra top-level fields)
+    """
+    try:
+        message = msgpack.unpackb(payload, raw=False)
+    except Exception as e:
+        raise ValueError(f"Invalid MessagePack payload: {e}")
+    if not isinstance(message, dict) or not isinstance(message.get('columns'), dict):
+        raise ValueError("Payload must be a map with a 'columns' map")
+
+    columns = {name: _decode_column(column, name) for name, column in message['columns'].items()}
+    n_rows = message.get('n_rows')
+    for name, values in columns.items():
+        if len(values) != n_rows:
+            raise ValueError(f"Column '{name}' has {len(values)} rows, expected {n_rows}")
+
+    extra = {key: value for key, value in message.items() if key not in ('columns', 'n_rows')}
+    return columns, extra
@@ -0,0 +1,232 @@
+"""
+Feature Dependence Module
+Binned SHAP dependence and partial-dependence curves over a reference population.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from predict import SALARY_PROBABILITY_THRESHOLD
+from preprocessing import INPUT_COLUMNS, CATEGORICAL_COLUMNS
+from singleflight import SingleFlight
+
+# Encoded training rows written by train.py
+REFERENCE_SAMPLE_FILE = 'reference_sample.npz'
+
+# Rows used when no reference sample was saved
+FALLBACK_REFERENCE_ROWS = 2000
+
+# Engineered features that are exact copies of an input feature; their SHAP
+# values are added to the input's so its full effect is shown
+FEATURE_COPIES = {'mba_p': ['mba_performance']}
+
+SHAP_BAND = (0.1, 0.9)
+
+
+def load_reference(predictor):
+    """
+    Load the reference population for predictor's model set
+
+    Falls back to synthetic rows drawn from the encoder vocabularies when
+    train.py did not save a reference sample.
+
+    Returns:
+        DataFrame of encoded features
+    """
+    feature_columns = predictor.preprocessor.feature_columns
+    path = os.path.join(predictor.models_dir, REFERENCE_SAMPLE_FILE)
+    if os.path.exists(path):
+        with np.load(path, allow_pickle=False) as reference:
+            if list(reference['feature_columns']) == list(feature_columns):
+                return pd.DataFrame(reference['X'], columns=feature_columns)
+        print("Warning: Reference sample does not match model features; using synthetic rows")
+
+    records = predictor.synthetic_records(FALLBACK_REFERENCE_ROWS, seed=0)
+    return predictor.preprocessor.preprocess_batch(records)
+
+
+def _bins(values, n_bins, categorical):
+    """
+    Assign reference rows to bins
+
+    Returns:
+        (bin index per row, grid value per bin, number of bins)
+    """
+    if categorical:
+        grid = np.unique(values)
+        return np.searchsorted(grid, values), grid, len(grid)
+
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+    if len(edges) < 2:
+        return np.zeros(len(values), dtype=np.intp), edges[:1], 1
+    index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+    n = len(edges) - 1
+    counts = np.bincount(index, minlength=n)
+    # Grid value of a bin: mean reference value inside it (bin midpoint if empty)
+    sums = np.bincount(index, weights=values, minlength=n)
+    grid = np.where(counts > 0, sums / np.maximum(counts, 1), (edges[:-1] + edges[1:]) / 2)
+    return index, grid, n
+
+
+def _model_output(predictor, model_type, X):
+    """Probability of placement or expected salary for encoded rows"""
+    scores = predictor.score_features(X)
+    return scores['probability'] if model_type == 'placement' else scores['salary']
+
+
+def compute_dependence(predictor, X_ref, model_type, feature, n_bins=10):
+    """
+    Binned SHAP dependence and partial dependence of one input feature
+
+    SHAP values of the whole reference population are computed in one call
+    and averaged per bin of the feature. Partial dependence sets the feature
+    of every reference row to each bin's grid value, recomputes engineered
+    features and scores all (bins x rows) variants in one batch.
+
+    The salary model only applies to students likely to be placed, so salary
+    curves use the reference rows the service would report a salary for.
+
+    Args:
+        predictor: PlacementPredictor with SHAP enabled
+        X_ref: DataFrame of encoded reference rows
+        model_type: 'placement' or 'salary'
+        feature: Input column name
+        n_bins: Quantile bins for numeric features
+
+    Returns:
+        dict of aligned arrays (labels, x, counts, shap mean/band, pdp)
+    """
+    preprocessor = predictor.preprocessor
+    population = 'all'
+    if model_type == 'salary':
+        placed = predictor.score_features(X_ref)['probability'] > SALARY_PROBABILITY_THRESHOLD
+        if placed.any():
+            X_ref = X_ref[placed].reset_index(drop=True)
+            population = 'placed'
+    categorical = feature in CATEGORICAL_COLUMNS
+    values = X_ref[feature].to_numpy(dtype=np.float64)
+    index, grid, n = _bins(values, n_bins, categorical)
+
+    # SHAP dependence
+    explainer = predictor.shap_explainer
+    shap_explainer = explainer.placement_explainer if model_type == 'placement' else explainer.salary_explainer
+    shap_values = shap_explainer.shap_values(X_ref)
+    if isinstance(shap_values, list):
+        shap_values = shap_values[1]
+    columns = list(preprocessor.feature_columns)
+    feature_shap = sum(
+        shap_values[:, columns.index(name)] for name in [feature] + FEATURE_COPIES.get(feature, [])
+    )
+
+    counts = np.bincount(index, minlength=n)
+    shap_mean = np.bincount(index, weights=feature_shap, minlength=n) / np.maximum(counts, 1)
+    order = np.lexsort((feature_shap, index))
+    sorted_shap = feature_shap[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    band = {}
+    for q in SHAP_BAND:
+        position = starts + np.floor(q * np.maximum(counts - 1, 0)).astype(np.intp)
+        band[q] = np.where(counts > 0, sorted_shap[np.minimum(position, len(sorted_shap) - 1)], np.nan)
+
+    # Partial dependence: every reference row at every grid value, scored in one batch
+    variants = pd.DataFrame(
+        np.repeat(X_ref.to_numpy(dtype=np.float64), n, axis=0), columns=columns
+    )
+    variants[feature] = np.tile(grid, len(X_ref))
+    variants = preprocessor.engineer_features(variants)[columns]
+    pdp = _model_output(predictor, model_type, variants).reshape(len(X_ref), n).mean(axis=0)
+
+    if categorical:
+        labels = preprocessor.label_encoders[feature].inverse_transform(grid.astype(int)).tolist()
+    else:
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+        labels = [f"{lo:.1f}-{hi:.1f}" for lo, hi in zip(edges[:-1], edges[1:])] if len(edges) > 1 \
+            else [f"{grid[0]:.1f}"]
+
+    def to_list(array):
+        return [None if np.isnan(value) else round(float(value), 6) for value in array]
+
+    return {
+        'model_type': model_type,
+        'feature': feature,
+        'feature_label': explainer._get_readable_feature_name(feature),
+        'kind': 'categorical' if categorical else 'numeric',
+        'model_version': predictor.model_version,
+        'reference_rows': len(X_ref),
+        'population': population,
+        'units': {
+            'shap': 'log-odds' if model_type == 'placement' else 'INR',
+            'pdp': 'probability' if model_type == 'placement' else 'INR'
+        },
+        'baseline': float(_model_output(predictor, model_type, X_ref).mean()),
+        'labels': labels,
+        'x': to_list(grid) if not categorical else labels,
+        'counts': counts.tolist(),
+        'shap': {
+            'mean': to_list(np.where(counts > 0, shap_mean, np.nan)),
+            f'p{int(SHAP_BAND[0] * 100)}': to_list(band[SHAP_BAND[0]]),
+            f'p{int(SHAP_BAND[1] * 100)}': to_list(band[SHAP_BAND[1]])
+        },
+        'pdp': to_list(pdp)
+    }
+
+
+class DependenceCache:
+    """
+    Dependence curves computed once per model version
+
+    Curves are computed outside the lock, so a cold curve does not block
+    other requests; concurrent requests for the same curve share one
+    computation.
+    """
+
+    def __init__(self):
+        self._model_version = None
+        self._reference = None
+        self._curves = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    def get(self, predictor, model_type, feature, n_bins=10):
+        """
+        Return the dependence curves for the serving model, computing them on first use
+
+        Raises:
+            ValueError: for an unknown model type or feature
+        """
+        if model_type not in ('placement', 'salary'):
+            raise ValueError("model_type must be 'placement' or 'salary'")
+        if feature not in INPUT_COLUMNS:
+            raise ValueError(f"feature must be one of: {', '.join(INPUT_COLUMNS)}")
+
+        key = (model_type, feature, n_bins)
+        version = predictor.model_version
+        with self._lock:
+            if self._model_version != version:
+                # New model: drop curves and reference of the old one
+                self._model_version = version
+                self._reference = None
+                self._curves = {}
+            curves = self._curves.get(key)
+        if curves is not None:
+            return curves
+
+        curves, _ = self._flights.do((version,) + key, self._compute, predictor, version, key)
+        return curves
+
+    def _compute(self, predictor, version, key):
+        """Compute one curve and cache it if the model has not changed meanwhile"""
+        with self._lock:
+            reference = self._reference if self._model_version == version else None
+        if reference is None:
+            reference, _ = self._flights.do((version, 'reference'), load_reference, predictor)
+
+        curves = compute_dependence(predictor, reference, *key)
+        with self._lock:
+            if self._model_version == version:
+                self._reference = reference
+                self._curves[key] = curves
+        return curves
@@ -0,0 +1,187 @@
+"""
+Feature Drift Module
+Constant-memory per-feature histograms of live inputs compared against the training data.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+# Reference histograms written by train.py
+DRIFT_REFERENCE_FILE = 'drift_reference.npz'
+
+# Fine uniform bins per feature between the training min and max; two extra
+# bins catch values below and above the training range
+N_BINS = 64
+
+# Reference-mass groups used for PSI (fine bins are merged to avoid noisy sparse bins)
+PSI_GROUPS = 10
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def _bin_indices(X, lo, width, n_bins):
+    """Map values to fine bin indices (0 = underflow, n_bins + 1 = overflow)"""
+    idx = np.floor((X - lo) / width).astype(np.int64) + 1
+    return np.clip(idx, 0, n_bins + 1)
+
+
+def build_reference(X, feature_columns, n_bins=N_BINS):
+    """
+    Build reference histograms from the training matrix
+
+    Args:
+        X: 2D array of encoded training features
+        feature_columns: Names of the columns of X
+        n_bins: Fine bins per feature
+
+    Returns:
+        dict with lo, width, counts and feature_columns
+    """
+    X = np.asarray(X, dtype=np.float64)
+    lo = X.min(axis=0)
+    hi = X.max(axis=0)
+    width = np.where(hi > lo, (hi - lo) / n_bins, 1.0)
+    # Let the training maximum fall in the last regular bin
+    width = width * (1 + 1e-9)
+
+    idx = _bin_indices(X, lo, width, n_bins)
+    counts = np.stack([
+        np.bincount(idx[:, j], minlength=n_bins + 2) for j in range(X.shape[1])
+    ])
+    return {
+        'lo': lo,
+        'width': width,
+        'counts': counts,
+        'feature_columns': np.array(feature_columns)
+    }
+
+
+class FeatureDriftMonitor:
+    """Streaming drift monitor over fixed-bin histograms"""
+
+    def __init__(self, reference):
+        """
+        Args:
+            reference: dict produced by build_reference
+        """
+        self.feature_columns = [str(col) for col in reference['feature_columns']]
+        self.lo = np.asarray(reference['lo'], dtype=np.float64)
+        self.width = np.asarray(reference['width'], dtype=np.float64)
+        self.reference_counts = np.asarray(reference['counts'], dtype=np.float64)
+        self.n_features, n_slots = self.reference_counts.shape
+        self.n_bins = n_slots - 2
+        self.counts = np.zeros((self.n_features, n_slots), dtype=np.int64)
+        self._feature_index = np.arange(self.n_features)
+        self._flat_offset = self._feature_index * n_slots
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, models_dir, feature_columns):
+        """
+        Load the reference saved by train.py
+
+        Returns:
+            A monitor, or None if no matching reference exists
+        """
+        path = os.path.join(models_dir, DRIFT_REFERENCE_FILE)
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path, allow_pickle=False) as reference:
+            if list(reference['feature_columns']) != list(feature_columns):
+                print("Warning: Drift reference does not match model features; drift monitoring disabled")
+                return None
+            return cls({key: reference[key] for key in reference.files})
+
+    def update(self, X):
+        """
+        Add scored rows to the live histograms (O(1) per row)
+
+        Args:
+            X: 2D array-like of encoded features (one row per student)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        idx = _bin_indices(X, self.lo, self.width, self.n_bins)
+
+        if len(idx) == 1:
+            with self._lock:
+                self.counts[self._feature_index, idx[0]] += 1
+            return
+
+        increments = np.bincount(
+            (idx + self._flat_offset).ravel(), minlength=self.counts.size
+        ).reshape(self.counts.shape)
+        with self._lock:
+            self.counts += increments
+
+    def reset(self):
+        """Clear the live histograms"""
+        with self._lock:
+            self.counts[:] = 0
+
+    def _quantiles(self, counts, lo, width):
+        """Approximate QUANTILES by interpolating within fine bins"""
+        total = counts.sum()
+        if total == 0:
+            return {str(q): None for q in QUANTILES}
+        cdf = np.cumsum(counts) / total
+        values = {}
+        for q in QUANTILES:
+            slot = min(int(np.searchsorted(cdf, q)), self.n_bins + 1)
+            if slot == 0:
+                # Below the training range: report the range boundary
+                value = lo
+            elif slot == self.n_bins + 1:
+                value = lo + self.n_bins * width
+            else:
+                below = cdf[slot - 1]
+                fraction = (q - below) / max(cdf[slot] - below, 1e-12)
+                value = lo + (slot - 1 + fraction) * width
+            values[str(q)] = float(value)
+        return values
+
+    def report(self):
+        """
+        Compute drift scores for every feature
+
+        Returns:
+            dict with the number of live rows and, per feature, PSI, KS
+            statistic, out-of-range share and live/reference quantiles
+        """
+        with self._lock:
+            live = self.counts.astype(np.float64)
+
+        n_live = int(live[0].sum()) if self.n_features else 0
+        features = []
+        for j, name in enumerate(self.feature_columns):
+            reference = self.reference_counts[j]
+            entry = {
+                'feature': name,
+                'reference_quantiles': self._quantiles(reference, self.lo[j], self.width[j])
+            }
+
+            if n_live:
+                ref_cdf = np.cumsum(reference) / reference.sum()
+                live_cdf = np.cumsum(live[j]) / n_live
+
+                # Merge fine bins into groups of roughly equal reference mass
+                boundaries = np.unique(np.searchsorted(ref_cdf, np.linspace(0, 1, PSI_GROUPS + 1)[1:-1]) + 1)
+                starts = np.concatenate(([0], boundaries[boundaries < len(reference)]))
+                ref_p = np.add.reduceat(reference, starts) / reference.sum()
+                live_p = np.add.reduceat(live[j], starts) / n_live
+                ref_p = np.clip(ref_p, 1e-4, None)
+                live_p = np.clip(live_p, 1e-4, None)
+
+                psi = float(np.sum((live_p - ref_p) * np.log(live_p / ref_p)))
+                entry.update({
+                    'psi': psi,
+                    'ks': float(np.max(np.abs(live_cdf - ref_cdf))),
+                    'out_of_range': float((live[j][0] + live[j][-1]) / n_live),
+                    'live_quantiles': self._quantiles(live[j], self.lo[j], self.width[j]),
+                    'drift': 'significant' if psi > 0.2 else 'moderate' if psi > 0.1 else 'none'
+                })
+            features.append(entry)
+
+        return {'rows': n_live, 'features': features}
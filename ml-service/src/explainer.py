@@ -7,8 +7,53 @@ import shap
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
+import copy
 import joblib
 import os
+import threading
+import model_families
+
+# Background summary written by train.py (k-means centroids, weights, feature means)
+BACKGROUND_SUMMARY_FILE = 'shap_background.npz'
+
+
+class DecayedImportance:
+    """
+    Exponentially decayed mean of |SHAP| per feature
+    
+    Constant memory; older explanations lose half their weight every
+    half_life explanations, so the mean tracks recent traffic.
+    """
+    
+    def __init__(self, n_features, half_life=10000):
+        self.decay = 0.5 ** (1.0 / half_life)
+        self.half_life = half_life
+        self.sums = np.zeros(n_features)
+        self.weight = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def update(self, abs_shap):
+        """
+        Fold rows of |SHAP| values into the running means
+        
+        Args:
+            abs_shap: 2D array (rows x features), oldest row first
+        """
+        n_rows = len(abs_shap)
+        weights = self.decay ** np.arange(n_rows - 1, -1, -1)
+        with self._lock:
+            carry = self.decay ** n_rows
+            self.sums = carry * self.sums + weights @ abs_shap
+            self.weight = carry * self.weight + weights.sum()
+            self.count += n_rows
+    
+    def means(self):
+        """Return the current per-feature means (None before any update)"""
+        with self._lock:
+            if self.weight == 0:
+                return None
+            return self.sums / self.weight
 
 
 class SHAPExplainer:
@@ -17,25 +62,32 @@ class SHAPExplainer:
     def __init__(self, models_dir='../models'):
         """Initialize SHAP explainers for both models"""
         self.models_dir = models_dir
+        self.family = None
         self.placement_model = None
         self.salary_model = None
         self.preprocessor = None
         self.placement_explainer = None
         self.salary_explainer = None
         self.background_data = None
+        self.background_weights = None
+        self.background = None
+        self.live_importance = None
         
         self.load_models()
         self.initialize_explainers()
+        
+        # Running |SHAP| means of real traffic, per model
+        n_features = len(self.preprocessor.feature_columns)
+        self.live_importance = {
+            'placement': DecayedImportance(n_features),
+            'salary': DecayedImportance(n_features)
+        }
     
     def load_models(self):
         """Load trained models and preprocessor"""
         try:
-            self.placement_model = joblib.load(
-                os.path.join(self.models_dir, 'placement_model.pkl')
-            )
-            self.salary_model = joblib.load(
-                os.path.join(self.models_dir, 'salary_model.pkl')
-            )
+            self.family, self.placement_model, self.salary_model, _ = \
+                model_families.load_models(self.models_dir)
             self.preprocessor = joblib.load(
                 os.path.join(self.models_dir, 'preprocessor.pkl')
             )
@@ -48,34 +100,78 @@ class SHAPExplainer:
         """
         Initialize SHAP explainers with background data
         
+        Uses the background summary saved by train.py when available, and
+        falls back to synthetic background data otherwise.
+        
         Args:
-            background_samples: Number of samples for background dataset
+            background_samples: Number of samples for the synthetic fallback
         """
         try:
-            # Create synthetic background data based on typical ranges
-            # This is used as reference for SHAP calculations
-            background_data = self._create_background_data(background_samples)
-            
-            # Initialize explainers
-            # For linear models, we use LinearExplainer which is faster and exact
-            self.placement_explainer = shap.LinearExplainer(
-                self.placement_model,
-                background_data,
-                feature_perturbation="interventional"
-            )
+            summary = self._load_background_summary()
+            if summary is not None:
+                # Interventional SHAP for linear models only needs the
+                # background mean (covariance is kept for completeness);
+                # tree models are explained from their own node weights
+                background = (summary['means'], summary['cov'])
+                background_data = pd.DataFrame(
+                    summary['centroids'], columns=self.preprocessor.feature_columns
+                )
+                self.background_weights = summary['weights']
+            else:
+                # Create synthetic background data based on typical ranges
+                # This is used as reference for SHAP calculations
+                background_data = self._create_background_data(background_samples)
+                background = background_data
+                self.background_weights = None
             
-            self.salary_explainer = shap.LinearExplainer(
-                self.salary_model,
-                background_data
-            )
+            # Initialize explainers: exact explainers chosen by the model family
+            # (LinearExplainer for linear models, path-dependent TreeSHAP for trees)
+            self.placement_explainer = self.family.explainer(self.placement_model, background)
+            self.salary_explainer = self.family.explainer(self.salary_model, background)
             
             self.background_data = background_data
-            print("✓ SHAP explainers initialized")
+            self.background = background
+            print("✓ SHAP explainers initialized"
+                  f" ({'training summary' if summary is not None else 'synthetic'} background)")
             
         except Exception as e:
             print(f"Error initializing SHAP explainers: {e}")
             raise
     
+    def for_models(self, placement_model, salary_model):
+        """
+        Explainer for other models of the same family trained on the same
+        features (e.g. a tenant variant)
+        
+        Shares this explainer's preprocessor and background. Its explanations
+        are not counted in live importance, which describes the global models.
+        """
+        variant = copy.copy(self)
+        variant.placement_model = placement_model
+        variant.salary_model = salary_model
+        variant.live_importance = None
+        variant.placement_explainer = self.family.explainer(placement_model, self.background)
+        variant.salary_explainer = self.family.explainer(salary_model, self.background)
+        return variant
+    
+    def _load_background_summary(self):
+        """
+        Load the background summary saved by train.py
+        
+        Returns:
+            dict with centroids, weights, means and cov, or None if missing
+            or saved for different features
+        """
+        path = os.path.join(self.models_dir, BACKGROUND_SUMMARY_FILE)
+        if not os.path.exists(path):
+            return None
+        
+        with np.load(path, allow_pickle=False) as summary:
+            if list(summary['feature_columns']) != list(self.preprocessor.feature_columns):
+                print("Warning: SHAP background summary does not match model features; ignoring it")
+                return None
+            return {key: summary[key] for key in ('centroids', 'weights', 'means', 'cov')}
+    
     def _create_background_data(self, n_samples=100):
         """
         Create synthetic background data for SHAP
@@ -87,21 +183,22 @@ class SHAPExplainer:
             DataFrame with background data
         """
         # Generate realistic background data based on typical student profiles
-        np.random.seed(42)
+        # (local generator: does not touch the global numpy RNG state)
+        rng = np.random.default_rng(42)
         
         background = pd.DataFrame({
-            'gender': np.random.randint(0, 2, n_samples),  # 0 or 1
-            'ssc_p': np.random.uniform(40, 95, n_samples),
-            'ssc_b': np.random.randint(0, 2, n_samples),
-            'hsc_p': np.random.uniform(40, 95, n_samples),
-            'hsc_b': np.random.randint(0, 2, n_samples),
-            'hsc_s': np.random.randint(0, 3, n_samples),  # 3 specializations
-            'degree_p': np.random.uniform(45, 90, n_samples),
-            'degree_t': np.random.randint(0, 3, n_samples),
-            'workex': np.random.randint(0, 2, n_samples),
-            'etest_p': np.random.uniform(50, 95, n_samples),
-            'specialisation': np.random.randint(0, 2, n_samples),
-            'mba_p': np.random.uniform(50, 90, n_samples),
+            'gender': rng.integers(0, 2, n_samples),  # 0 or 1
+            'ssc_p': rng.uniform(40, 95, n_samples),
+            'ssc_b': rng.integers(0, 2, n_samples),
+            'hsc_p': rng.uniform(40, 95, n_samples),
+            'hsc_b': rng.integers(0, 2, n_samples),
+            'hsc_s': rng.integers(0, 3, n_samples),  # 3 specializations
+            'degree_p': rng.uniform(45, 90, n_samples),
+            'degree_t': rng.integers(0, 3, n_samples),
+            'workex': rng.integers(0, 2, n_samples),
+            'etest_p': rng.uniform(50, 95, n_samples),
+            'specialisation': rng.integers(0, 2, n_samples),
+            'mba_p': rng.uniform(50, 90, n_samples),
         })
         
         # Add engineered features
@@ -116,29 +213,36 @@ class SHAPExplainer:
         
         return background
     
-    def explain_placement_prediction(self, student_data: Dict) -> Dict:
+    def explain_placement_prediction(self, student_data: Dict, X: Optional[pd.DataFrame] = None,
+                                  live: bool = True) -> Dict:
         """
         Explain placement prediction for a single student
         
         Args:
             student_data: Dictionary with student information
+            X: Already preprocessed feature row (computed from student_data if omitted)
+            live: Whether to count the explanation in live feature importance
             
         Returns:
             Dictionary with SHAP values and feature impacts
         """
         # Preprocess input
-        X = self.preprocessor.preprocess_input(student_data)
+        if X is None:
+            X = self.preprocessor.preprocess_input(student_data)
         
         # Calculate SHAP values
         shap_values = self.placement_explainer.shap_values(X)
         
-        # Get base value (expected value)
-        base_value = self.placement_explainer.expected_value
+        # Get base value (expected value; tree explainers return a 1-element array)
+        base_value = float(np.ravel(self.placement_explainer.expected_value)[-1])
         
         # For binary classification, shap_values might be 2D
         if isinstance(shap_values, list):
             shap_values = shap_values[1]  # Use positive class
         
+        if live and self.live_importance is not None:
+            self.live_importance['placement'].update(np.abs(shap_values))
+        
         # Create feature impact list
         feature_impacts = []
         feature_names = self.preprocessor.feature_columns
@@ -157,31 +261,38 @@ class SHAPExplainer:
         feature_impacts.sort(key=lambda x: x['abs_impact'], reverse=True)
         
         return {
-            'base_value': float(base_value) if isinstance(base_value, np.ndarray) else float(base_value),
+            'base_value': base_value,
             'prediction_value': float(base_value + shap_values[0].sum()),
             'feature_impacts': feature_impacts,
             'top_positive_features': [f for f in feature_impacts if f['impact'] == 'positive'][:5],
             'top_negative_features': [f for f in feature_impacts if f['impact'] == 'negative'][:5]
         }
     
-    def explain_salary_prediction(self, student_data: Dict) -> Dict:
+    def explain_salary_prediction(self, student_data: Dict, X: Optional[pd.DataFrame] = None,
+                               live: bool = True) -> Dict:
         """
         Explain salary prediction for a single student
         
         Args:
             student_data: Dictionary with student information
+            X: Already preprocessed feature row (computed from student_data if omitted)
+            live: Whether to count the explanation in live feature importance
             
         Returns:
             Dictionary with SHAP values and feature impacts
         """
         # Preprocess input
-        X = self.preprocessor.preprocess_input(student_data)
+        if X is None:
+            X = self.preprocessor.preprocess_input(student_data)
         
         # Calculate SHAP values
         shap_values = self.salary_explainer.shap_values(X)
         
         # Get base value
-        base_value = self.salary_explainer.expected_value
+        base_value = float(np.ravel(self.salary_explainer.expected_value)[0])
+        
+        if live and self.live_importance is not None:
+            self.live_importance['salary'].update(np.abs(shap_values))
         
         # Create feature impact list
         feature_impacts = []
@@ -208,27 +319,36 @@ class SHAPExplainer:
             'top_negative_features': [f for f in feature_impacts if f['impact'] == 'negative'][:5]
         }
     
-    def get_global_feature_importance(self, model_type='placement') -> List[Dict]:
+    def get_global_feature_importance(self, model_type='placement', source='background') -> List[Dict]:
         """
         Get global feature importance across all predictions
         
         Args:
             model_type: 'placement' or 'salary'
+            source: 'background' to explain the background data, or 'live'
+                for the decayed mean over explanations of real requests
+                (no SHAP computation at query time)
             
         Returns:
             List of features with importance scores
         """
-        explainer = self.placement_explainer if model_type == 'placement' else self.salary_explainer
-        
-        # Calculate SHAP values for background data
-        shap_values = explainer.shap_values(self.background_data)
-        
-        # Handle binary classification
-        if isinstance(shap_values, list):
-            shap_values = shap_values[1]
-        
-        # Calculate mean absolute SHAP values
-        mean_abs_shap = np.abs(shap_values).mean(axis=0)
+        if source == 'live':
+            mean_abs_shap = self.live_importance[model_type].means()
+            if mean_abs_shap is None:
+                raise ValueError("No live explanations recorded yet")
+        else:
+            explainer = self.placement_explainer if model_type == 'placement' else self.salary_explainer
+            
+            # Calculate SHAP values for background data
+            shap_values = explainer.shap_values(self.background_data)
+            
+            # Handle binary classification
+            if isinstance(shap_values, list):
+                shap_values = shap_values[1]
+            
+            # Calculate mean absolute SHAP values (weighted by cluster size for
+            # a training background summary)
+            mean_abs_shap = np.average(np.abs(shap_values), axis=0, weights=self.background_weights)
         
         # Create importance list
         feature_importance = []
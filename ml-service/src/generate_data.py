@@ -0,0 +1,262 @@
+"""
+Synthetic Cohort Generator
+Generates realistic raw student records at arbitrary scale for load and scale testing.
+
+Usage:
+    python generate_data.py --rows 10000000 --output ../data/synthetic.parquet
+    python generate_data.py --rows 1000 --format csv --output ../data/Placement_Data_Full_Class.csv
+    python generate_data.py --rows 200000 --colleges 50 --format csv --output ../data/Placement_Data_Full_Class.csv
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Category frequencies roughly matching the Kaggle campus placement dataset
+CATEGORY_FREQUENCIES = {
+    'gender': {'M': 0.65, 'F': 0.35},
+    'ssc_b': {'Central': 0.54, 'Others': 0.46},
+    'hsc_b': {'Central': 0.39, 'Others': 0.61},
+    'hsc_s': {'Commerce': 0.53, 'Science': 0.42, 'Arts': 0.05},
+    'degree_t': {'Comm&Mgmt': 0.67, 'Sci&Tech': 0.27, 'Others': 0.06},
+    'workex': {'No': 0.66, 'Yes': 0.34},
+    'specialisation': {'Mkt&Fin': 0.56, 'Mkt&HR': 0.44},
+}
+
+# (mean, standard deviation) of each percentage score
+SCORE_DISTRIBUTIONS = {
+    'ssc_p': (67.0, 11.0),
+    'hsc_p': (66.0, 11.0),
+    'degree_p': (66.0, 7.5),
+    'etest_p': (72.0, 13.0),
+    'mba_p': (62.0, 6.0),
+}
+
+COLUMNS = [
+    'sl_no', 'gender', 'ssc_p', 'ssc_b', 'hsc_p', 'hsc_b', 'hsc_s',
+    'degree_p', 'degree_t', 'workex', 'etest_p', 'specialisation', 'mba_p',
+    'status', 'salary'
+]
+
+FORMATS = ('csv', 'parquet', 'ndjson')
+
+
+class SyntheticCohortGenerator:
+    """Seeded, chunked generator of raw student records"""
+
+    def __init__(self, seed=42, academic_correlation=0.6, placement_strength=1.5,
+                 salary_strength=1.0, placement_rate=0.69, salary_noise=25000.0,
+                 colleges=0, college_spread=0.8):
+        """
+        Args:
+            seed: Base seed; chunk i uses an independent stream derived from (seed, i)
+            academic_correlation: Correlation of every score with a latent ability (0-1)
+            placement_strength: Weight of ability in the placement log-odds
+            salary_strength: Weight of ability in the salary of placed students
+            placement_rate: Approximate share of placed students
+            salary_noise: Standard deviation of salary noise
+            colleges: Number of colleges; when non-zero a 'college' column is
+                added and each college gets its own placement market
+            college_spread: Standard deviation of the per-college shifts of the
+                placement log-odds and of the work-experience effect
+        """
+        if not 0 <= academic_correlation <= 1:
+            raise ValueError("academic_correlation must be between 0 and 1")
+        if not 0 < placement_rate < 1:
+            raise ValueError("placement_rate must be between 0 and 1")
+
+        self.seed = seed
+        self.academic_correlation = academic_correlation
+        self.placement_strength = placement_strength
+        self.salary_strength = salary_strength
+        self.placement_rate = placement_rate
+        self.salary_noise = salary_noise
+        self.colleges = colleges
+
+        # Per-college market: placement shift, work-experience weight, salary level
+        # and relative size (fixed by the seed, so identical across chunks)
+        college_rng = np.random.default_rng([seed, colleges])
+        self.college_names = np.array([f"college-{i + 1:04d}" for i in range(colleges)])
+        self.college_shift = college_rng.normal(0.0, college_spread, colleges)
+        self.college_workex = 0.9 + college_rng.normal(0.0, college_spread / 2, colleges)
+        self.college_salary = np.exp(college_rng.normal(0.0, 0.15, colleges))
+        sizes = college_rng.pareto(1.5, colleges) + 1
+        self.college_sizes = sizes / sizes.sum()
+
+    def generate_chunk(self, n_rows, chunk_index=0, start_id=1):
+        """
+        Generate one chunk of records
+
+        Args:
+            n_rows: Number of records
+            chunk_index: Index of the chunk (selects the random stream)
+            start_id: First serial number
+
+        Returns:
+            DataFrame with the raw dataset columns
+        """
+        rng = np.random.default_rng([self.seed, chunk_index])
+        df = pd.DataFrame({'sl_no': np.arange(start_id, start_id + n_rows, dtype=np.int64)})
+
+        for col, frequencies in CATEGORY_FREQUENCIES.items():
+            df[col] = rng.choice(list(frequencies), n_rows, p=list(frequencies.values()))
+
+        ability = rng.standard_normal(n_rows)
+        c = self.academic_correlation
+        for col, (mean, std) in SCORE_DISTRIBUTIONS.items():
+            score = mean + std * (c * ability + np.sqrt(1 - c * c) * rng.standard_normal(n_rows))
+            df[col] = np.round(np.clip(score, 40.0, 98.0), 2)
+
+        workex = (df['workex'] == 'Yes').to_numpy()
+        finance = (df['specialisation'] == 'Mkt&Fin').to_numpy()
+
+        # Choose the intercept so the average placement probability is close to
+        # placement_rate (probit approximation of the logistic-normal mean)
+        covariate_shift = (
+            0.9 * CATEGORY_FREQUENCIES['workex']['Yes']
+            + 0.3 * CATEGORY_FREQUENCIES['specialisation']['Mkt&Fin']
+        )
+        scale = np.sqrt(1 + np.pi * self.placement_strength ** 2 / 8)
+        intercept = np.log(self.placement_rate / (1 - self.placement_rate)) * scale - covariate_shift
+        if self.colleges:
+            college = rng.choice(self.colleges, n_rows, p=self.college_sizes)
+            df['college'] = self.college_names[college]
+            logit = (intercept + self.college_shift[college] + self.placement_strength * ability
+                     + self.college_workex[college] * workex + 0.3 * finance)
+            salary_level = self.college_salary[college]
+        else:
+            logit = intercept + self.placement_strength * ability + 0.9 * workex + 0.3 * finance
+            salary_level = 1.0
+        placed = rng.random(n_rows) < 1 / (1 + np.exp(-logit))
+
+        salary = (
+            270000 * salary_level
+            + self.salary_strength * 40000 * ability
+            + 15000 * workex
+            + rng.normal(0, self.salary_noise, n_rows)
+        )
+        salary = np.round(np.maximum(salary, 200000), -3)
+
+        df['status'] = np.where(placed, 'Placed', 'Not Placed')
+        df['salary'] = np.where(placed, salary, np.nan)
+
+        return df[COLUMNS + (['college'] if self.colleges else [])]
+
+    def iter_chunks(self, n_rows, chunk_size=100000):
+        """Yield DataFrames covering n_rows records in order"""
+        for chunk_index, start in enumerate(range(0, n_rows, chunk_size)):
+            yield self.generate_chunk(min(chunk_size, n_rows - start), chunk_index, start_id=start + 1)
+
+    def write(self, path, n_rows, fmt=None, chunk_size=100000):
+        """
+        Stream n_rows records to a file without holding them in memory
+
+        Args:
+            path: Output file
+            n_rows: Number of records
+            fmt: 'csv', 'parquet' or 'ndjson' (inferred from the extension if omitted)
+            chunk_size: Records generated and written per chunk
+
+        Returns:
+            Number of records written
+        """
+        fmt = fmt or infer_format(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        written = 0
+        if fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            writer = None
+            try:
+                for chunk in self.iter_chunks(n_rows, chunk_size):
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(path, table.schema)
+                    writer.write_table(table)
+                    written += len(chunk)
+            finally:
+                if writer is not None:
+                    writer.close()
+        elif fmt == 'csv':
+            with open(path, 'w', newline='') as f:
+                for chunk in self.iter_chunks(n_rows, chunk_size):
+                    chunk.to_csv(f, index=False, header=written == 0)
+                    written += len(chunk)
+        elif fmt == 'ndjson':
+            with open(path, 'w') as f:
+                for chunk in self.iter_chunks(n_rows, chunk_size):
+                    # to_json writes NaN salaries as null, one record per line
+                    f.write(chunk.to_json(orient='records', lines=True))
+                    written += len(chunk)
+        else:
+            raise ValueError(f"Unknown format '{fmt}'; expected one of {FORMATS}")
+
+        return written
+
+
+def infer_format(path):
+    """Infer the output format from a file extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'ndjson'
+    if extension in FORMATS:
+        return extension
+    raise ValueError(f"Cannot infer format from '{path}'; pass --format")
+
+
+def student_records(n_rows, seed=42):
+    """
+    Generate raw student inputs (without outcome columns) for scoring
+
+    Args:
+        n_rows: Number of records
+        seed: Random seed
+
+    Returns:
+        list of dicts accepted by /predict
+    """
+    df = SyntheticCohortGenerator(seed=seed).generate_chunk(n_rows)
+    return json.loads(df.drop(columns=['sl_no', 'status', 'salary']).to_json(orient='records'))
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate synthetic student placement records")
+    parser.add_argument('--rows', type=int, required=True, help="Number of records")
+    parser.add_argument('--output', required=True, help="Output file (.csv, .parquet, .ndjson)")
+    parser.add_argument('--format', choices=FORMATS, help="Output format (default: from extension)")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Records per chunk")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--academic-correlation', type=float, default=0.6)
+    parser.add_argument('--placement-strength', type=float, default=1.5)
+    parser.add_argument('--salary-strength', type=float, default=1.0)
+    parser.add_argument('--placement-rate', type=float, default=0.69)
+    parser.add_argument('--colleges', type=int, default=0,
+                        help="Add a college column with this many colleges, each with its own placement market")
+    args = parser.parse_args()
+
+    generator = SyntheticCohortGenerator(
+        seed=args.seed,
+        academic_correlation=args.academic_correlation,
+        placement_strength=args.placement_strength,
+        salary_strength=args.salary_strength,
+        placement_rate=args.placement_rate,
+        colleges=args.colleges
+    )
+
+    start = time.perf_counter()
+    written = generator.write(args.output, args.rows, fmt=args.format, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"✓ Wrote {written:,} records to {args.output} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
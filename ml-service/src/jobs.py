@@ -0,0 +1,240 @@
+"""
+Bulk Scoring Jobs Module
+Runs cohort scoring jobs on a local worker pool in vectorized chunks.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job manager cannot accept more work"""
+
+
+class Job:
+    """State of a single bulk-scoring job"""
+
+    def __init__(self, records, explain=False, client_id=None):
+        self.id = uuid.uuid4().hex
+        self.records = records
+        self.explain = explain
+        self.client_id = client_id
+        self.status = 'queued'
+        self.total = len(records)
+        self.processed = 0
+        self.failed = 0
+        self.results = [None] * self.total
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'failed', 'cancelled')
+
+    def summary(self):
+        """Return a JSON-serialisable progress summary"""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'processed': self.processed,
+            'succeeded': self.processed - self.failed,
+            'failed': self.failed,
+            'progress': self.processed / self.total if self.total else 1.0,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class JobManager:
+    """Local worker pool that scores submitted cohorts in chunks"""
+
+    def __init__(self, predictor_provider, max_workers=2, chunk_size=256,
+                 max_active_jobs=16, max_active_per_client=4, max_retained_jobs=100):
+        """
+        Args:
+            predictor_provider: Callable returning the current PlacementPredictor
+                (looked up per chunk so model reloads are picked up)
+            max_workers: Number of jobs processed concurrently
+            chunk_size: Rows scored per vectorized predict_rows call
+            max_active_jobs: Maximum queued plus running jobs
+            max_active_per_client: Maximum queued plus running jobs of one
+                identified client (anonymous jobs only count against max_active_jobs)
+            max_retained_jobs: Finished jobs kept for result retrieval
+        """
+        self.predictor_provider = predictor_provider
+        self.chunk_size = chunk_size
+        self.max_active_jobs = max_active_jobs
+        self.max_active_per_client = max_active_per_client
+        self.max_retained_jobs = max_retained_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scoring-job')
+
+    def submit(self, records, explain=False, client_id=None):
+        """
+        Queue a cohort for scoring
+
+        Args:
+            records: list of dicts with student information
+            explain: Whether to attach SHAP explanations to each result
+            client_id: Caller counted against max_active_per_client, or None
+
+        Returns:
+            The created Job
+
+        Raises:
+            JobQueueFullError: if the service or the client has too many active jobs
+        """
+        job = Job(records, explain=explain, client_id=client_id)
+        with self._lock:
+            active = [existing for existing in self._jobs.values() if not existing.finished]
+            if len(active) >= self.max_active_jobs:
+                raise JobQueueFullError(
+                    f"Too many active jobs ({len(active)}); retry once running jobs finish"
+                )
+            if client_id is not None:
+                own = sum(1 for existing in active if existing.client_id == client_id)
+                if own >= self.max_active_per_client:
+                    raise JobQueueFullError(
+                        f"Too many active jobs from this client (limit {self.max_active_per_client}); "
+                        f"retry once they finish"
+                    )
+            self._jobs[job.id] = job
+            self._evict_finished_locked()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        """Return the job with the given id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Request cancellation of a job; rows already scored are kept
+
+        Returns:
+            The job, or None if it does not exist
+        """
+        job = self.get(job_id)
+        if job is not None and not job.finished:
+            job.cancel_event.set()
+            with self._lock:
+                if job.status == 'queued':
+                    job.status = 'cancelled'
+                    job.finished_at = time.time()
+        return job
+
+    def results(self, job_id, offset=0, limit=100):
+        """
+        Return a page of per-row results for the scored prefix of a job
+
+        Returns:
+            dict with the page, or None if the job does not exist
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+
+        end = min(offset + limit, job.processed)
+        items = [
+            {'index': index, **job.results[index]}
+            for index in range(offset, end)
+        ]
+        return {
+            'job_id': job.id,
+            'status': job.status,
+            'offset': offset,
+            'limit': limit,
+            'available': job.processed,
+            'total': job.total,
+            'results': items
+        }
+
+    def shutdown(self):
+        """Cancel outstanding jobs and stop the worker pool"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _evict_finished_locked(self):
+        """Drop the oldest finished jobs beyond max_retained_jobs"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_retained_jobs)]:
+            del self._jobs[job_id]
+
+    def _run(self, job):
+        """Worker entry point: score a job chunk by chunk"""
+        with self._lock:
+            if job.status == 'cancelled':
+                job.records = None
+                return
+            job.status = 'running'
+            job.started_at = time.time()
+
+        try:
+            for start in range(0, job.total, self.chunk_size):
+                if job.cancel_event.is_set():
+                    job.status = 'cancelled'
+                    break
+                chunk = job.records[start:start + self.chunk_size]
+                for offset, row_result in enumerate(self._score_chunk(chunk, job.explain)):
+                    job.results[start + offset] = row_result
+                    if row_result['status'] == 'error':
+                        job.failed += 1
+                job.processed = start + len(chunk)
+            else:
+                job.status = 'completed'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.records = None
+
+    def _score_chunk(self, chunk, explain):
+        """
+        Score a chunk in one vectorized call, isolating failing rows
+
+        Rows that fail input validation are rejected with their error codes
+        before scoring. If the vectorized call still fails, rows are rescored
+        individually so a single bad record only fails itself.
+        """
+        predictor = self.predictor_provider()
+        if predictor is None:
+            raise RuntimeError("Models not loaded")
+
+        try:
+            return [
+                self._row_result(result)
+                for result in predictor.predict_rows(chunk, explain=explain)
+            ]
+        except Exception:
+            pass
+
+        row_results = []
+        for record in chunk:
+            try:
+                row_results.append(self._row_result(predictor.predict_rows([record], explain=explain)[0]))
+            except Exception as e:
+                row_results.append({'status': 'error', 'error': str(e)})
+        return row_results
+
+    @staticmethod
+    def _row_result(result):
+        """Job entry of one predict_rows result"""
+        if 'errors' in result:
+            message = "; ".join(f"{error['field']}: {error['message']}" for error in result['errors'])
+            return {'status': 'error', 'error': message, 'errors': result['errors']}
+        return {'status': 'ok', 'prediction': result}
@@ -0,0 +1,463 @@
+"""
+Load Test Harness
+Drives the ML service over HTTP with the backend's access patterns and gates on the results.
+
+Scenarios:
+    bulk   sequential /predict loop, like the backend's bulkAddStudents
+    burst  bursts of concurrent single-student /predict calls
+    mixed  concurrent /predict traffic with and without SHAP explanations
+    batch  sequential /predict/batch calls
+
+Usage:
+    python loadtest.py                                   # service in this process
+    python loadtest.py --spawn --workers 4               # local uvicorn / serve.py subprocess
+    python loadtest.py --url http://localhost:8000 --server-pid 1234
+    python loadtest.py --max-p95-ms 50 --baseline baseline.json --output report.json
+    python loadtest.py --client-ids                      # per-user X-Client-Id headers
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from generate_data import student_records
+from serve import process_memory
+
+SCENARIOS = ('bulk', 'burst', 'mixed', 'batch')
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Metrics compared against a baseline report, with the direction that is worse
+REGRESSION_METRICS = {'p95_ms': 'higher', 'p99_ms': 'higher', 'throughput_rps': 'lower'}
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def process_tree(pid):
+    """pid and all of its descendants (Linux)"""
+    pids, i = [pid], 0
+    while i < len(pids):
+        try:
+            for task in os.listdir(f'/proc/{pids[i]}/task'):
+                with open(f'/proc/{pids[i]}/task/{task}/children') as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+        i += 1
+    return pids
+
+
+def cpu_seconds(pids):
+    """User plus system CPU time of processes from /proc/<pid>/stat"""
+    total = 0.0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        except (OSError, IndexError, ValueError):
+            pass
+    return total
+
+
+class ResourceSampler:
+    """Sample CPU and memory of the server process tree while a scenario runs"""
+
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self.peak_rss_mb = 0.0
+        self.peak_pss_mb = 0.0
+        self._cpu_start = 0.0
+
+    def _memory(self):
+        rss = pss = 0.0
+        for pid in process_tree(self.pid):
+            memory = process_memory(pid)
+            rss += memory['rss_mb'] or 0.0
+            pss += memory['pss_mb'] or 0.0
+        return rss, pss
+
+    def _sample(self):
+        while not self._stop.is_set():
+            rss, pss = self._memory()
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            self.peak_pss_mb = max(self.peak_pss_mb, pss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._cpu_start = cpu_seconds(process_tree(self.pid))
+        self._thread = threading.Thread(target=self._sample, name='loadtest-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.cpu_s = cpu_seconds(process_tree(self.pid)) - self._cpu_start
+        self.rss_mb, self.pss_mb = self._memory()
+        return False
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(base_url, timeout=120.0):
+    """Poll /readyz until the service is ready"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/readyz", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise TimeoutError(f"Service at {base_url} not ready after {timeout:.0f}s")
+
+
+class InProcessServer:
+    """uvicorn serving main.app on a background thread of this process"""
+
+    def __init__(self):
+        import uvicorn
+        import main
+
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.pid = os.getpid()
+        self._server = uvicorn.Server(
+            uvicorn.Config(main.app, host='127.0.0.1', port=self.port, log_level='warning')
+        )
+        self._thread = threading.Thread(target=self._server.run, name='loadtest-server', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        wait_ready(self.base_url)
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+        return False
+
+
+class SubprocessServer:
+    """Local uvicorn (or serve.py with several workers) in a child process"""
+
+    def __init__(self, workers=1):
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        if workers > 1:
+            self.command = [sys.executable, 'serve.py', '--workers', str(workers),
+                            '--host', '127.0.0.1', '--port', str(self.port), '--memory-interval', '0']
+        else:
+            self.command = [sys.executable, '-m', 'uvicorn', 'main:app',
+                            '--host', '127.0.0.1', '--port', str(self.port), '--log-level', 'warning']
+        self._process = None
+        self.pid = None
+
+    def __enter__(self):
+        self._process = subprocess.Popen(self.command, cwd=SRC_DIR, stdout=subprocess.DEVNULL)
+        self.pid = self._process.pid
+        try:
+            wait_ready(self.base_url)
+        except Exception:
+            self._process.kill()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+        return False
+
+
+class RemoteServer:
+    """An already running service (server metrics only when its pid is known)"""
+
+    def __init__(self, base_url, pid=None):
+        self.base_url = base_url.rstrip('/')
+        self.pid = pid
+
+    def __enter__(self):
+        wait_ready(self.base_url, timeout=10)
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class LoadTester:
+    """Replays backend traffic patterns against one service"""
+
+    def __init__(self, base_url, timeout=30.0, client_ids=False):
+        """
+        Args:
+            base_url: Service base URL
+            timeout: Per-request timeout in seconds
+            client_ids: Send a per-user X-Client-Id in burst and mixed; by
+                default no header is sent, like the backend, so all traffic
+                comes from one anonymous client
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.client_ids = client_ids
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _client(self, user):
+        """X-Client-Id of a simulated user (None unless client_ids is set)"""
+        return f'user-{user}' if self.client_ids else None
+
+    def _call(self, path, payload, params=None, client=None):
+        """One request; returns (latency seconds, status code or 0 on connection error)"""
+        start = time.perf_counter()
+        try:
+            response = self._session().post(
+                f"{self.base_url}{path}", json=payload, params=params,
+                headers={'X-Client-Id': client} if client else None, timeout=self.timeout
+            )
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        return time.perf_counter() - start, status
+
+    def bulk(self, records, **_):
+        """bulkAddStudents: one /predict call after another"""
+        return [self._call('/predict', record) for record in records]
+
+    def burst(self, records, concurrency=16, **_):
+        """Groups of `concurrency` simultaneous /predict calls for different users"""
+        results = []
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for start in range(0, len(records), concurrency):
+                group = records[start:start + concurrency]
+                results.extend(pool.map(
+                    lambda item: self._call('/predict', item[1], client=self._client(item[0])),
+                    enumerate(group)
+                ))
+        return results
+
+    def mixed(self, records, concurrency=16, shap_fraction=0.5, seed=0, **_):
+        """Closed-loop concurrent /predict traffic, a share of it requesting SHAP"""
+        explain = np.random.default_rng(seed).random(len(records)) < shap_fraction
+
+        def run(i):
+            params = {'explain': 'true' if explain[i] else 'false'}
+            return self._call('/predict', records[i], params=params, client=self._client(i % concurrency))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(run, range(len(records))))
+
+    def batch(self, records, batch_size=100, **_):
+        """Sequential /predict/batch calls of batch_size students"""
+        return [
+            self._call('/predict/batch', {'students': records[start:start + batch_size]})
+            for start in range(0, len(records), batch_size)
+        ]
+
+
+def summarize(results, duration, students):
+    """Throughput, latency percentiles and error rate of one scenario"""
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    statuses = np.array([status for _, status in results])
+    errors = int(np.sum((statuses < 200) | (statuses >= 300)))
+    codes, counts = np.unique(statuses, return_counts=True)
+    return {
+        'requests': len(results),
+        'students': students,
+        'duration_s': round(duration, 3),
+        'throughput_rps': round(len(results) / duration, 2),
+        'students_per_s': round(students / duration, 2),
+        'errors': errors,
+        'error_rate': round(errors / len(results), 4),
+        'status_codes': {str(code): int(count) for code, count in zip(codes, counts)},
+        'mean_ms': round(float(latencies.mean()), 2),
+        **{f'p{p}_ms': round(float(np.percentile(latencies, p)), 2) for p in PERCENTILES},
+        'max_ms': round(float(latencies.max()), 2)
+    }
+
+
+def run_scenarios(server, scenarios, n_requests, concurrency=16, shap_fraction=0.5,
+                  batch_size=100, warmup=20, seed=0, client_ids=False):
+    """
+    Run each scenario against server and collect client and server metrics
+
+    Returns:
+        dict of scenario name -> metrics
+    """
+    tester = LoadTester(server.base_url, client_ids=client_ids)
+    options = {'concurrency': concurrency, 'shap_fraction': shap_fraction,
+               'batch_size': batch_size, 'seed': seed}
+    tester.bulk(student_records(warmup, seed=seed + 1000))
+
+    report = {}
+    for i, name in enumerate(scenarios):
+        n_students = n_requests * batch_size if name == 'batch' else n_requests
+        records = student_records(n_students, seed=seed + i)
+
+        sampler = ResourceSampler(server.pid) if server.pid else None
+        with sampler or contextlib.nullcontext():
+            start = time.perf_counter()
+            results = getattr(tester, name)(records, **options)
+            duration = time.perf_counter() - start
+
+        metrics = summarize(results, duration, n_students)
+        if sampler:
+            metrics['server'] = {
+                'cpu_s': round(sampler.cpu_s, 3),
+                'cpu_cores': round(sampler.cpu_s / duration, 2),
+                'rss_mb': round(sampler.rss_mb, 1),
+                'pss_mb': round(sampler.pss_mb, 1),
+                'peak_rss_mb': round(sampler.peak_rss_mb, 1),
+                'peak_pss_mb': round(sampler.peak_pss_mb, 1)
+            }
+        report[name] = metrics
+    return report
+
+
+def check_gates(report, max_p95_ms=None, max_p99_ms=None, max_error_rate=None,
+                min_throughput=None, max_rss_mb=None, baseline=None, max_regression=None):
+    """
+    Compare a report with absolute thresholds and, optionally, a baseline report
+
+    Returns:
+        list of failure messages (empty when every gate passes)
+    """
+    failures = []
+    limits = [
+        ('p95_ms', max_p95_ms, 'max'), ('p99_ms', max_p99_ms, 'max'),
+        ('error_rate', max_error_rate, 'max'), ('throughput_rps', min_throughput, 'min')
+    ]
+    for name, metrics in report.items():
+        for key, limit, kind in limits:
+            if limit is None:
+                continue
+            if (kind == 'max' and metrics[key] > limit) or (kind == 'min' and metrics[key] < limit):
+                failures.append(f"{name}: {key} {metrics[key]} {'>' if kind == 'max' else '<'} {limit}")
+        server = metrics.get('server')
+        if max_rss_mb is not None and server and server['peak_rss_mb'] > max_rss_mb:
+            failures.append(f"{name}: server peak_rss_mb {server['peak_rss_mb']} > {max_rss_mb}")
+
+        if baseline and max_regression is not None and name in baseline:
+            for key, worse in REGRESSION_METRICS.items():
+                before, after = baseline[name][key], metrics[key]
+                if before <= 0:
+                    continue
+                change = (after - before) / before
+                if (worse == 'higher' and change > max_regression) or \
+                        (worse == 'lower' and -change > max_regression):
+                    failures.append(f"{name}: {key} {before} -> {after} ({change:+.0%} vs baseline)")
+    return failures
+
+
+def print_report(report):
+    """Print one line per scenario"""
+    print(f"\n{'scenario':<8} {'reqs':>6} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'errors':>7} {'cpu':>6} {'rss MB':>8}")
+    for name, m in report.items():
+        server = m.get('server', {})
+        print(f"{name:<8} {m['requests']:>6} {m['throughput_rps']:>9.1f} {m['p50_ms']:>6.1f}ms "
+              f"{m['p95_ms']:>6.1f}ms {m['p99_ms']:>6.1f}ms {m['error_rate']:>7.2%} "
+              f"{server.get('cpu_cores', float('nan')):>6.2f} {server.get('peak_rss_mb', float('nan')):>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load test and regression gate for the ML service")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', help="Test a running service instead of starting one")
+    target.add_argument('--spawn', action='store_true',
+                        help="Start the service in a subprocess (uvicorn, or serve.py with --workers > 1)")
+    parser.add_argument('--server-pid', type=int, help="pid of the --url service, for CPU and memory")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per scenario")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--shap-fraction', type=float, default=0.5,
+                        help="Share of mixed-scenario requests asking for SHAP explanations")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=20, help="Unmeasured requests sent first")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--client-ids', action='store_true',
+                        help="Send a per-user X-Client-Id in burst and mixed (the backend sends none)")
+    parser.add_argument('--max-p95-ms', type=float)
+    parser.add_argument('--max-p99-ms', type=float)
+    parser.add_argument('--max-error-rate', type=float, default=0.0)
+    parser.add_argument('--min-throughput', type=float, help="Minimum requests per second")
+    parser.add_argument('--max-rss-mb', type=float, help="Maximum server RSS (all processes)")
+    parser.add_argument('--baseline', help="Earlier --output report to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Allowed relative p95/p99/throughput regression vs --baseline")
+    parser.add_argument('--output', help="Write the JSON report here")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.url:
+        server = RemoteServer(args.url, args.server_pid)
+    elif args.spawn:
+        server = SubprocessServer(args.workers)
+    else:
+        # Server metrics then include this load generator's own CPU and memory
+        server = InProcessServer()
+
+    with server:
+        print(f"Load testing {server.base_url} ({', '.join(scenarios)})")
+        report = run_scenarios(
+            server, scenarios, args.requests, concurrency=args.concurrency,
+            shap_fraction=args.shap_fraction, batch_size=args.batch_size,
+            warmup=args.warmup, seed=args.seed, client_ids=args.client_ids
+        )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.output}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = check_gates(
+        report, args.max_p95_ms, args.max_p99_ms, args.max_error_rate,
+        args.min_throughput, args.max_rss_mb, baseline, args.max_regression
+    )
+    if failures:
+        print("\nGate failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✓ All gates passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,35 @@ FastAPI ML Service
 REST API for college placement prediction models.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Header, Depends, Request
+from fastapi.responses import JSONResponse, Response, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List, Dict, Any, Union
+import hmac
+import os
+import signal
+import threading
+import time
 import uvicorn
+import numpy as np
+import pandas as pd
 from predict import PlacementPredictor
+from store import PredictionStore
+from jobs import JobManager, JobQueueFullError
+from reload import ModelReloader
+from admission import AdmissionController, AdmissionRejected, INTERACTIVE, BULK
+import columnar
+from cohort_store import CohortStore, IncompatibleCohortError, SALARY_CHANGE_THRESHOLD, check_compatible
+from analytics import summarize_cohort
+from preprocessing import CATEGORICAL_COLUMNS
+from profiling import RequestProfiler
+from singleflight import SingleFlight
+from tenants import DEFAULT_CACHE_MB
+from dependence import DependenceCache
+from validation import InputValidationError
+from serve import process_memory
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -26,13 +49,198 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Optional persistent prediction store (disabled unless a path is configured)
+store = None
+if os.environ.get('PREDICTION_STORE_PATH'):
+    try:
+        store = PredictionStore(
+            os.environ['PREDICTION_STORE_PATH'],
+            max_entries=int(os.environ.get('PREDICTION_STORE_MAX_ENTRIES', 100000))
+        )
+        print(f"✓ Prediction store opened at {store.path}")
+    except Exception as e:
+        print(f"Warning: Could not open prediction store: {e}")
+        store = None
+
+MODELS_DIR = os.environ.get('MODELS_DIR', '../models')
+
+# /admin/shadow only loads candidates from under this directory (artifacts are unpickled)
+SHADOW_CANDIDATES_DIR = os.environ.get('SHADOW_CANDIDATES_DIR', MODELS_DIR)
+
+# Candidate currently shadow-scored (set by /admin/shadow), reloaded with every new predictor
+shadow_models_dir = os.environ.get('SHADOW_MODELS_DIR')
+
+# Coalesce identical concurrent /predict requests (on unless COALESCE_REQUESTS=0);
+# shared across reloads so its counters survive model swaps
+single_flight = SingleFlight() if os.environ.get('COALESCE_REQUESTS', '1') != '0' else None
+
+# SHAP dependence / partial-dependence curves, recomputed after each model reload
+dependence_cache = DependenceCache()
+
+# Optional memory-mapped store of scored cohorts (disabled unless a directory is configured)
+cohort_store = CohortStore(os.environ['COHORT_STORE_DIR']) if os.environ.get('COHORT_STORE_DIR') else None
+
+def build_predictor():
+    """Load a predictor from MODELS_DIR with SHAP enabled"""
+    new_predictor = PlacementPredictor(
+        models_dir=MODELS_DIR, enable_shap=True, store=store, single_flight=single_flight,
+        tenant_cache_mb=float(os.environ.get('TENANT_CACHE_MAX_MB', DEFAULT_CACHE_MB))
+    )
+    if shadow_models_dir:
+        try:
+            new_predictor.load_candidate(shadow_models_dir)
+        except Exception as e:
+            print(f"Warning: Could not load shadow candidate: {e}")
+    return new_predictor
+
 # Initialize predictor with SHAP enabled
 try:
-    predictor = PlacementPredictor(models_dir='../models', enable_shap=True)
+    predictor = build_predictor()
 except Exception as e:
     print(f"Warning: Could not load models. Please train models first. Error: {e}")
     predictor = None
 
+# Rows scored by models that are no longer deployed can never be hit again
+if store is not None and predictor is not None:
+    try:
+        keep_versions = [predictor.model_version]
+        if predictor.tenant_models is not None:
+            keep_versions += predictor.tenant_models.versions()
+        store.compact(keep_versions=keep_versions)
+    except Exception as e:
+        print(f"Warning: Could not compact prediction store: {e}")
+
+# Readiness state: set once startup warmup and validation have succeeded
+readiness = {
+    'ready': False,
+    'model_version': None,
+    'warmup': None,
+    'validation': None,
+    'error': None
+}
+
+def swap_predictor(new_predictor, report):
+    """
+    Atomically replace the serving predictor (and its SHAP explainer)
+    
+    The reload has already warmed and validated the new predictor, so its
+    report also makes the service ready (e.g. a pod that started without
+    models or failed its startup warmup).
+    """
+    global predictor
+    retired, predictor = predictor, new_predictor
+    if retired is not None:
+        retired.close()
+    readiness.update({
+        'model_version': new_predictor.model_version,
+        'warmup': report['warmup'],
+        'validation': report['validation'],
+        'error': None
+    })
+    readiness['ready'] = report['validation']['passed']
+    
+    if cohort_store is not None and os.environ.get('COHORT_RESCORE_ON_RELOAD'):
+        for meta in cohort_store.list():
+            try:
+                summary = cohort_store.rescore(meta['name'], new_predictor)
+                print(f"✓ Re-scored cohort '{meta['name']}': {summary['changed']} rows changed")
+            except Exception as e:
+                print(f"Warning: Could not re-score cohort '{meta['name']}': {e}")
+
+# Hot reload via /admin/reload or by watching MODELS_DIR
+reloader = ModelReloader(
+    build_predictor,
+    swap_predictor,
+    models_dir=MODELS_DIR,
+    min_accuracy=float(os.environ.get('RELOAD_MIN_ACCURACY', 0.7))
+)
+if os.environ.get('MODEL_WATCH_INTERVAL'):
+    reloader.start_watching(float(os.environ['MODEL_WATCH_INTERVAL']))
+
+# Admission control: bounded concurrency with interactive requests served first
+admission = AdmissionController(
+    max_concurrent=int(os.environ.get('ADMISSION_MAX_CONCURRENT', 2 * (os.cpu_count() or 2))),
+    max_per_client=int(os.environ.get('ADMISSION_MAX_PER_CLIENT', 8)),
+    max_queue=int(os.environ.get('ADMISSION_MAX_QUEUE', 64)),
+    queue_timeout=float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 2.0))
+)
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Answer shed requests immediately with a Retry-After hint"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+def client_id(request: Request):
+    """
+    Identify the caller for per-client limits (X-Client-Id header)
+    
+    Requests without the header get no per-client quota, only the global
+    limit and queue: the backend proxies every student's request from one
+    address without it, so keying on the address would cap all users at
+    ADMISSION_MAX_PER_CLIENT together.
+    """
+    return request.headers.get('x-client-id')
+
+# Opt-in request profiling (no profiler exists, and no per-request check runs,
+# unless PROFILING_ENABLED or PROFILE_SAMPLE_RATE is set)
+profiler = None
+if os.environ.get('PROFILING_ENABLED') or float(os.environ.get('PROFILE_SAMPLE_RATE', 0)) > 0:
+    profiler = RequestProfiler(
+        sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+        interval=float(os.environ.get('PROFILE_INTERVAL', 0.001)),
+        max_profiles=int(os.environ.get('PROFILE_BUFFER_SIZE', 50))
+    )
+
+async def run_inference(request: Request, fn, *args, response_model=None, **kwargs):
+    """
+    Run fn in the threadpool, under the profiler when the request is sampled
+    (or sends X-Debug-Profile: 1)
+    
+    Profiled requests are serialized with response_model inside the profile
+    so the profile covers serialization too; they return a ready Response
+    carrying an X-Profile-Id header.
+    """
+    if profiler is None or not profiler.should_profile(request.headers.get('x-debug-profile') == '1'):
+        return await run_in_threadpool(fn, *args, **kwargs)
+    
+    def profiled():
+        result = fn(*args, **kwargs)
+        if response_model is None:
+            return result
+        return Response(
+            content=response_model.model_validate(result).model_dump_json(),
+            media_type="application/json"
+        )
+    
+    result, profile = await run_in_threadpool(
+        profiler.run, f"{request.method} {request.url.path}", profiled
+    )
+    request.state.profile_id = profile.id
+    if isinstance(result, Response):
+        result.headers['X-Profile-Id'] = profile.id
+    return result
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Require an X-Admin-Token header matching ADMIN_TOKEN (admin routes are closed without one)"""
+    expected = os.environ.get('ADMIN_TOKEN')
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints disabled. Set ADMIN_TOKEN to enable them")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+# Local worker pool for asynchronous bulk-scoring jobs
+job_manager = JobManager(
+    lambda: predictor,
+    max_workers=int(os.environ.get('JOB_WORKERS', 2)),
+    chunk_size=int(os.environ.get('JOB_CHUNK_SIZE', 256)),
+    max_active_jobs=int(os.environ.get('JOB_MAX_ACTIVE', 16)),
+    max_active_per_client=int(os.environ.get('JOB_MAX_ACTIVE_PER_CLIENT', 4))
+)
+
 # Pydantic models for request/response
 class StudentData(BaseModel):
     """Student data for prediction"""
@@ -126,6 +334,48 @@ class PredictionResponse(BaseModel):
     skill_analysis: SkillAnalysis
     shap_explanations: Optional[SHAPExplanations] = None
 
+class BatchPredictionRequest(BaseModel):
+    """Batch prediction request (students are validated row by row, see validation.py)"""
+    students: List[Any] = Field(..., description="Student records with the fields of StudentData")
+    explain: bool = False
+
+class FieldError(BaseModel):
+    """Validation error of one field"""
+    field: Optional[str]
+    code: str
+    message: str
+    value: Optional[Any] = None
+
+class RowError(BaseModel):
+    """Rejected batch row"""
+    errors: List[FieldError]
+
+class BatchPredictionResponse(BaseModel):
+    """Batch prediction response (results in request order)"""
+    results: List[Union[PredictionResponse, RowError]]
+    rejected: int = 0
+
+class ShadowRequest(BaseModel):
+    """Candidate model set to shadow-score"""
+    models_dir: str
+
+class CohortRequest(BaseModel):
+    students: List[StudentData]
+    student_ids: Optional[List[str]] = None
+
+class CohortSummaryRequest(BaseModel):
+    students: Optional[List[StudentData]] = None
+    cohort: Optional[str] = Field(None, description="Name of a stored cohort to summarize instead of students")
+    groups: Optional[List[str]] = Field(None, description="Group label per student (e.g. batch)")
+    group_by: List[str] = Field(default_factory=list, description="Categorical input columns to group by (e.g. degree_t)")
+    probability_bins: int = Field(10, ge=1, le=100)
+    salary_bins: int = Field(20, ge=1, le=200)
+
+class JobRequest(BaseModel):
+    """Bulk-scoring job submission (invalid students fail individually)"""
+    students: List[Any] = Field(..., min_length=1, description="Student records with the fields of StudentData")
+    explain: bool = False
+
 # API Endpoints
 @app.get("/")
 async def root():
@@ -135,11 +385,68 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "liveness": "/livez",
+            "readiness": "/readyz",
             "predict": "/predict (POST)",
+            "predict_batch": "/predict/batch (POST)",
+            "predict_columnar": "/predict/columnar (POST, application/x-msgpack)",
+            "jobs": "/jobs (POST), /jobs/{id}, /jobs/{id}/results",
             "docs": "/docs"
         }
     }
 
+def warm_up_service():
+    """Warm every prediction path, validate the models and mark the service ready"""
+    current = predictor
+    if current is None:
+        readiness['error'] = "Models not loaded. Please train models first by running train.py"
+        return
+    
+    try:
+        start = time.perf_counter()
+        warmup = current.warmup()
+        
+        # Response serialization is part of every request too
+        serialize_start = time.perf_counter()
+        records = current.synthetic_records(2)
+        PredictionResponse.model_validate(current.predict_batch(records[:1], explain=True, live=False)[0])
+        BatchPredictionResponse.model_validate({"results": current.predict_batch(records, live=False)})
+        warmup['serialization_ms'] = (time.perf_counter() - serialize_start) * 1000
+        
+        validation = current.validate(min_accuracy=float(os.environ.get('RELOAD_MIN_ACCURACY', 0.7)))
+        warmup['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        
+        readiness.update({
+            'model_version': current.model_version,
+            'warmup': warmup,
+            'validation': validation,
+            'error': None if validation['passed'] else "Model validation failed"
+        })
+        readiness['ready'] = validation['passed']
+        print(f"✓ Warmup completed in {warmup['elapsed_ms']:.0f} ms (ready: {readiness['ready']})")
+    except Exception as e:
+        readiness['error'] = f"Warmup failed: {str(e)}"
+        print(f"Warning: {readiness['error']}")
+
+@app.on_event("startup")
+def start_warmup():
+    """Warm up in the background so /livez answers while models are prepared"""
+    if readiness['ready']:
+        # Already warmed up by serve.py before this worker was forked
+        return
+    threading.Thread(target=warm_up_service, name='warmup', daemon=True).start()
+
+@app.get("/livez")
+async def liveness():
+    """Liveness probe: the process is up and serving HTTP"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness_check():
+    """Readiness probe: models loaded, warmed up and validated"""
+    body = {"status": "ready" if readiness['ready'] else "not_ready", **readiness}
+    return JSONResponse(status_code=200 if readiness['ready'] else 503, content=body)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -147,16 +454,20 @@ async def health_check():
     return {
         "status": "healthy" if models_loaded else "models_not_loaded",
         "models_loaded": models_loaded,
+        "ready": readiness['ready'],
         "message": "Service is running" if models_loaded else "Please train models first"
     }
 
 @app.post("/predict", response_model=PredictionResponse)
-async def predict_placement(student: StudentData):
+async def predict_placement(student: StudentData, request: Request, explain: Optional[bool] = None,
+                            x_tenant_id: Optional[str] = Header(None)):
     """
     Predict placement probability and expected salary for a student
     
     Args:
         student: Student data
+        explain: Attach SHAP explanations (default: whenever SHAP is enabled)
+        x_tenant_id: Tenant (e.g. college) whose model variant should be used
         
     Returns:
         Prediction results with placement probability, salary, and skill analysis
@@ -167,20 +478,560 @@ async def predict_placement(student: StudentData):
             detail="Models not loaded. Please train models first by running train.py"
         )
     
-    try:
-        # Convert Pydantic model to dict
-        student_dict = student.model_dump()
-        
-        # Make prediction
-        result = predictor.predict_complete(student_dict)
+    async with admission.admit(client_id(request), INTERACTIVE):
+        try:
+            # Convert Pydantic model to dict
+            student_dict = student.model_dump()
+            
+            # Make prediction (off the event loop)
+            return await run_inference(
+                request, predictor.predict_complete, student_dict, explain=explain, tenant=x_tenant_id,
+                response_model=PredictionResponse
+            )
+            
+        except InputValidationError as e:
+            raise HTTPException(status_code=422, detail={"code": "invalid_input", "errors": e.errors})
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Prediction failed: {str(e)}"
+            )
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_batch(request: BatchPredictionRequest, http_request: Request,
+                        x_tenant_id: Optional[str] = Header(None)):
+    """
+    Predict placement and salary for many students in one vectorized pass
+    
+    Args:
+        request: Students to score and whether to include SHAP explanations
+        x_tenant_id: Tenant (e.g. college) whose model variant should be used
         
-        return result
+    Returns:
+        Prediction results in the same order as the submitted students; rows
+        that fail validation get their errors instead and do not fail the batch
+    """
+    if predictor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded. Please train models first by running train.py"
+        )
+    
+    async with admission.admit(client_id(http_request), BULK):
+        try:
+            current = predictor
+            
+            def score():
+                results = current.predict_rows(request.students, explain=request.explain, tenant=x_tenant_id)
+                return {"results": results, "rejected": sum('errors' in result for result in results)}
+            
+            return await run_inference(http_request, score, response_model=BatchPredictionResponse)
+            
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Batch prediction failed: {str(e)}"
+            )
+
+def score_columnar(payload):
+    """Decode a columnar payload, score its valid rows and encode the response"""
+    columns, _ = columnar.decode_columns(payload)
+    current = predictor
+    outputs, errors = current.score_column_rows(columns)
+    return columnar.encode_columns(
+        outputs,
+        model_version=current.model_version,
+        rejected=len(errors),
+        errors=[{'row': row, 'errors': row_errors} for row, row_errors in sorted(errors.items())]
+    )
+
+@app.post("/predict/columnar")
+async def predict_columnar(request: Request):
+    """
+    Score a batch sent as MessagePack column arrays
+    
+    The body is decoded straight into column arrays (no per-row Pydantic
+    models) and the response holds placed, probability, confidence,
+    expected_salary and valid arrays in request order, plus the errors of
+    rejected rows. A malformed payload is answered with 400. See columnar.py
+    for the format.
+    """
+    if predictor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded. Please train models first by running train.py"
+        )
+    
+    payload = await request.body()
+    async with admission.admit(client_id(request), BULK):
+        try:
+            content = await run_inference(request, score_columnar, payload)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid columnar batch: {str(e)}")
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Batch prediction failed: {str(e)}"
+            )
+    
+    headers = {}
+    if getattr(request.state, 'profile_id', None):
+        headers['X-Profile-Id'] = request.state.profile_id
+    return Response(content=content, media_type=columnar.MEDIA_TYPE, headers=headers)
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest, http_request: Request):
+    """
+    Submit a cohort for asynchronous scoring
+    
+    Args:
+        request: Students to score and whether to include SHAP explanations
         
+    Returns:
+        Job id and initial status; poll /jobs/{job_id} for progress
+    """
+    if predictor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded. Please train models first by running train.py"
+        )
+    
+    # Admission only covers queueing the job; scoring runs later on the job
+    # pool, bounded by the job limits (per client and overall)
+    caller = client_id(http_request)
+    try:
+        async with admission.admit(caller, BULK):
+            job = job_manager.submit(request.students, explain=request.explain, client_id=caller)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    
+    return job.summary()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get progress of a bulk-scoring job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job.summary()
+
+@app.get("/jobs/{job_id}/results")
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Page through per-row results of a bulk-scoring job
+    
+    Rows are available as soon as their chunk is scored; each row has
+    status 'ok' with a prediction or status 'error' with a message.
+    """
+    page = job_manager.results(job_id, offset=offset, limit=limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return page
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a bulk-scoring job (rows already scored are kept)"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job.summary()
+
+def require_cohort_store():
+    if cohort_store is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Cohort store disabled. Set COHORT_STORE_DIR to enable it"
+        )
+    return cohort_store
+
+@app.get("/cohorts")
+async def list_cohorts(cohorts: CohortStore = Depends(require_cohort_store)):
+    """List stored cohorts with their model version"""
+    return {"cohorts": cohorts.list()}
+
+@app.post("/cohorts/{name}", dependencies=[Depends(require_admin)])
+async def store_cohort(
+    name: str,
+    request: Request,
+    cohorts: CohortStore = Depends(require_cohort_store)
+):
+    """
+    Score a cohort and keep it as memory-mapped arrays for later re-scoring
+    
+    The body is either JSON {"students": [...], "student_ids": [...]} or a
+    MessagePack columnar payload (see columnar.py) with an optional
+    student_id column. An existing cohort with the same name is replaced.
+    """
+    if predictor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded. Please train models first by running train.py"
+        )
+    
+    body = await request.body()
+    try:
+        if request.headers.get('content-type', '').startswith(columnar.MEDIA_TYPE):
+            columns, _ = columnar.decode_columns(body)
+            student_ids = columns.pop('student_id', None)
+        else:
+            cohort = CohortRequest.model_validate_json(body)
+            columns = {
+                col: np.asarray(values)
+                for col, values in pd.DataFrame(
+                    [s.model_dump() for s in cohort.students], columns=list(StudentData.model_fields)
+                ).items()
+            }
+            student_ids = cohort.student_ids
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cohort: {str(e)}")
+    
+    async with admission.admit(client_id(request), BULK):
+        try:
+            return await run_in_threadpool(
+                cohorts.create, name, predictor, columns, student_ids=student_ids
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cohort: {str(e)}")
+
+@app.get("/cohorts/{name}")
+async def get_cohort(name: str, cohorts: CohortStore = Depends(require_cohort_store)):
+    """Get a stored cohort's metadata and last re-score summary"""
+    try:
+        return cohorts.info(name)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=404, detail="Cohort not found")
+
+@app.get("/cohorts/{name}/changes")
+async def get_cohort_changes(
+    name: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    cohorts: CohortStore = Depends(require_cohort_store)
+):
+    """
+    Page through rows whose placement decision or expected salary changed
+    in the cohort's last re-score (row index, student_id if stored, old and new values)
+    """
+    try:
+        return cohorts.changes(name, offset=offset, limit=limit)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=404, detail="Cohort not found")
+
+@app.delete("/cohorts/{name}", dependencies=[Depends(require_admin)])
+async def delete_cohort(name: str, cohorts: CohortStore = Depends(require_cohort_store)):
+    """Delete a stored cohort"""
+    try:
+        cohorts.delete(name)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=404, detail="Cohort not found")
+    return {"deleted": name}
+
+@app.post("/admin/cohorts/{name}/rescore", dependencies=[Depends(require_admin)])
+async def rescore_cohort(
+    name: str,
+    salary_threshold: float = Query(SALARY_CHANGE_THRESHOLD, ge=0),
+    cohorts: CohortStore = Depends(require_cohort_store)
+):
+    """
+    Re-score a stored cohort with the serving models
+    
+    Stored features are scored in vectorized chunks; rows whose placement
+    decision flipped or whose expected salary moved by at least
+    salary_threshold (INR) are recorded and served by /cohorts/{name}/changes.
+    """
+    if predictor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded. Please train models first by running train.py"
+        )
+    
+    try:
+        return await run_in_threadpool(
+            cohorts.rescore, name, predictor, salary_threshold=salary_threshold
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Cohort not found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+def summarize_request(request: CohortSummaryRequest):
+    """Score (or load) the requested cohort and summarize it"""
+    current = predictor
+    if request.cohort is not None:
+        if cohort_store is None:
+            raise LookupError("Cohort store disabled. Set COHORT_STORE_DIR to enable it")
+        cohort = cohort_store.open(request.cohort)
+        meta = cohort['meta']
+        # Stored rows are label codes; decoding them needs the encoders that produced them
+        check_compatible(meta, current)
+        inputs = current.preprocessor.decode_frame(
+            pd.DataFrame(np.asarray(cohort['features']), columns=meta['feature_columns'])
+        )
+        outputs = {name: cohort['outputs'][name] for name in cohort['outputs'].dtype.names}
+        model_version = meta['model_version']
+    else:
+        inputs = pd.DataFrame(
+            [s.model_dump() for s in request.students], columns=list(StudentData.model_fields)
+        )
+        outputs = current.score_columns(
+            {col: inputs[col].to_numpy() for col in inputs.columns}, live=False
+        )
+        model_version = current.model_version
+    
+    keys = None
+    if request.groups is not None or request.group_by:
+        if request.groups is not None and len(request.groups) != len(inputs):
+            raise ValueError(f"Got {len(request.groups)} group labels for {len(inputs)} students")
+        keys = inputs[request.group_by].copy()
+        if request.groups is not None:
+            keys.insert(0, 'group', request.groups)
+    
+    summary = summarize_cohort(
+        inputs, outputs, keys=keys,
+        probability_bins=request.probability_bins, salary_bins=request.salary_bins
+    )
+    return {'model_version': model_version, 'cohort': request.cohort, **summary}
+
+@app.post("/cohort/summary")
+async def cohort_summary(request: CohortSummaryRequest, http_request: Request):
+    """
+    Placement, salary and skill-gap summary of a cohort
+    
+    Send either students or the name of a stored cohort. The cohort is scored
+    in one vectorized pass (stored cohorts reuse their stored outputs) and
+    summarized overall and per group: placement probability histogram,
+    expected placed count with its variance, salary histogram and quantiles,
+    and how many students hit each analyze_skill_gaps rule. Groups come from
+    per-student labels (groups), categorical input columns (group_by) or both.
+    """
+    if predictor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded. Please train models first by running train.py"
+        )
+    if (request.students is None) == (request.cohort is None):
+        raise HTTPException(status_code=400, detail="Send exactly one of students or cohort")
+    invalid = [col for col in request.group_by if col not in CATEGORICAL_COLUMNS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by must be categorical input columns ({', '.join(CATEGORICAL_COLUMNS)}); got {', '.join(invalid)}"
+        )
+    
+    async with admission.admit(client_id(http_request), BULK):
+        try:
+            return await run_in_threadpool(summarize_request, request)
+        except LookupError as e:
+            # KeyError from the cohort store or a disabled store
+            raise HTTPException(status_code=404, detail=f"Cohort not found: {str(e)}")
+        except IncompatibleCohortError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cohort: {str(e)}")
+
+@app.post("/admin/reload", status_code=202, dependencies=[Depends(require_admin)])
+async def reload_models():
+    """
+    Reload models from disk without downtime
+    
+    New artifacts are loaded, warmed and validated in the background and
+    only then swapped in; requests already running finish on the old models.
+    Under serve.py the parent reloads once and replaces every worker.
+    """
+    if worker_pids is not None:
+        os.kill(os.getppid(), signal.SIGHUP)
+        return {"started": True, "supervisor_pid": os.getppid(), **reloader.status()}
+    started = reloader.trigger(reason='admin')
+    return {"started": started, **reloader.status()}
+
+@app.get("/admin/reload", dependencies=[Depends(require_admin)])
+async def reload_status():
+    """Get the state of the last model reload"""
+    return reloader.status()
+
+@app.get("/shadow/stats")
+async def shadow_stats():
+    """Get disagreement rates and deltas of the shadow candidate vs production"""
+    if predictor is None:
+        raise HTTPException(status_code=503, detail="Models not loaded")
+    
+    if predictor.shadow_stats is None:
+        return {"enabled": False}
+    
+    return {
+        "enabled": predictor.candidate is not None,
+        "primary_version": predictor.model_version,
+        **predictor.shadow_stats.summary()
+    }
+
+def resolve_candidate_dir(models_dir):
+    """
+    Resolve a candidate directory, which must lie under SHADOW_CANDIDATES_DIR
+    
+    Relative paths are taken relative to SHADOW_CANDIDATES_DIR; symlinks are
+    resolved before the check.
+    """
+    root = os.path.realpath(SHADOW_CANDIDATES_DIR)
+    path = os.path.realpath(os.path.join(root, models_dir))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Candidate models must be under {SHADOW_CANDIDATES_DIR}")
+    return path
+
+@app.post("/admin/shadow", dependencies=[Depends(require_admin)])
+async def load_shadow_candidate(request: ShadowRequest):
+    """Start shadow-scoring live traffic with a candidate model set"""
+    if predictor is None:
+        raise HTTPException(status_code=503, detail="Models not loaded")
+    
+    global shadow_models_dir
+    try:
+        candidate_dir = resolve_candidate_dir(request.models_dir)
+        predictor.load_candidate(candidate_dir)
     except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not load candidate: {str(e)}")
+    shadow_models_dir = candidate_dir
+    
+    return {"enabled": True, "candidate_version": predictor.candidate['model_version']}
+
+@app.delete("/admin/shadow", dependencies=[Depends(require_admin)])
+async def clear_shadow_candidate():
+    """Stop shadow scoring"""
+    global shadow_models_dir
+    shadow_models_dir = None
+    if predictor is not None:
+        predictor.clear_candidate()
+    return {"enabled": False}
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """List recent request profiles, newest first"""
+    if profiler is None:
         raise HTTPException(
-            status_code=500,
-            detail=f"Prediction failed: {str(e)}"
+            status_code=404,
+            detail="Profiling disabled. Set PROFILING_ENABLED or PROFILE_SAMPLE_RATE"
+        )
+    return {"sample_rate": profiler.sample_rate, "profiles": profiler.list()}
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str, format: str = 'speedscope'):
+    """
+    Download a request profile
+    
+    Args:
+        profile_id: Id from /admin/profiles or the X-Profile-Id response header
+        format: 'speedscope' (JSON for speedscope.app) or 'collapsed' (flamegraph.pl input)
+    """
+    profile = profiler.get(profile_id) if profiler is not None else None
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if format == 'collapsed':
+        return PlainTextResponse(
+            profile.to_collapsed(),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed.txt"'}
+        )
+    if format == 'speedscope':
+        return JSONResponse(
+            profile.to_speedscope(),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'}
         )
+    raise HTTPException(status_code=400, detail="format must be 'speedscope' or 'collapsed'")
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    """Stop the job worker pool and the model watcher"""
+    job_manager.shutdown()
+    reloader.stop()
+
+# Worker pids published by serve.py in shared memory (None when run directly)
+worker_pids = None
+
+def process_scope():
+    """
+    Scope of the limits and counters a stats endpoint reports
+    
+    Under serve.py every worker has its own admission controller, job pool
+    and tenant cache, so their limits and counters apply per worker: the
+    service admits up to workers × ADMISSION_MAX_CONCURRENT requests and may
+    hold workers × TENANT_CACHE_MAX_MB of tenant models.
+    """
+    if worker_pids is None:
+        return {"scope": "process", "pid": os.getpid()}
+    return {"scope": "worker", "pid": os.getpid(), "workers": int(np.count_nonzero(worker_pids))}
+
+@app.get("/workers")
+async def worker_memory():
+    """Report the memory of every worker (RSS, PSS, shared and private MB)"""
+    pids = [int(pid) for pid in worker_pids if pid] if worker_pids is not None else [os.getpid()]
+    response = {
+        **process_scope(),
+        "workers": [{"pid": pid, **process_memory(pid)} for pid in pids]
+    }
+    if worker_pids is not None:
+        response["parent"] = {"pid": os.getppid(), **process_memory(os.getppid())}
+    return response
+
+@app.get("/drift")
+async def feature_drift():
+    """Get per-feature drift (PSI, KS, quantiles) of live inputs vs training data"""
+    if predictor is None:
+        raise HTTPException(status_code=503, detail="Models not loaded")
+    
+    if predictor.drift_monitor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Drift reference not available. Retrain models to create it"
+        )
+    
+    return {"model_version": predictor.model_version, **predictor.drift_monitor.report()}
+
+@app.post("/admin/drift/reset", dependencies=[Depends(require_admin)])
+async def reset_drift():
+    """Clear the live drift histograms"""
+    if predictor is not None and predictor.drift_monitor is not None:
+        predictor.drift_monitor.reset()
+    return {"reset": True}
+
+@app.get("/admission/stats")
+async def admission_stats():
+    """Get admission control load and shed counters (of this worker under serve.py)"""
+    return {**admission.stats(), **process_scope()}
+
+@app.get("/coalescing/stats")
+async def coalescing_stats():
+    """
+    Counters of /predict requests that shared an identical in-flight computation
+    
+    executed counts computations run, coalesced counts requests answered by
+    another request's computation.
+    """
+    if single_flight is None:
+        return {"enabled": False}
+    return {"enabled": True, **single_flight.stats()}
+
+@app.get("/tenants/stats")
+async def tenant_stats():
+    """Report the tenant model variant cache"""
+    if predictor is None or predictor.tenant_models is None:
+        return {"enabled": False}
+    return {"enabled": True, **predictor.tenant_models.stats(), **process_scope()}
+
+@app.get("/store/stats")
+async def store_stats():
+    """Get prediction store hit/miss counters and size"""
+    if store is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **store.stats()}
 
 @app.get("/model-info")
 async def model_info():
@@ -192,20 +1043,25 @@ async def model_info():
         )
     
     return {
-        "placement_model": "Logistic Regression",
-        "salary_model": "Linear Regression",
+        "model_family": predictor.family.name,
+        "placement_model": predictor.model_meta['placement_model'],
+        "salary_model": predictor.model_meta['salary_model'],
+        "metrics": predictor.model_meta.get('metrics', {}),
+        "model_version": predictor.model_version,
         "features": predictor.preprocessor.feature_columns,
         "feature_count": len(predictor.preprocessor.feature_columns),
-        "shap_enabled": predictor.enable_shap
+        "shap_enabled": predictor.enable_shap,
+        "tenant_variants": len(predictor.tenant_models) if predictor.tenant_models is not None else 0
     }
 
 @app.get("/feature-importance/{model_type}")
-async def get_feature_importance(model_type: str):
+async def get_feature_importance(model_type: str, source: str = 'background'):
     """
     Get global feature importance using SHAP
     
     Args:
         model_type: 'placement' or 'salary'
+        source: 'background' (reference data) or 'live' (recent real requests)
         
     Returns:
         List of features with importance scores
@@ -228,18 +1084,68 @@ async def get_feature_importance(model_type: str):
             detail="model_type must be 'placement' or 'salary'"
         )
     
+    if source not in ['background', 'live']:
+        raise HTTPException(
+            status_code=400,
+            detail="source must be 'background' or 'live'"
+        )
+    
     try:
-        importance = predictor.shap_explainer.get_global_feature_importance(model_type)
-        return {
+        importance = predictor.shap_explainer.get_global_feature_importance(model_type, source=source)
+        response = {
             "model_type": model_type,
+            "source": source,
             "feature_importance": importance
         }
+        if source == 'live':
+            accumulator = predictor.shap_explainer.live_importance[model_type]
+            response["explanations"] = accumulator.count
+            response["half_life"] = accumulator.half_life
+        return response
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get feature importance: {str(e)}"
         )
 
+@app.get("/dependence/{model_type}/{feature}")
+async def get_dependence(model_type: str, feature: str, request: Request, bins: int = Query(10, ge=2, le=50)):
+    """
+    Binned SHAP dependence and partial dependence of one input feature
+    
+    Args:
+        model_type: 'placement' or 'salary'
+        feature: Input feature name (e.g. 'mba_p', 'workex')
+        bins: Quantile bins for numeric features
+        
+    Returns:
+        Aligned arrays (labels, counts, SHAP mean and band, PDP) for charting
+    """
+    if predictor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded"
+        )
+    
+    if not predictor.enable_shap or not predictor.shap_explainer:
+        raise HTTPException(
+            status_code=503,
+            detail="SHAP explainer not available"
+        )
+    
+    async with admission.admit(client_id(request), BULK):
+        try:
+            return await run_in_threadpool(dependence_cache.get, predictor, model_type, feature, bins)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to compute dependence: {str(e)}"
+            )
+
 # Run server
 if __name__ == "__main__":
     print("\n" + "="*60)
@@ -0,0 +1,341 @@
+"""
+Model Families Module
+Pluggable model families: how placement and salary models are trained, saved,
+loaded, scored and explained.
+
+Families:
+    linear: LogisticRegression / LinearRegression with exact linear SHAP
+    gbt:    Gradient-boosted trees compiled into flat NumPy arrays, with exact
+            path-dependent TreeSHAP over the same arrays
+"""
+
+import json
+import os
+
+import joblib
+import numpy as np
+import shap
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+from sklearn.linear_model import LogisticRegression, LinearRegression
+from sklearn.utils.class_weight import compute_sample_weight
+
+# Family name and model descriptions written next to the model pickles
+MODEL_META_FILE = 'model_meta.json'
+
+DEFAULT_FAMILY = 'linear'
+
+
+class CompiledTreeEnsemble:
+    """
+    Gradient-boosted trees flattened into contiguous NumPy arrays
+
+    Two layouts are kept:
+    - a node table shared by all trees (children as absolute node indices,
+      -1 for leaves) with training sample weights, used by TreeSHAP
+    - every tree padded to a complete binary tree of depth max_depth, used
+      for prediction: all split comparisons of a row chunk are computed in
+      one vectorized pass and each level then picks one bit per tree, so
+      scoring needs no per-tree or per-row Python loop
+
+    Leaf values are already scaled by the learning rate.
+    """
+
+    # Rows compared per vectorized pass (keeps the comparison matrix in cache)
+    CHUNK_ROWS = 256
+
+    def __init__(self, feature, threshold, left, right, value, node_weight, roots,
+                 base_offset, max_depth, n_features, classes=None, feature_importances=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.node_weight = node_weight
+        self.roots = roots
+        self.base_offset = base_offset
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features
+        self.classes_ = classes
+        self.feature_importances_ = feature_importances
+        self._compile_levels()
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Compile a fitted GradientBoostingClassifier (binary) or GradientBoostingRegressor
+
+        Returns:
+            CompiledTreeEnsemble with the same predictions as model
+        """
+        is_classifier = isinstance(model, GradientBoostingClassifier)
+        if is_classifier and len(model.classes_) != 2:
+            raise ValueError("Only binary gradient-boosted classifiers can be compiled")
+
+        features, thresholds, lefts, rights, values, weights, roots = [], [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_[:, 0]:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+            roots.append(offset)
+            features.append(np.where(is_leaf, -1, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, -1, tree.children_left + offset))
+            rights.append(np.where(is_leaf, -1, tree.children_right + offset))
+            values.append(tree.value[:, 0, 0] * model.learning_rate)
+            weights.append(tree.weighted_n_node_samples)
+            offset += tree.node_count
+
+        # Raw score of the initial estimator (log-odds prior or mean target)
+        dummy = np.zeros((1, model.n_features_in_))
+        base_offset = float(model._raw_predict_init(dummy)[0, 0])
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values).astype(np.float64),
+            node_weight=np.concatenate(weights).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            base_offset=base_offset,
+            max_depth=max(estimator.tree_.max_depth for estimator in model.estimators_[:, 0]),
+            n_features=model.n_features_in_,
+            classes=model.classes_ if is_classifier else None,
+            feature_importances=model.feature_importances_
+        )
+
+    def _compile_levels(self):
+        """Build the complete-binary-tree arrays used for prediction"""
+        depth = max(self.max_depth, 1)
+        n_trees = len(self.roots)
+        n_internal = 2 ** depth - 1
+        # Leaves above max_depth become splits that always go left (feature 0,
+        # threshold +inf) and repeat their value in every padded leaf
+        split_feature = np.zeros((n_trees, n_internal), dtype=np.intp)
+        split_threshold = np.full((n_trees, n_internal), np.inf)
+        leaf_value = np.zeros((n_trees, 2 ** depth))
+
+        for t, root in enumerate(self.roots):
+            stack = [(int(root), 0, 0)]
+            while stack:
+                node, position, level = stack.pop()
+                if level == depth:
+                    leaf_value[t, position - n_internal] = self.value[node]
+                    continue
+                if self.left[node] < 0:
+                    stack.append((node, 2 * position + 1, level + 1))
+                    stack.append((node, 2 * position + 2, level + 1))
+                else:
+                    split_feature[t, position] = self.feature[node]
+                    split_threshold[t, position] = self.threshold[node]
+                    stack.append((int(self.left[node]), 2 * position + 1, level + 1))
+                    stack.append((int(self.right[node]), 2 * position + 2, level + 1))
+
+        # Inputs are compared as float32 (as the trees were fitted); for a
+        # float32 x, x <= t holds exactly when x <= t rounded down to float32
+        threshold32 = split_threshold.astype(np.float32)
+        rounded_up = threshold32.astype(np.float64) > split_threshold
+        threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+        self._depth = depth
+        self._split_feature = split_feature.ravel()
+        self._split_threshold = threshold32.ravel()[:, None]
+        self._leaf_offset = (np.arange(n_trees) * 2 ** depth)[:, None]
+        self._leaf_value = leaf_value.ravel()
+
+    def _raw_chunk(self, X_T):
+        """Raw output for a chunk of rows given as a (features, rows) float32 array"""
+        n_trees = len(self.roots)
+        n_rows = X_T.shape[1]
+        # goes_right[t, node, row]: all split decisions of all trees at once
+        goes_right = (X_T[self._split_feature] > self._split_threshold).reshape(n_trees, -1, n_rows)
+
+        leaf = goes_right[:, 0, :].astype(np.intp)
+        for level in range(1, self._depth):
+            first = 2 ** level - 1
+            level_bits = goes_right[:, first:first + 2 ** level, :]
+            leaf = 2 * leaf + np.take_along_axis(level_bits, leaf[:, None, :], axis=1)[:, 0, :]
+        return self.base_offset + self._leaf_value[self._leaf_offset + leaf].sum(axis=0)
+
+    def decision_function(self, X):
+        """Raw ensemble output (log-odds for classifiers)"""
+        X_T = np.asarray(X, dtype=np.float32).T
+        raw = np.empty(X_T.shape[1])
+        for start in range(0, len(raw), self.CHUNK_ROWS):
+            chunk = np.ascontiguousarray(X_T[:, start:start + self.CHUNK_ROWS])
+            raw[start:start + chunk.shape[1]] = self._raw_chunk(chunk)
+        return raw
+
+    def predict_proba(self, X):
+        """Class probabilities [P(class 0), P(class 1)] (classifiers only)"""
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        """Predicted class (classifiers) or value (regressors)"""
+        if self.classes_ is not None:
+            return self.classes_[self.predict_proba(X).argmax(axis=1)]
+        return self.decision_function(X)
+
+    def shap_model(self):
+        """Per-tree dict model understood by shap.TreeExplainer"""
+        trees = []
+        bounds = list(self.roots) + [len(self.feature)]
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            left = self.left[start:stop]
+            right = self.right[start:stop]
+            is_leaf = left < 0
+            children_left = np.where(is_leaf, -1, left - start)
+            trees.append({
+                'children_left': children_left,
+                'children_right': np.where(is_leaf, -1, right - start),
+                'children_default': children_left,
+                'features': np.where(is_leaf, -2, self.feature[start:stop]),
+                'thresholds': np.where(is_leaf, 0.0, self.threshold[start:stop]),
+                'values': self.value[start:stop, None],
+                'node_sample_weight': self.node_weight[start:stop]
+            })
+        return {
+            'trees': trees,
+            'base_offset': self.base_offset,
+            'tree_output': 'log_odds' if self.classes_ is not None else 'raw_value',
+            'input_dtype': np.float32
+        }
+
+
+class LinearFamily:
+    """Logistic regression for placement, linear regression for salary"""
+
+    name = 'linear'
+    placement_model_name = 'Logistic Regression'
+    salary_model_name = 'Linear Regression'
+    weight_name = 'coefficient'
+
+    def train_placement(self, X, y):
+        return LogisticRegression(max_iter=1000, random_state=42, class_weight='balanced').fit(X, y)
+
+    def train_salary(self, X, y):
+        return LinearRegression().fit(X, y)
+
+    def feature_weights(self, model):
+        """Signed coefficients per feature"""
+        return np.ravel(model.coef_[0] if model.coef_.ndim == 2 else model.coef_)
+
+    def explainer(self, model, background):
+        """
+        Exact linear SHAP explainer
+
+        Args:
+            background: Background DataFrame or (means, covariance) tuple
+        """
+        return shap.LinearExplainer(model, background)
+
+
+class TreeFamily:
+    """Gradient-boosted trees, served from a compiled flat-array ensemble"""
+
+    name = 'gbt'
+    placement_model_name = 'Gradient Boosted Trees'
+    salary_model_name = 'Gradient Boosted Trees'
+    weight_name = 'importance'
+
+    def __init__(self, n_estimators=150, max_depth=3, learning_rate=0.05):
+        self.n_estimators = n_estimators
+        self.max_depth = max_depth
+        self.learning_rate = learning_rate
+
+    def train_placement(self, X, y):
+        model = GradientBoostingClassifier(
+            n_estimators=self.n_estimators,
+            max_depth=self.max_depth,
+            learning_rate=self.learning_rate,
+            subsample=0.8,
+            random_state=42
+        )
+        # Same class balancing as the linear family
+        model.fit(X, y, sample_weight=compute_sample_weight('balanced', y))
+        return CompiledTreeEnsemble.from_sklearn(model)
+
+    def train_salary(self, X, y):
+        model = GradientBoostingRegressor(
+            n_estimators=self.n_estimators,
+            max_depth=max(self.max_depth - 1, 1),
+            learning_rate=self.learning_rate,
+            subsample=0.8,
+            random_state=42
+        )
+        return CompiledTreeEnsemble.from_sklearn(model.fit(X, y))
+
+    def feature_weights(self, model):
+        """Impurity-based importances per feature"""
+        return model.feature_importances_
+
+    def explainer(self, model, background):
+        """
+        Exact path-dependent TreeSHAP over the compiled trees
+
+        Uses the node sample weights recorded at training time, so no
+        background data is needed.
+        """
+        return shap.TreeExplainer(model.shap_model(), feature_perturbation='tree_path_dependent')
+
+
+FAMILIES = {family.name: family for family in (LinearFamily(), TreeFamily())}
+
+
+def get_family(name):
+    """
+    Look up a model family by name
+
+    Raises:
+        ValueError: if the family is unknown
+    """
+    if name not in FAMILIES:
+        raise ValueError(f"Unknown model family '{name}' (choose from {', '.join(FAMILIES)})")
+    return FAMILIES[name]
+
+
+def save_model_meta(models_dir, family, metrics=None):
+    """Record the family and model descriptions of a saved model set"""
+    meta = {
+        'family': family.name,
+        'placement_model': family.placement_model_name,
+        'salary_model': family.salary_model_name,
+        'metrics': metrics or {}
+    }
+    with open(os.path.join(models_dir, MODEL_META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load_model_meta(models_dir):
+    """
+    Load a model set's family metadata
+
+    Model sets saved before families existed are linear.
+    """
+    path = os.path.join(models_dir, MODEL_META_FILE)
+    if not os.path.exists(path):
+        family = FAMILIES[DEFAULT_FAMILY]
+        return {
+            'family': family.name,
+            'placement_model': family.placement_model_name,
+            'salary_model': family.salary_model_name,
+            'metrics': {}
+        }
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_models(models_dir):
+    """
+    Load a saved model set
+
+    Returns:
+        (family, placement_model, salary_model, meta)
+    """
+    meta = load_model_meta(models_dir)
+    family = get_family(meta['family'])
+    placement_model = joblib.load(os.path.join(models_dir, 'placement_model.pkl'))
+    salary_model = joblib.load(os.path.join(models_dir, 'salary_model.pkl'))
+    return family, placement_model, salary_model, meta
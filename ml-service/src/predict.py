@@ -3,28 +3,96 @@ Prediction Module
 Handles loading models and making predictions on new data.
 """
 
+import hashlib
+import json
+import time
+import threading
 import joblib
 import numpy as np
 import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
+from preprocessing import INPUT_COLUMNS
+from drift import FeatureDriftMonitor
+from store import PredictionStore
+from tenants import TenantModelCache, DEFAULT_CACHE_MB
+from validation import InputValidator, InputValidationError
+import model_families
+
+MODEL_FILES = ('placement_model.pkl', 'salary_model.pkl', 'preprocessor.pkl')
+
+# Artifacts that also change outputs when present (model family, SHAP
+# background, dependence reference sample)
+OPTIONAL_MODEL_FILES = ('model_meta.json', 'shap_background.npz', 'reference_sample.npz')
+
+# Minimum salary set to 200,000 (2 LPA) which is reasonable for fresh graduates
+MIN_SALARY = 200000
+
+# Salary is only predicted for students likely to be placed
+SALARY_PROBABILITY_THRESHOLD = 0.3
+
+# Maximum shadow-scoring batches waiting behind the response path
+MAX_PENDING_SHADOW_BATCHES = 64
+
+# Skill-gap thresholds shared by analyze_skill_gaps and skill_gap_masks
+ACADEMIC_TARGET = 70
+MBA_TARGET = 60
+ETEST_TARGET = 70
+LOW_PROBABILITY = 0.5
+
+def compute_model_version(models_dir):
+    """Derive a version string from the content of every artifact that affects outputs"""
+    digest = hashlib.sha256()
+    for filename in MODEL_FILES:
+        with open(os.path.join(models_dir, filename), 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    for filename in OPTIONAL_MODEL_FILES:
+        path = os.path.join(models_dir, filename)
+        if not os.path.exists(path):
+            continue
+        digest.update(filename.encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
 
 class PlacementPredictor:
     """Make predictions using trained models"""
     
-    def __init__(self, models_dir='../models', enable_shap=False):
+    def __init__(self, models_dir='../models', enable_shap=False, store=None, single_flight=None,
+                 tenant_cache_mb=DEFAULT_CACHE_MB):
         """
         Load trained models and preprocessor
         
         Args:
             models_dir: Directory containing trained models
             enable_shap: Whether to enable SHAP explainability (default: False)
+            store: Optional PredictionStore used to reuse results across restarts
+            single_flight: Optional SingleFlight coalescing identical concurrent
+                predict_complete calls
+            tenant_cache_mb: Memory budget for resident tenant model variants
         """
         self.models_dir = models_dir
         self.placement_model = None
         self.salary_model = None
         self.preprocessor = None
+        self.validator = None
+        self.model_version = None
+        self.family = None
+        self.model_meta = None
         self.enable_shap = enable_shap
         self.shap_explainer = None
+        self.store = store
+        self.single_flight = single_flight
+        self.drift_monitor = None
+        self.tenant_cache_mb = tenant_cache_mb
+        self.tenant_models = None
+        self.candidate = None
+        self.shadow_stats = None
+        self._shadow_executor = None
+        self._shadow_pending = 0
+        self._shadow_lock = threading.Lock()
         
         self.load_models()
         
@@ -44,20 +112,156 @@ class PlacementPredictor:
     def load_models(self):
         """Load all required models"""
         try:
-            self.placement_model = joblib.load(
-                os.path.join(self.models_dir, 'placement_model.pkl')
-            )
-            self.salary_model = joblib.load(
-                os.path.join(self.models_dir, 'salary_model.pkl')
-            )
+            self.family, self.placement_model, self.salary_model, self.model_meta = \
+                model_families.load_models(self.models_dir)
             self.preprocessor = joblib.load(
                 os.path.join(self.models_dir, 'preprocessor.pkl')
             )
-            print("✓ Models loaded successfully")
+            self.validator = InputValidator.from_preprocessor(self.preprocessor)
+            self.model_version = compute_model_version(self.models_dir)
+            self.drift_monitor = FeatureDriftMonitor.load(
+                self.models_dir, self.preprocessor.feature_columns
+            )
+            self.tenant_models = TenantModelCache.open(
+                self.models_dir, self.model_version, max_bytes=int(self.tenant_cache_mb * 1024 * 1024)
+            )
+            print(f"✓ Models loaded successfully ({self.family.name} family, version {self.model_version})")
         except Exception as e:
             print(f"Error loading models: {e}")
             raise
     
+    def load_candidate(self, candidate_dir):
+        """
+        Load a candidate model set to shadow-score live traffic
+        
+        The candidate must have been trained with the same encodings, so it
+        can score the feature matrix already computed for the primary models.
+        
+        Args:
+            candidate_dir: Directory containing the candidate's model artifacts
+        """
+        from shadow import ShadowStats
+        
+        candidate_preprocessor = joblib.load(os.path.join(candidate_dir, 'preprocessor.pkl'))
+        if candidate_preprocessor.feature_columns != self.preprocessor.feature_columns:
+            raise ValueError("Candidate models use different feature columns")
+        for col, le in self.preprocessor.label_encoders.items():
+            candidate_le = candidate_preprocessor.label_encoders.get(col)
+            if candidate_le is None or list(candidate_le.classes_) != list(le.classes_):
+                raise ValueError(f"Candidate models encode '{col}' differently")
+        
+        candidate = {
+            'placement_model': joblib.load(os.path.join(candidate_dir, 'placement_model.pkl')),
+            'salary_model': joblib.load(os.path.join(candidate_dir, 'salary_model.pkl')),
+            'models_dir': candidate_dir,
+            'model_version': compute_model_version(candidate_dir)
+        }
+        
+        with self._shadow_lock:
+            if self._shadow_executor is None:
+                self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shadow')
+            self.shadow_stats = ShadowStats(candidate['model_version'])
+            self.candidate = candidate
+        print(f"✓ Shadow candidate loaded (version {candidate['model_version']})")
+    
+    def clear_candidate(self):
+        """Stop shadow scoring and its thread (batches already queued still finish)"""
+        with self._shadow_lock:
+            self.candidate = None
+            executor, self._shadow_executor = self._shadow_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    def close(self):
+        """Release background threads once this predictor no longer serves requests"""
+        self.clear_candidate()
+    
+    def _submit_shadow(self, X, scores=None):
+        """
+        Queue a shadow pass for a batch (off the response path)
+        
+        Args:
+            X: Encoded feature matrix served to the client
+            scores: score_features output of the production models for X, or
+                None to rescore it on the shadow thread (rows served from the
+                prediction store have no scores at hand)
+        """
+        if self.candidate is None:
+            return
+        
+        # Submitted under the lock so clear_candidate cannot shut the executor down in between
+        with self._shadow_lock:
+            candidate = self.candidate
+            if candidate is None:
+                return
+            if self._shadow_pending >= MAX_PENDING_SHADOW_BATCHES:
+                self.shadow_stats.record_dropped(len(X))
+                return
+            self._shadow_pending += 1
+            self._shadow_executor.submit(self._score_shadow, candidate, self.shadow_stats, X, scores)
+    
+    def _score_shadow(self, candidate, stats, X, scores):
+        """Score X with the candidate models and record the deltas"""
+        try:
+            if scores is None:
+                scores = self.score_features(X)
+            candidate_scores = self._score_with(candidate['placement_model'], candidate['salary_model'], X)
+            stats.update(scores, candidate_scores, SALARY_PROBABILITY_THRESHOLD)
+        except Exception as e:
+            print(f"Warning: Shadow scoring failed: {e}")
+        finally:
+            with self._shadow_lock:
+                self._shadow_pending -= 1
+    
+    def score_features(self, X):
+        """
+        Score a preprocessed feature matrix with both models
+        
+        Args:
+            X: DataFrame of encoded features (one row per student)
+            
+        Returns:
+            dict of arrays: placed, probability, confidence and salary
+            (salary already clipped to MIN_SALARY)
+        """
+        return self._score_with(self.placement_model, self.salary_model, X)
+    
+    @staticmethod
+    def _score_with(placement_model, salary_model, X):
+        """Score X with the given placement and salary models"""
+        probability = placement_model.predict_proba(X)
+        salary = np.maximum(salary_model.predict(X), MIN_SALARY)
+        
+        return {
+            'placed': placement_model.classes_[probability.argmax(axis=1)].astype(bool),
+            'probability': probability[:, 1],  # Probability of being placed
+            'confidence': probability.max(axis=1),
+            'salary': salary
+        }
+    
+    @staticmethod
+    def _placement_result(scores, i):
+        """Build the placement result dict for row i of score_features output"""
+        return {
+            'placed': bool(scores['placed'][i]),
+            'probability': float(scores['probability'][i]),
+            'confidence': float(scores['confidence'][i])
+        }
+    
+    @staticmethod
+    def _salary_result(scores, i):
+        """Build the salary result dict for row i of score_features output"""
+        salary = float(scores['salary'][i])
+        
+        # Calculate salary range (±10%)
+        return {
+            'expected_salary': salary,
+            'salary_range': {
+                'min': salary * 0.9,
+                'max': salary * 1.1
+            }
+        }
+    
     def predict_placement(self, student_data):
         """
         Predict placement probability for a student
@@ -71,15 +275,7 @@ class PlacementPredictor:
         # Preprocess input
         X = self.preprocessor.preprocess_input(student_data)
         
-        # Make prediction
-        prediction = self.placement_model.predict(X)[0]
-        probability = self.placement_model.predict_proba(X)[0]
-        
-        return {
-            'placed': bool(prediction),
-            'probability': float(probability[1]),  # Probability of being placed
-            'confidence': float(max(probability))
-        }
+        return self._placement_result(self.score_features(X), 0)
     
     def predict_salary(self, student_data):
         """
@@ -94,25 +290,7 @@ class PlacementPredictor:
         # Preprocess input
         X = self.preprocessor.preprocess_input(student_data)
         
-        # Make prediction
-        salary = self.salary_model.predict(X)[0]
-        
-        # Ensure salary is positive and above minimum threshold
-        # Minimum salary set to 200,000 (2 LPA) which is reasonable for fresh graduates
-        MIN_SALARY = 200000
-        salary = max(MIN_SALARY, salary)
-        
-        # Calculate salary range (±10%)
-        salary_min = salary * 0.9
-        salary_max = salary * 1.1
-        
-        return {
-            'expected_salary': float(salary),
-            'salary_range': {
-                'min': float(salary_min),
-                'max': float(salary_max)
-            }
-        }
+        return self._salary_result(self.score_features(X), 0)
     
     def analyze_skill_gaps(self, student_data, placement_result):
         """
@@ -135,11 +313,11 @@ class PlacementPredictor:
             student_data['degree_p']
         ) / 3
         
-        if avg_score < 70:
+        if avg_score < ACADEMIC_TARGET:
             skill_gaps.append({
                 'area': 'Academic Performance',
                 'current': f"{avg_score:.1f}%",
-                'target': '70%+',
+                'target': f'{ACADEMIC_TARGET}%+',
                 'priority': 'high'
             })
             recommendations.append("Focus on improving academic scores through consistent study habits")
@@ -155,27 +333,27 @@ class PlacementPredictor:
             recommendations.append("Gain practical work experience through internships or part-time jobs")
         
         # MBA performance
-        if student_data['mba_p'] < 60:
+        if student_data['mba_p'] < MBA_TARGET:
             skill_gaps.append({
                 'area': 'MBA Performance',
                 'current': f"{student_data['mba_p']:.1f}%",
-                'target': '60%+',
+                'target': f'{MBA_TARGET}%+',
                 'priority': 'medium'
             })
             recommendations.append("Improve MBA scores through focused preparation and practice")
         
         # Employability test
-        if student_data['etest_p'] < 70:
+        if student_data['etest_p'] < ETEST_TARGET:
             skill_gaps.append({
                 'area': 'Employability Test',
                 'current': f"{student_data['etest_p']:.1f}%",
-                'target': '70%+',
+                'target': f'{ETEST_TARGET}%+',
                 'priority': 'medium'
             })
             recommendations.append("Enhance employability skills through aptitude test practice")
         
         # Overall assessment
-        if placement_result['probability'] < 0.5:
+        if placement_result['probability'] < LOW_PROBABILITY:
             recommendations.append("Consider additional certifications in trending technologies")
             recommendations.append("Build a strong portfolio with real-world projects")
             recommendations.append("Participate in hackathons and coding competitions")
@@ -187,48 +365,422 @@ class PlacementPredictor:
             'improvement_potential': 'high' if len(skill_gaps) > 2 else 'medium' if len(skill_gaps) > 0 else 'low'
         }
     
-    def predict_complete(self, student_data):
+    @staticmethod
+    def skill_gap_masks(inputs):
+        """
+        Vectorized form of the analyze_skill_gaps rules
+        
+        Args:
+            inputs: DataFrame of raw student inputs
+            
+        Returns:
+            (dict mapping skill-gap area to a boolean array, overall_score array)
+        """
+        avg_score = (
+            inputs['ssc_p'].to_numpy(dtype=np.float64) +
+            inputs['hsc_p'].to_numpy(dtype=np.float64) +
+            inputs['degree_p'].to_numpy(dtype=np.float64)
+        ) / 3
+        
+        masks = {
+            'Academic Performance': avg_score < ACADEMIC_TARGET,
+            'Work Experience': inputs['workex'].to_numpy() == 'No',
+            'MBA Performance': inputs['mba_p'].to_numpy(dtype=np.float64) < MBA_TARGET,
+            'Employability Test': inputs['etest_p'].to_numpy(dtype=np.float64) < ETEST_TARGET
+        }
+        return masks, avg_score
+    
+    def predict_complete(self, student_data, explain=None, tenant=None):
         """
         Complete prediction pipeline
         
         Args:
             student_data: dict with student information
+            explain: Whether to attach SHAP explanations (defaults to enable_shap)
+            tenant: Tenant whose model variant should score the student
+                (the global models are used when it has none)
             
         Returns:
-            dict with all predictions and analysis
+            dict with all predictions and analysis (shared, not copied, with
+            concurrent callers coalesced onto the same computation)
+            
+        Raises:
+            InputValidationError: if a field is missing, of the wrong type,
+                an unknown category or out of range
         """
-        # Predict placement
-        placement_result = self.predict_placement(student_data)
+        errors = self.validator.validate_record(student_data)
+        if errors:
+            raise InputValidationError(errors)
         
-        # Predict salary (only if likely to be placed)
-        salary_result = None
-        if placement_result['probability'] > 0.3:
-            salary_result = self.predict_salary(student_data)
+        if self.single_flight is None:
+            return self.predict_batch([student_data], explain=explain, tenant=tenant)[0]
         
-        # Analyze skill gaps
-        skill_analysis = self.analyze_skill_gaps(student_data, placement_result)
+        # Identical encoded rows under the same model version give identical results
+        X = self.preprocessor.preprocess_batch([student_data])
+        variant = self.tenant_variant(tenant)
+        key = (
+            PredictionStore.make_keys(X.to_numpy(), self._version(variant))[0],
+            self._resolve_explain(explain)
+        )
+        result, _ = self.single_flight.do(
+            key, lambda: self._predict_encoded([student_data], X, explain=explain, live=True, variant=variant)[0]
+        )
+        return result
+    
+    def tenant_variant(self, tenant):
+        """Model variant of a tenant, or None to use the global models"""
+        if tenant is None or self.tenant_models is None:
+            return None
+        return self.tenant_models.get(tenant)
+    
+    def _version(self, variant):
+        """Model version results of a variant (or of the global models) are keyed by"""
+        return self.model_version if variant is None else variant['model_version']
+    
+    def _score_variant(self, variant, X):
+        """score_features with a tenant variant (global salary model if it has none)"""
+        if variant is None:
+            return self.score_features(X)
+        return self._score_with(variant['placement_model'], variant['salary_model'] or self.salary_model, X)
+    
+    def _explainer(self, variant):
+        """SHAP explainer for a tenant variant (or the global models), built on first use"""
+        if variant is None:
+            return self.shap_explainer
+        if variant['explainer'] is None:
+            return self.tenant_models.attach_explainer(variant, self.shap_explainer.for_models(
+                variant['placement_model'], variant['salary_model'] or self.salary_model
+            ))
+        return variant['explainer']
+    
+    def _resolve_explain(self, explain):
+        """Whether SHAP explanations will actually be attached"""
+        if explain is None:
+            explain = self.enable_shap
+        return bool(explain and self.enable_shap and self.shap_explainer is not None)
+    
+    def predict_batch(self, records, explain=False, live=True, tenant=None):
+        """
+        Complete prediction pipeline for many students at once
         
-        # Add SHAP explanations if enabled
-        shap_explanations = None
-        if self.enable_shap and self.shap_explainer:
-            try:
-                shap_explanations = {
-                    'placement': self.shap_explainer.explain_placement_prediction(student_data),
-                    'salary': self.shap_explainer.explain_salary_prediction(student_data) if salary_result else None
+        Rows already scored by the current model version are served from the
+        prediction store (when configured); the rest are scored in one
+        vectorized pass and written back.
+        
+        Args:
+            records: list of dicts with student information
+            explain: Whether to attach SHAP explanations (defaults to enable_shap)
+            live: Whether the records are live traffic; warmup and validation
+                batches pass False to bypass the prediction store, drift
+                monitoring, live SHAP importance and shadow scoring
+            tenant: Tenant whose model variant should score the records
+            
+        Returns:
+            list of result dicts in the same order as records
+        """
+        X = self.preprocessor.preprocess_batch(records)
+        return self._predict_encoded(records, X, explain=explain, live=live, variant=self.tenant_variant(tenant))
+    
+    def predict_rows(self, records, explain=False, live=True, tenant=None):
+        """
+        predict_batch for loosely typed records, rejecting invalid rows individually
+        
+        The whole batch is validated with vectorized masks before any model
+        work; the valid rows are then scored together.
+        
+        Args:
+            records: list of dicts with student information (not yet validated)
+            explain, live, tenant: as for predict_batch
+            
+        Returns:
+            list in the same order as records: a result dict for valid rows
+            and {'errors': [...]} for rejected rows
+        """
+        valid, errors, inputs = self.validator.validate_records(records)
+        results = [{'errors': errors[i]} if i in errors else None for i in range(len(records))]
+        
+        rows = np.flatnonzero(valid)
+        if len(rows):
+            # Encode the validated frame directly; the clean records are only
+            # needed for skill analysis and SHAP
+            inputs = inputs.iloc[rows].reset_index(drop=True)
+            X = self.preprocessor.preprocess_frame(inputs)
+            clean = [
+                dict(zip(INPUT_COLUMNS, values))
+                for values in zip(*(inputs[col].tolist() for col in INPUT_COLUMNS))
+            ]
+            scored = self._predict_encoded(
+                clean, X, explain=explain, live=live, variant=self.tenant_variant(tenant)
+            )
+            for i, result in zip(rows, scored):
+                results[i] = result
+        return results
+    
+    def _predict_encoded(self, records, X, explain=False, live=True, variant=None):
+        """predict_batch for records already encoded into X (and scored by variant if given)"""
+        explain = self._resolve_explain(explain)
+        version = self._version(variant)
+        
+        if live and self.drift_monitor is not None:
+            self.drift_monitor.update(X)
+        
+        store = self.store if live else None
+        entries = {}
+        if store is not None:
+            keys = store.make_keys(X.to_numpy(), version)
+            entries = store.get_many(keys)
+        else:
+            keys = list(range(len(records)))
+        
+        # Score rows the store has not seen
+        missing = [i for i, key in enumerate(keys) if key not in entries]
+        updated = {}
+        scores = None
+        if missing:
+            X_missing = X.iloc[missing]
+            scores = self._score_variant(variant, X_missing)
+            for j, i in enumerate(missing):
+                placement_result = self._placement_result(scores, j)
+                entry = {
+                    'placement': placement_result,
+                    # Predict salary (only if likely to be placed)
+                    'salary': self._salary_result(scores, j)
+                    if placement_result['probability'] > SALARY_PROBABILITY_THRESHOLD else None,
+                    'shap_explanations': None
                 }
+                entries[keys[i]] = entry
+                updated[keys[i]] = entry
+        
+        # The shadow candidate sees all served rows, including store hits, and
+        # is compared against the global models only
+        if live and variant is None:
+            self._submit_shadow(X, scores if len(missing) == len(keys) else None)
+        
+        explainer = None
+        if explain:
+            try:
+                explainer = self._explainer(variant)
             except Exception as e:
-                print(f"Warning: SHAP explanation failed: {e}")
+                print(f"Warning: SHAP explainer for tenant variant failed: {e}")
+                explain = False
+        results = []
+        for i, student_data in enumerate(records):
+            entry = entries[keys[i]]
+            
+            # Add SHAP explanations if enabled
+            shap_explanations = entry['shap_explanations'] if explain else None
+            if explain and shap_explanations is None:
+                try:
+                    X_row = X.iloc[[i]]
+                    shap_explanations = {
+                        'placement': explainer.explain_placement_prediction(student_data, X_row, live=live),
+                        'salary': explainer.explain_salary_prediction(student_data, X_row, live=live)
+                        if entry['salary'] else None
+                    }
+                    entry['shap_explanations'] = shap_explanations
+                    updated[keys[i]] = entry
+                except Exception as e:
+                    print(f"Warning: SHAP explanation failed: {e}")
+            
+            result = {
+                'placement': entry['placement'],
+                'salary': entry['salary'],
+                # Analyze skill gaps
+                'skill_analysis': self.analyze_skill_gaps(student_data, entry['placement'])
+            }
+            
+            if shap_explanations:
+                result['shap_explanations'] = shap_explanations
+            
+            results.append(result)
+        
+        if store is not None:
+            store.put_many(updated, version)
+        
+        return results
+    
+    def score_columns(self, columns, live=True):
+        """
+        Score column arrays in one vectorized pass (binary transport path)
+        
+        Skips per-row result dicts, skill analysis, SHAP and the prediction
+        store; drift monitoring and shadow scoring still see the rows.
+        
+        Args:
+            columns: dict mapping each input column to an array
+            live: Whether the rows are live traffic
+            
+        Returns:
+            dict of arrays: placed, probability, confidence and expected_salary
+            (NaN where no salary is predicted)
+        """
+        X = self.preprocessor.preprocess_columns(columns)
+        
+        if live and self.drift_monitor is not None:
+            self.drift_monitor.update(X)
+        
+        scores = self.score_features(X)
+        if live:
+            self._submit_shadow(X, scores)
+        
+        return self.column_outputs(scores)
+    
+    def score_column_rows(self, columns, live=True):
+        """
+        score_columns for unvalidated column arrays, rejecting invalid rows individually
+        
+        Args:
+            columns: dict mapping each input column to an array
+            live: Whether the rows are live traffic
+            
+        Returns:
+            (dict of arrays as for score_columns plus a valid mask, with
+             placed False and NaN scores for rejected rows;
+             dict mapping rejected row index to its errors)
+            
+        Raises:
+            ValueError: if a column is missing
+        """
+        valid, errors, inputs = self.validator.validate_columns(columns)
+        n_rows = len(valid)
+        outputs = {
+            'placed': np.zeros(n_rows, dtype=bool),
+            'probability': np.full(n_rows, np.nan),
+            'confidence': np.full(n_rows, np.nan),
+            'expected_salary': np.full(n_rows, np.nan),
+            'valid': valid
+        }
         
-        result = {
-            'placement': placement_result,
-            'salary': salary_result,
-            'skill_analysis': skill_analysis
+        rows = np.flatnonzero(valid)
+        if len(rows):
+            X = self.preprocessor.preprocess_frame(inputs.iloc[rows].reset_index(drop=True))
+            if live and self.drift_monitor is not None:
+                self.drift_monitor.update(X)
+            scores = self.score_features(X)
+            if live:
+                self._submit_shadow(X, scores)
+            for name, values in self.column_outputs(scores).items():
+                outputs[name][rows] = values
+        return outputs, errors
+    
+    @staticmethod
+    def column_outputs(scores):
+        """
+        Convert score_features output to output columns
+        
+        Returns:
+            dict of arrays: placed, probability, confidence and expected_salary
+            (NaN where no salary is predicted)
+        """
+        return {
+            'placed': scores['placed'],
+            'probability': scores['probability'],
+            'confidence': scores['confidence'],
+            'expected_salary': np.where(
+                scores['probability'] > SALARY_PROBABILITY_THRESHOLD, scores['salary'], np.nan
+            )
         }
+    
+    def synthetic_records(self, n_rows, seed=0):
+        """
+        Generate plausible student records from the fitted encoder vocabularies
         
-        if shap_explanations:
-            result['shap_explanations'] = shap_explanations
+        Args:
+            n_rows: Number of records
+            seed: Seed for the local random generator
+            
+        Returns:
+            list of dicts with student information
+        """
+        rng = np.random.default_rng(seed)
+        columns = {}
+        for col in INPUT_COLUMNS:
+            if col in self.preprocessor.label_encoders:
+                columns[col] = rng.choice(self.preprocessor.label_encoders[col].classes_, n_rows)
+            else:
+                columns[col] = np.round(rng.uniform(45, 95, n_rows), 2)
+        return pd.DataFrame(columns).to_dict(orient='records')
+    
+    def warmup(self, n_rows=32):
+        """
+        Exercise every prediction hot path once so the first real requests do
+        not pay for lazy initialization inside sklearn, shap and numpy
         
-        return result
+        Args:
+            n_rows: Size of the synthetic warmup batch
+            
+        Returns:
+            dict of timings in milliseconds per path
+        """
+        records = self.synthetic_records(n_rows)
+        timings = {}
+        
+        def timed(name, fn):
+            start = time.perf_counter()
+            result = fn()
+            timings[f'{name}_ms'] = (time.perf_counter() - start) * 1000
+            return result
+        
+        X = timed('preprocess', lambda: self.preprocessor.preprocess_input(records[0]))
+        timed('single', lambda: self.predict_batch(records[:1], explain=False, live=False))
+        timed('batch', lambda: self.predict_batch(records, explain=False, live=False))
+        
+        if self.enable_shap and self.shap_explainer:
+            timed('explain_placement', lambda: self.shap_explainer.explain_placement_prediction(records[0], X, live=False))
+            timed('explain_salary', lambda: self.shap_explainer.explain_salary_prediction(records[0], X, live=False))
+            timed('single_explained', lambda: self.predict_batch(records[1:2], explain=True, live=False))
+            timed('global_importance', lambda: self.shap_explainer.get_global_feature_importance('placement'))
+        
+        timings['total_ms'] = sum(timings.values())
+        return timings
+    
+    def validate(self, golden_set_path=None, min_accuracy=0.7):
+        """
+        Check that the loaded models produce sane outputs
+        
+        Outputs on a synthetic batch must be finite with probabilities in
+        [0, 1]. If a golden set is available (saved by train.py), placement
+        accuracy on it must reach min_accuracy.
+        
+        Args:
+            golden_set_path: JSON file with held-out students and outcomes
+                (defaults to golden_set.json in models_dir)
+            min_accuracy: Minimum placement accuracy on the golden set
+            
+        Returns:
+            dict with 'passed' and details
+        """
+        report = {'passed': True, 'checks': []}
+        
+        X = self.preprocessor.preprocess_batch(self.synthetic_records(64, seed=1))
+        scores = self.score_features(X)
+        sane = bool(
+            np.all(np.isfinite(scores['probability']))
+            and np.all((scores['probability'] >= 0) & (scores['probability'] <= 1))
+            and np.all(np.isfinite(scores['salary']))
+        )
+        report['checks'].append({'name': 'output_sanity', 'passed': sane})
+        report['passed'] &= sane
+        
+        if golden_set_path is None:
+            golden_set_path = os.path.join(self.models_dir, 'golden_set.json')
+        if os.path.exists(golden_set_path):
+            with open(golden_set_path) as f:
+                golden_set = json.load(f)
+            X = self.preprocessor.preprocess_batch([item['student'] for item in golden_set])
+            expected = np.array([item['placed'] for item in golden_set], dtype=bool)
+            accuracy = float((self.score_features(X)['placed'] == expected).mean())
+            passed = accuracy >= min_accuracy
+            report['checks'].append({
+                'name': 'golden_set_accuracy',
+                'passed': passed,
+                'accuracy': accuracy,
+                'min_accuracy': min_accuracy,
+                'rows': len(golden_set)
+            })
+            report['passed'] &= passed
+        
+        return report
 
 if __name__ == "__main__":
     # Test prediction
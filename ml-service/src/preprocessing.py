@@ -3,11 +3,26 @@ Data Preprocessing Module
 Handles data cleaning, encoding, and feature engineering for the placement prediction models.
 """
 
+import hashlib
+import inspect
+import os
+import joblib
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 
+# Raw student fields accepted for prediction
+INPUT_COLUMNS = [
+    'gender', 'ssc_p', 'ssc_b', 'hsc_p', 'hsc_b', 'hsc_s',
+    'degree_p', 'degree_t', 'workex', 'etest_p', 'specialisation', 'mba_p'
+]
+
+CATEGORICAL_COLUMNS = ['gender', 'ssc_b', 'hsc_b', 'hsc_s', 'degree_t', 'workex', 'specialisation']
+
+# Bump when preprocessing output changes in a way the source hash cannot see
+PREPROCESSING_VERSION = 1
+
 class PlacementDataPreprocessor:
     """Preprocessor for campus placement dataset"""
     
@@ -38,11 +53,9 @@ class PlacementDataPreprocessor:
     
     def encode_categorical(self, df, fit=True):
         """Encode categorical variables"""
-        categorical_cols = ['gender', 'ssc_b', 'hsc_b', 'hsc_s', 'degree_t', 'workex', 'specialisation']
-        
         df_encoded = df.copy()
         
-        for col in categorical_cols:
+        for col in CATEGORICAL_COLUMNS:
             if col in df.columns:
                 if fit:
                     # Create and fit encoder
@@ -92,12 +105,33 @@ class PlacementDataPreprocessor:
         
         return X
     
+    def decode_inputs(self, df):
+        """Convert encoded rows back to raw student records"""
+        return self.decode_frame(df).to_dict(orient='records')
+    
+    def decode_frame(self, df):
+        """Convert encoded rows back to a DataFrame of raw inputs"""
+        raw = df[INPUT_COLUMNS].copy()
+        for col, le in self.label_encoders.items():
+            raw[col] = le.inverse_transform(raw[col].astype(int))
+        return raw
+    
     def split_data(self, X, y, test_size=0.2, random_state=42):
         """Split data into training and testing sets"""
         return train_test_split(X, y, test_size=test_size, random_state=random_state, stratify=y if len(np.unique(y)) < 10 else None)
     
-    def preprocess_pipeline(self, filepath):
-        """Complete preprocessing pipeline"""
+    def preprocess_pipeline(self, filepath, cache_dir=None):
+        """
+        Complete preprocessing pipeline
+        
+        Args:
+            filepath: Source CSV file
+            cache_dir: Optional directory for a Parquet cache of the result,
+                keyed by the CSV content and the preprocessing code version
+        """
+        if cache_dir is not None:
+            return self._cached_pipeline(filepath, cache_dir)
+        
         # Load data
         df = self.load_data(filepath)
         
@@ -112,11 +146,113 @@ class PlacementDataPreprocessor:
         
         return df
     
+    def _cache_key(self, filepath):
+        """Hash of the source CSV and of the code that transforms it"""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(str(PREPROCESSING_VERSION).encode())
+        for method in (self.load_data, self.clean_data, self.encode_categorical,
+                       self.engineer_features, self._compact_dtypes):
+            digest.update(inspect.getsource(method).encode())
+        return digest.hexdigest()[:16]
+    
+    def _cached_pipeline(self, filepath, cache_dir):
+        """preprocess_pipeline backed by a Parquet cache with compact dtypes"""
+        key = self._cache_key(filepath)
+        data_path = os.path.join(cache_dir, f"{key}.parquet")
+        encoders_path = os.path.join(cache_dir, f"{key}.encoders.pkl")
+        
+        if os.path.exists(data_path) and os.path.exists(encoders_path):
+            try:
+                df = pd.read_parquet(data_path)
+                self.label_encoders = joblib.load(encoders_path)
+                print(f"Dataset loaded from cache: {df.shape[0]} rows ({data_path})")
+                return df
+            except ImportError as e:
+                # No Parquet engine: same frame as a cache miss, just not cached
+                print(f"Warning: Parquet cache unavailable ({e}); preprocessing from CSV")
+                return self._compact_dtypes(self.preprocess_pipeline(filepath))
+            except Exception as e:
+                # Corrupt or partial cache files: rebuild them
+                print(f"Warning: Could not read preprocessed dataset cache ({e}); rebuilding it")
+        
+        df = self._compact_dtypes(self.preprocess_pipeline(filepath))
+        
+        # Write to temporary files and rename, so readers never see partial files
+        suffix = f".tmp-{os.getpid()}"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            joblib.dump(self.label_encoders, encoders_path + suffix)
+            df.to_parquet(data_path + suffix, index=False)
+            os.replace(encoders_path + suffix, encoders_path)
+            os.replace(data_path + suffix, data_path)
+            print(f"✓ Preprocessed dataset cached to {data_path}")
+        except Exception as e:
+            print(f"Warning: Could not cache preprocessed dataset ({e})")
+            for path in (encoders_path + suffix, data_path + suffix):
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        return df
+    
+    def _compact_dtypes(self, df):
+        """
+        Downcast to compact dtypes: int8 codes, categorical labels
+        
+        Float values stay float64, the dtype inference scores, so models are
+        trained on exactly the values they will see.
+        """
+        df = df.reset_index(drop=True)
+        for col in df.columns:
+            if col in self.label_encoders:
+                df[col] = df[col].astype(np.int8)
+            elif pd.api.types.is_integer_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+            elif df[col].dtype == object:
+                df[col] = df[col].astype('category')
+        return df
+    
     def preprocess_input(self, input_data):
         """Preprocess single input for prediction"""
+        return self.preprocess_batch([input_data])
+    
+    def preprocess_batch(self, records):
+        """Preprocess a list of inputs for prediction in one vectorized pass"""
         # Convert to DataFrame
-        df = pd.DataFrame([input_data])
+        return self.preprocess_frame(pd.DataFrame(records))
+    
+    def preprocess_columns(self, columns):
+        """
+        Preprocess column arrays for prediction without building per-row objects
+        
+        Args:
+            columns: dict mapping each of INPUT_COLUMNS to an array
+            
+        Raises:
+            ValueError: if a column is missing or a score is not a number in [0, 100]
+        """
+        missing = [col for col in INPUT_COLUMNS if col not in columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
         
+        df = pd.DataFrame({col: columns[col] for col in INPUT_COLUMNS})
+        for col in INPUT_COLUMNS:
+            if col not in CATEGORICAL_COLUMNS:
+                values = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+                invalid = ~values.between(0, 100)
+                if invalid.any():
+                    raise ValueError(
+                        f"Column '{col}' must hold numbers between 0 and 100 "
+                        f"(first invalid row: {int(np.flatnonzero(invalid.to_numpy())[0])})"
+                    )
+                df[col] = values
+        
+        return self.preprocess_frame(df)
+    
+    def preprocess_frame(self, df):
+        """Encode and engineer features for a DataFrame of raw (validated) inputs"""
         # Encode categorical variables (using fitted encoders)
         df = self.encode_categorical(df, fit=False)
         
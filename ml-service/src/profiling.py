@@ -0,0 +1,161 @@
+"""
+Request Profiling Module
+Opt-in statistical profiler for individual requests with a ring buffer of recent profiles.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+
+class Profile:
+    """Stack samples collected while one request ran"""
+
+    def __init__(self, label, interval):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.interval = interval
+        self.started_at = time.time()
+        self.duration = None
+        self.samples = Counter()
+
+    def summary(self):
+        return {
+            'profile_id': self.id,
+            'label': self.label,
+            'started_at': self.started_at,
+            'duration_ms': self.duration * 1000 if self.duration is not None else None,
+            'samples': sum(self.samples.values())
+        }
+
+    def to_collapsed(self):
+        """Collapsed-stack text (one 'root;...;leaf count' line per stack), for flamegraph tools"""
+        return ''.join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in sorted(self.samples.items())
+        )
+
+    def to_speedscope(self):
+        """Speedscope 'sampled' profile document"""
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+        for stack, count in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({'name': frame})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(count * self.interval)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': self.label,
+            'exporter': 'placement-ml-service',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': self.label,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': self.duration or 0,
+                'samples': samples,
+                'weights': weights
+            }]
+        }
+
+
+class RequestProfiler:
+    """
+    Samples the stacks of threads running profiled requests
+
+    A background thread wakes every interval while at least one request is
+    being profiled and records the current stack of each profiled thread.
+    Nothing runs and nothing is sampled when no request is profiled.
+    """
+
+    def __init__(self, sample_rate=0.0, interval=0.001, max_profiles=50):
+        """
+        Args:
+            sample_rate: Fraction of requests profiled without a debug header
+            interval: Seconds between stack samples
+            max_profiles: Number of recent profiles kept
+        """
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.profiles = deque(maxlen=max_profiles)
+        self._active = {}
+        self._lock = threading.Lock()
+        self._sampler = None
+
+    def should_profile(self, forced=False):
+        """Decide whether to profile a request (always when forced by a debug header)"""
+        return forced or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def run(self, label, fn, *args, **kwargs):
+        """
+        Call fn under the profiler
+
+        Returns:
+            (fn's return value, Profile)
+        """
+        profile = Profile(label, self.interval)
+        ident = threading.get_ident()
+        start = time.perf_counter()
+        with self._lock:
+            self._active[ident] = profile
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_loop, name='request-profiler', daemon=True)
+                self._sampler.start()
+        try:
+            return fn(*args, **kwargs), profile
+        finally:
+            with self._lock:
+                del self._active[ident]
+            profile.duration = time.perf_counter() - start
+            self.profiles.append(profile)
+
+    def _sample_loop(self):
+        """Sampler thread: runs only while requests are being profiled"""
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                active = list(self._active.items())
+
+            frames = sys._current_frames()
+            for ident, profile in active:
+                frame = frames.get(ident)
+                if frame is not None:
+                    profile.samples[self._stack(frame)] += 1
+
+    @staticmethod
+    def _stack(frame):
+        """Root-to-leaf tuple of 'function (file:line)' labels"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def list(self):
+        """Summaries of stored profiles, newest first"""
+        return [profile.summary() for profile in reversed(self.profiles)]
+
+    def get(self, profile_id):
+        """Return a stored profile by id, or None"""
+        for profile in self.profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
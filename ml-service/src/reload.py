@@ -0,0 +1,162 @@
+"""
+Model Reload Module
+Loads new model artifacts in the background, warms and validates them, then swaps them in.
+"""
+
+import os
+import threading
+import time
+
+from predict import MODEL_FILES, OPTIONAL_MODEL_FILES
+
+
+class ModelReloader:
+    """Zero-downtime reload of the serving predictor"""
+
+    def __init__(self, build_predictor, on_swap, models_dir='../models', min_accuracy=0.7):
+        """
+        Args:
+            build_predictor: Callable returning a freshly loaded PlacementPredictor
+            on_swap: Callable receiving the new predictor once it is ready and
+                the reload report (with its warmup and validation results); it
+                replaces the serving reference in a single assignment, so
+                in-flight requests finish on the predictor they started with
+            models_dir: Directory watched for new artifacts
+            min_accuracy: Minimum golden-set accuracy required to swap
+        """
+        self.build_predictor = build_predictor
+        self.on_swap = on_swap
+        self.models_dir = models_dir
+        self.min_accuracy = min_accuracy
+        self._reload_lock = threading.Lock()
+        self._watch_thread = None
+        self._stop_event = threading.Event()
+        self._watched = None
+        self._pending = None
+        self.last_reload = None
+
+    @property
+    def in_progress(self):
+        return self._reload_lock.locked()
+
+    def trigger(self, reason='manual'):
+        """
+        Start a background reload
+
+        Returns:
+            False if a reload is already running, True otherwise
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._reload, args=(reason,), daemon=True).start()
+        return True
+
+    def reload(self, reason='manual'):
+        """Run a reload in the calling thread and return its report"""
+        with self._reload_lock:
+            return self._do_reload(reason)
+
+    def _reload(self, reason):
+        """Background thread entry point (the reload lock is already held)"""
+        try:
+            self._do_reload(reason)
+        finally:
+            self._reload_lock.release()
+
+    def _do_reload(self, reason):
+        """Load, warm, validate and swap"""
+        report = {'reason': reason, 'started_at': time.time(), 'swapped': False}
+        candidate = None
+        try:
+            start = time.perf_counter()
+            candidate = self.build_predictor()
+            report['load_ms'] = (time.perf_counter() - start) * 1000
+            report['model_version'] = candidate.model_version
+
+            report['warmup'] = candidate.warmup()
+
+            validation = candidate.validate(min_accuracy=self.min_accuracy)
+            report['validation'] = validation
+            if validation['passed']:
+                self.on_swap(candidate, report)
+                report['swapped'] = True
+                print(f"✓ Models reloaded (version {candidate.model_version}, reason: {reason})")
+            else:
+                print(f"Warning: Reloaded models failed validation; keeping current models: {validation}")
+        except Exception as e:
+            report['error'] = str(e)
+            print(f"Warning: Model reload failed: {e}")
+        if candidate is not None and not report['swapped']:
+            candidate.close()
+
+        report['finished_at'] = time.time()
+        self.last_reload = report
+        return report
+
+    def status(self):
+        """Return reload state for the admin endpoint"""
+        return {
+            'in_progress': self.in_progress,
+            'watching': self._watch_thread is not None and self._watch_thread.is_alive(),
+            'last_reload': self.last_reload
+        }
+
+    def _artifact_signature(self):
+        """mtime/size of every model artifact (None for missing files)"""
+        signature = []
+        for filename in MODEL_FILES + OPTIONAL_MODEL_FILES:
+            try:
+                stat = os.stat(os.path.join(self.models_dir, filename))
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def poll(self):
+        """
+        Check models_dir once for changed artifacts
+
+        A change is only reported once the signature has been the same for
+        two consecutive polls, so half-written files from a running train.py
+        are not picked up. Call mark_current with the returned signature once
+        a reload for it has been started.
+
+        Returns:
+            The new artifact signature, or None if nothing settled has changed
+        """
+        if self._watched is None:
+            self._watched = self._artifact_signature()
+            return None
+        signature = self._artifact_signature()
+        if signature == self._watched:
+            self._pending = None
+        elif None not in signature[:len(MODEL_FILES)]:
+            # Unless a required artifact is missing, e.g. while train.py rewrites it
+            if signature == self._pending:
+                return signature
+            self._pending = signature
+        return None
+
+    def mark_current(self, signature):
+        """Record the artifact signature the serving models were reloaded from"""
+        self._watched = signature
+        self._pending = None
+
+    def start_watching(self, interval=5.0):
+        """Poll models_dir every interval seconds and reload when the artifacts change"""
+        if self._watch_thread is not None:
+            return
+
+        def watch():
+            self.poll()
+            while not self._stop_event.wait(interval):
+                signature = self.poll()
+                if signature is not None and self.trigger(reason='file_change'):
+                    self.mark_current(signature)
+
+        self._watch_thread = threading.Thread(target=watch, name='model-watch', daemon=True)
+        self._watch_thread.start()
+
+    def stop(self):
+        """Stop watching models_dir"""
+        self._stop_event.set()
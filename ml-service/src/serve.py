@@ -0,0 +1,363 @@
+"""
+Pre-fork Serving Launcher
+Loads models once in a parent process, then forks uvicorn workers that share them.
+
+Usage:
+    python serve.py [--workers N] [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import gc
+import mmap
+import os
+import signal
+import socket
+import time
+
+import numpy as np
+
+# Offsets of arrays in the shared mapping are aligned for vectorized loads
+ALIGNMENT = 64
+
+# Packages whose objects are walked for arrays (model and encoder state only;
+# pandas, threading and the like manage their own memory)
+_WALK_MODULES = ('sklearn', 'shap', 'model_families', 'preprocessing')
+
+
+def _array_slots(obj, slots, seen, depth=0, max_depth=8):
+    """
+    Collect (container, key, array) for every numeric array reachable from obj
+
+    Walks object attributes, dicts and lists; tuples are skipped because
+    their items cannot be replaced.
+    """
+    if depth > max_depth or id(obj) in seen:
+        return
+    seen.add(id(obj))
+
+    if isinstance(obj, dict):
+        items = list(obj.items())
+    elif isinstance(obj, list):
+        items = list(enumerate(obj))
+    elif type(obj).__module__.split('.')[0] in _WALK_MODULES and not isinstance(obj, type) \
+            and isinstance(getattr(obj, '__dict__', None), dict):
+        obj = vars(obj)
+        items = list(obj.items())
+    else:
+        return
+
+    for key, value in items:
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind in 'biuf' and value.size > 0:
+                slots.append((obj, key, value))
+        elif not isinstance(value, (str, bytes, int, float, bool, type(None))):
+            _array_slots(value, slots, seen, depth + 1, max_depth)
+
+
+def share_arrays(roots):
+    """
+    Move the numeric arrays of read-only model objects into one shared mapping
+
+    Small NumPy arrays live on heap pages next to Python objects whose
+    reference counts change in every worker, so after a fork those pages are
+    copied per worker. An anonymous shared mapping holds only array data and
+    is never written, so all workers keep using the parent's pages. The new
+    arrays are marked read-only.
+
+    Args:
+        roots: Objects to walk (models, preprocessors, explainers); must not
+            hold arrays that are updated in place
+
+    Returns:
+        dict with the number of arrays moved and the mapping size in bytes
+    """
+    slots, seen = [], set()
+    for root in roots:
+        if root is not None:
+            _array_slots(root, slots, seen)
+
+    # The same array may be referenced from several places; copy it once
+    offsets, size = {}, 0
+    for _, _, array in slots:
+        if id(array) not in offsets:
+            offsets[id(array)] = size
+            size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    if size == 0:
+        return {'arrays': 0, 'bytes': 0}
+
+    # mmap(-1, ...) is an anonymous MAP_SHARED mapping, inherited by forked workers
+    mapping = mmap.mmap(-1, size)
+    shared = {}
+    for container, key, array in slots:
+        view = shared.get(id(array))
+        if view is None:
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=mapping, offset=offsets[id(array)])
+            view[...] = array
+            view.flags.writeable = False
+            shared[id(array)] = view
+        container[key] = view
+
+    return {'arrays': len(shared), 'bytes': size}
+
+
+def process_memory(pid=None):
+    """
+    Memory of a process from /proc (Linux)
+
+    Pss splits shared pages evenly between the processes mapping them, so
+    summing Pss over workers gives their real combined footprint.
+
+    Returns:
+        dict of rss_mb, pss_mb, shared_mb and private_mb (None where unavailable)
+    """
+    pid = pid or os.getpid()
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    except OSError:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        fields['Rss'] = int(line.split()[1]) / 1024
+        except OSError:
+            pass
+
+    def field(*names):
+        if not all(name in fields for name in names):
+            return None
+        return round(sum(fields[name] for name in names), 1)
+
+    return {
+        'rss_mb': field('Rss'),
+        'pss_mb': field('Pss'),
+        'shared_mb': field('Shared_Clean', 'Shared_Dirty'),
+        'private_mb': field('Private_Clean', 'Private_Dirty')
+    }
+
+
+def _shared_roots(predictor):
+    """Read-only model objects of a predictor (live counters are left alone)"""
+    roots = [predictor.placement_model, predictor.salary_model, predictor.preprocessor]
+    explainer = predictor.shap_explainer
+    if explainer is not None:
+        roots += [
+            explainer.placement_model, explainer.salary_model, explainer.preprocessor,
+            explainer.placement_explainer, explainer.salary_explainer
+        ]
+    return roots
+
+
+def _bind(host, port, backlog=2048):
+    """Listening socket created once and inherited by every worker"""
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(main, sock, log_level):
+    """Worker body: serve the parent's app on the shared socket"""
+    import uvicorn
+
+    gc.enable()
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+    server = uvicorn.Server(uvicorn.Config(main.app, log_level=log_level))
+    server.run(sockets=[sock])
+
+
+def _fork_worker(main, sock, log_level):
+    """Fork one worker and return its pid"""
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(main, sock, log_level)
+        except BaseException as e:
+            print(f"Warning: Worker {os.getpid()} failed: {e}")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def log_memory(pids):
+    """Print the memory of the parent and every worker"""
+    total_pss = 0.0
+    for label, pid in [('parent', os.getpid())] + [(f'worker {i}', pid) for i, pid in enumerate(pids)]:
+        memory = process_memory(pid)
+        total_pss += memory['pss_mb'] or 0.0
+        print(f"  {label:<10} pid {pid:<7} RSS {memory['rss_mb']} MB, "
+              f"PSS {memory['pss_mb']} MB, shared {memory['shared_mb']} MB, private {memory['private_mb']} MB")
+    print(f"  total PSS {total_pss:.1f} MB")
+
+
+def _share_and_freeze(predictor):
+    """Move the predictor's arrays into shared memory and freeze everything loaded so far"""
+    shared = share_arrays(_shared_roots(predictor))
+    print(f"✓ Shared {shared['arrays']} model arrays ({shared['bytes'] / 1024:.1f} KB) with workers")
+
+    # Keep the collector off the objects loaded so far, so workers do not
+    # touch (and copy) their pages when collecting
+    gc.collect()
+    gc.freeze()
+
+
+def reload_models(main, reason):
+    """
+    Reload the models in the parent, ready to be inherited by new workers
+
+    Loading, warmup and validation run once here instead of in every worker,
+    and the new arrays are shared like the startup ones.
+
+    Returns:
+        The reload report (swapped is False if the current models are kept)
+    """
+    gc.unfreeze()
+    report = main.reloader.reload(reason=reason)
+    if report['swapped']:
+        _share_and_freeze(main.predictor)
+    else:
+        gc.collect()
+        gc.freeze()
+    return report
+
+
+def serve(workers, host='0.0.0.0', port=8000, log_level='info', memory_interval=60.0):
+    """
+    Load the service once, then fork and supervise workers
+
+    Workers that exit unexpectedly are replaced. SIGINT/SIGTERM stop all
+    workers gracefully. Models are reloaded in the parent, on SIGHUP (sent by
+    a worker's POST /admin/reload) or when MODEL_WATCH_INTERVAL is set and
+    the artifacts change, and the workers are then replaced one at a time
+    with forks of the reloaded parent, so the new models stay shared.
+    """
+    # Collecting while models load only moves objects between generations;
+    # everything loaded here is frozen below anyway
+    gc.disable()
+
+    # Artifacts are watched by this process, not by a thread in every worker
+    watch_interval = os.environ.pop('MODEL_WATCH_INTERVAL', None)
+
+    import main
+
+    if main.predictor is None:
+        raise SystemExit("Models not loaded. Please train models first by running train.py")
+
+    # Warm up before forking so lazily initialized state is shared too
+    main.warm_up_service()
+
+    # Worker pid table in shared memory, read by GET /workers
+    pid_table = np.ndarray((workers,), dtype=np.int64, buffer=mmap.mmap(-1, workers * 8))
+    pid_table[:] = 0
+    main.worker_pids = pid_table
+
+    sock = _bind(host, port)
+
+    _share_and_freeze(main.predictor)
+
+    stopping = False
+    reload_requested = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in pid_table:
+            if pid:
+                try:
+                    os.kill(int(pid), signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+    def request_reload(signum, frame):
+        nonlocal reload_requested
+        reload_requested = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGHUP, request_reload)
+
+    for slot in range(workers):
+        pid_table[slot] = _fork_worker(main, sock, log_level)
+    print(f"✓ Serving on {host}:{port} with {workers} workers (pids {', '.join(map(str, pid_table))})")
+
+    next_log = time.monotonic() + min(memory_interval, 10.0) if memory_interval > 0 else None
+    next_watch = None
+    if watch_interval:
+        main.reloader.poll()
+        next_watch = time.monotonic() + float(watch_interval)
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        if pid:
+            slots = np.flatnonzero(pid_table == pid)
+            if len(slots):
+                if stopping:
+                    pid_table[slots[0]] = 0
+                else:
+                    print(f"Warning: Worker {pid} exited (status {status}); restarting")
+                    pid_table[slots[0]] = _fork_worker(main, sock, log_level)
+            continue
+
+        if stopping and not pid_table.any():
+            break
+
+        reason = None
+        if reload_requested:
+            reason, reload_requested = 'admin', False
+        elif next_watch is not None and time.monotonic() >= next_watch:
+            signature = main.reloader.poll()
+            if signature is not None:
+                main.reloader.mark_current(signature)
+                reason = 'file_change'
+            next_watch = time.monotonic() + float(watch_interval)
+        if reason is not None and not stopping and reload_models(main, reason)['swapped']:
+            # Replace workers one at a time; the old one finishes its requests on SIGTERM
+            for slot in range(workers):
+                old_pid = int(pid_table[slot])
+                pid_table[slot] = _fork_worker(main, sock, log_level)
+                if old_pid:
+                    try:
+                        os.kill(old_pid, signal.SIGTERM)
+                    except ProcessLookupError:
+                        pass
+            print(f"✓ Workers restarted on the reloaded models (pids {', '.join(map(str, pid_table))})")
+            continue
+
+        if next_log is not None and time.monotonic() >= next_log:
+            print("Worker memory:")
+            log_memory([int(pid) for pid in pid_table if pid])
+            next_log = time.monotonic() + memory_interval
+        time.sleep(0.5)
+
+    sock.close()
+    print("✓ All workers stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the API from pre-forked workers sharing one model load")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 2)),
+                        help="Number of worker processes (default: WEB_CONCURRENCY or CPU count)")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--log-level', default='info')
+    parser.add_argument('--memory-interval', type=float, default=60.0,
+                        help="Seconds between worker memory reports (0 disables)")
+    args = parser.parse_args()
+
+    serve(args.workers, args.host, args.port, args.log_level, args.memory_interval)
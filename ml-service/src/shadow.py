@@ -0,0 +1,90 @@
+"""
+Shadow Scoring Module
+Aggregates how a candidate model set disagrees with the production models on live traffic.
+"""
+
+import threading
+
+import numpy as np
+
+
+class ShadowStats:
+    """Running comparison of primary vs candidate scores"""
+
+    def __init__(self, candidate_version=None):
+        self.candidate_version = candidate_version
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all aggregates"""
+        with self._lock:
+            self.rows = 0
+            self.dropped_rows = 0
+            self.placement_disagreements = 0
+            self.salary_eligibility_disagreements = 0
+            self.probability_delta_sum = 0.0
+            self.probability_abs_delta_sum = 0.0
+            self.probability_sq_delta_sum = 0.0
+            self.probability_max_abs_delta = 0.0
+            self.salary_delta_sum = 0.0
+            self.salary_abs_delta_sum = 0.0
+            self.salary_max_abs_delta = 0.0
+
+    def update(self, primary, candidate, salary_threshold):
+        """
+        Fold one scored batch into the aggregates
+
+        Args:
+            primary: score_features output of the production models
+            candidate: score_features output of the candidate models
+            salary_threshold: Probability above which a salary is reported
+        """
+        probability_delta = candidate['probability'] - primary['probability']
+        salary_delta = candidate['salary'] - primary['salary']
+        eligibility_differs = (
+            (primary['probability'] > salary_threshold) != (candidate['probability'] > salary_threshold)
+        )
+        abs_probability_delta = np.abs(probability_delta)
+        abs_salary_delta = np.abs(salary_delta)
+
+        with self._lock:
+            self.rows += len(probability_delta)
+            self.placement_disagreements += int(np.count_nonzero(primary['placed'] != candidate['placed']))
+            self.salary_eligibility_disagreements += int(np.count_nonzero(eligibility_differs))
+            self.probability_delta_sum += float(probability_delta.sum())
+            self.probability_abs_delta_sum += float(abs_probability_delta.sum())
+            self.probability_sq_delta_sum += float(np.square(probability_delta).sum())
+            self.probability_max_abs_delta = max(self.probability_max_abs_delta, float(abs_probability_delta.max()))
+            self.salary_delta_sum += float(salary_delta.sum())
+            self.salary_abs_delta_sum += float(abs_salary_delta.sum())
+            self.salary_max_abs_delta = max(self.salary_max_abs_delta, float(abs_salary_delta.max()))
+
+    def record_dropped(self, n_rows):
+        """Count rows skipped because the shadow queue was full"""
+        with self._lock:
+            self.dropped_rows += n_rows
+
+    def summary(self):
+        """Return disagreement rates and mean deltas"""
+        with self._lock:
+            rows = self.rows
+            per_row = (lambda total: total / rows) if rows else (lambda total: None)
+            return {
+                'candidate_version': self.candidate_version,
+                'rows': rows,
+                'dropped_rows': self.dropped_rows,
+                'placement_disagreement_rate': per_row(self.placement_disagreements),
+                'salary_eligibility_disagreement_rate': per_row(self.salary_eligibility_disagreements),
+                'probability_delta': {
+                    'mean': per_row(self.probability_delta_sum),
+                    'mean_abs': per_row(self.probability_abs_delta_sum),
+                    'rmse': float(np.sqrt(self.probability_sq_delta_sum / rows)) if rows else None,
+                    'max_abs': self.probability_max_abs_delta
+                },
+                'salary_delta': {
+                    'mean': per_row(self.salary_delta_sum),
+                    'mean_abs': per_row(self.salary_abs_delta_sum),
+                    'max_abs': self.salary_max_abs_delta
+                }
+            }
@@ -0,0 +1,78 @@
+"""
+Request Coalescing Module
+Single-flight execution: concurrent calls with the same key share one computation.
+"""
+
+import threading
+
+
+class _Call:
+    """One in-flight computation and the callers waiting for it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it runs block and receive the same result (or exception).
+    Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'executed': 0, 'coalesced': 0, 'errors': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is already running
+
+        Returns:
+            (result, shared) where shared is True if the result came from
+            another caller's computation
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self):
+        """Return coalescing counters"""
+        with self._lock:
+            total = self._stats['executed'] + self._stats['coalesced']
+            return {
+                **self._stats,
+                'in_flight': len(self._calls),
+                'coalesced_rate': self._stats['coalesced'] / total if total else 0.0
+            }
@@ -0,0 +1,219 @@
+"""
+Prediction Store Module
+Persistent local cache of scored feature vectors, keyed by content hash and model version.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+class PredictionStore:
+    """SQLite-backed store of placement/salary results for encoded feature vectors"""
+
+    # SQLite limits the number of bound parameters per statement
+    QUERY_CHUNK = 500
+
+    def __init__(self, path, max_entries=100000, evict_every=1000):
+        """
+        Open (or create) the store
+
+        Args:
+            path: SQLite database file
+            max_entries: Upper bound on stored rows; least recently used rows are evicted
+            evict_every: Number of writes between eviction passes
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evicted': 0}
+
+        self._connection = None
+        self._pid = None
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS predictions (
+                key TEXT PRIMARY KEY,
+                model_version TEXT NOT NULL,
+                placement TEXT NOT NULL,
+                salary TEXT,
+                explanation TEXT,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_predictions_last_access ON predictions (last_access)"
+        )
+        self._conn.commit()
+
+    @property
+    def _conn(self):
+        """Connection of the current process (reopened in forked workers)"""
+        if self._pid != os.getpid():
+            # A SQLite connection must not be used across fork
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def make_keys(features, model_version):
+        """
+        Compute content-hash keys for encoded feature rows
+
+        Args:
+            features: 2D array-like of encoded features (one row per student)
+            model_version: Version string of the models that score the rows
+
+        Returns:
+            List of hex digests, one per row
+        """
+        matrix = np.ascontiguousarray(features, dtype=np.float64)
+        prefix = model_version.encode()
+        return [hashlib.sha256(prefix + row.tobytes()).hexdigest() for row in matrix]
+
+    def get_many(self, keys):
+        """
+        Look up stored results
+
+        Args:
+            keys: Keys produced by make_keys
+
+        Returns:
+            dict mapping found keys to {'placement', 'salary', 'shap_explanations'}
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(unique_keys), self.QUERY_CHUNK):
+                chunk = unique_keys[start:start + self.QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, placement, salary, explanation FROM predictions WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, placement, salary, explanation in rows:
+                    found[key] = {
+                        'placement': json.loads(placement),
+                        'salary': json.loads(salary) if salary else None,
+                        'shap_explanations': json.loads(explanation) if explanation else None
+                    }
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE predictions SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            self._stats['hits'] += sum(1 for key in keys if key in found)
+            self._stats['misses'] += sum(1 for key in keys if key not in found)
+
+        return found
+
+    def put_many(self, entries, model_version):
+        """
+        Insert or replace stored results
+
+        Args:
+            entries: dict mapping key to {'placement', 'salary', 'shap_explanations'}
+            model_version: Version string of the models that produced the entries
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        rows = [
+            (
+                key,
+                model_version,
+                json.dumps(entry['placement']),
+                json.dumps(entry['salary']) if entry.get('salary') else None,
+                json.dumps(entry['shap_explanations']) if entry.get('shap_explanations') else None,
+                now,
+                now
+            )
+            for key, entry in entries.items()
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO predictions
+                    (key, model_version, placement, salary, explanation, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            self._conn.commit()
+            self._stats['writes'] += len(rows)
+            self._writes_since_evict += len(rows)
+
+            if self._writes_since_evict >= self.evict_every:
+                self._evict_locked()
+
+    def compact(self, keep_versions=None, vacuum_ratio=0.25):
+        """
+        Drop stale rows, enforce the size bound and reclaim disk space
+
+        Args:
+            keep_versions: Optional iterable of model versions to keep; rows
+                scored by any other version are removed
+            vacuum_ratio: Only VACUUM when at least this fraction of the
+                database pages is free (rewriting the file is slow)
+        """
+        with self._lock:
+            if keep_versions is not None:
+                versions = list(keep_versions)
+                placeholders = ','.join('?' * len(versions))
+                cursor = self._conn.execute(
+                    f"DELETE FROM predictions WHERE model_version NOT IN ({placeholders})",
+                    versions
+                )
+                self._stats['evicted'] += cursor.rowcount
+            self._conn.commit()
+            self._evict_locked()
+            pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if pages and free / pages >= vacuum_ratio:
+                self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _evict_locked(self):
+        """Remove least recently used rows beyond max_entries (caller holds the lock)"""
+        self._writes_since_evict = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            cursor = self._conn.execute(
+                """
+                DELETE FROM predictions WHERE key IN (
+                    SELECT key FROM predictions ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (excess,)
+            )
+            self._conn.commit()
+            self._stats['evicted'] += cursor.rowcount
+
+    def stats(self):
+        """Return hit/miss/write counters and the current row count"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            return {**self._stats, 'entries': entries, 'max_entries': self.max_entries}
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,205 @@
+"""
+Tenant Model Module
+Per-tenant model variants (e.g. per college) loaded lazily into a memory-bounded LRU cache.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+from collections import OrderedDict
+
+import joblib
+
+from singleflight import SingleFlight
+
+# Variants live in models/tenants/<tenant dir>/, listed in models/tenants/index.json
+TENANTS_DIR = 'tenants'
+TENANT_INDEX_FILE = 'index.json'
+
+DEFAULT_CACHE_MB = 256
+
+
+def tenant_dir_name(tenant):
+    """Directory name of a tenant: readable prefix plus a hash, safe on any filesystem"""
+    tenant = str(tenant)
+    prefix = re.sub(r'[^A-Za-z0-9_-]+', '_', tenant)[:48]
+    return f"{prefix}-{hashlib.sha256(tenant.encode()).hexdigest()[:8]}"
+
+
+def estimate_bytes(*objects):
+    """Pickled size of objects, counting array buffers without copying them"""
+    buffers = []
+    size = len(pickle.dumps(objects, protocol=5, buffer_callback=buffers.append))
+    return size + sum(buffer.raw().nbytes for buffer in buffers)
+
+
+def load_tenant_index(models_dir):
+    """Return the tenant index written by train.py, or None when there are no variants"""
+    path = os.path.join(models_dir, TENANTS_DIR, TENANT_INDEX_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+class TenantModelCache:
+    """
+    Lazily loaded tenant model variants with least-recently-used eviction
+
+    Resident variants are bounded by the size of their model files (a close
+    estimate of the memory of the unpickled arrays) plus the size of their
+    SHAP explainers once built, so many tenants do not mean many resident
+    models. Concurrent requests for a tenant that is not
+    resident share one load.
+    """
+
+    def __init__(self, models_dir, index, base_version, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        """
+        Args:
+            models_dir: Directory of the global models
+            index: Tenant index from load_tenant_index
+            base_version: Version of the global models (variants may use the
+                global salary model, so their versions include it)
+            max_bytes: Memory budget for resident variants
+        """
+        self.models_dir = models_dir
+        self.index = index
+        self.base_version = base_version
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+        self._stats = {'hits': 0, 'misses': 0, 'fallbacks': 0, 'loads': 0, 'evictions': 0, 'errors': 0}
+
+    @classmethod
+    def open(cls, models_dir, base_version, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        """Return a cache for the variants next to models_dir, or None if there are none"""
+        index = load_tenant_index(models_dir)
+        if not index or not index.get('tenants'):
+            return None
+        print(f"✓ Found {len(index['tenants'])} tenant model variants (by {index.get('tenant_column')})")
+        return cls(models_dir, index, base_version, max_bytes)
+
+    def __len__(self):
+        return len(self.index['tenants'])
+
+    def get(self, tenant):
+        """
+        Return the variant of a tenant, loading it if needed
+
+        Returns:
+            dict with tenant, model_version, placement_model and salary_model
+            (None when the tenant uses the global salary model), or None when
+            the tenant has no variant or it could not be loaded
+        """
+        info = self.index['tenants'].get(tenant)
+        if info is None:
+            with self._lock:
+                self._stats['fallbacks'] += 1
+            return None
+
+        with self._lock:
+            variant = self._entries.get(tenant)
+            if variant is not None:
+                self._entries.move_to_end(tenant)
+                self._stats['hits'] += 1
+                return variant
+            self._stats['misses'] += 1
+
+        try:
+            variant, _ = self._loads.do(tenant, self._load, tenant, info)
+        except Exception as e:
+            print(f"Warning: Could not load model variant for tenant '{tenant}': {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+                self._stats['fallbacks'] += 1
+            return None
+        return variant
+
+    def _paths(self, info):
+        """Model files of a variant"""
+        variant_dir = os.path.join(self.models_dir, TENANTS_DIR, info['dir'])
+        files = ['placement_model.pkl'] + (['salary_model.pkl'] if info.get('salary_model') else [])
+        return [os.path.join(variant_dir, filename) for filename in files]
+
+    def _version(self, paths):
+        """Version of a variant: the global version plus the content of its files"""
+        digest = hashlib.sha256(self.base_version.encode())
+        for path in paths:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        return digest.hexdigest()[:16]
+
+    def versions(self):
+        """Model versions of every variant (without loading them), e.g. to compact the prediction store"""
+        versions = []
+        for tenant, info in self.index['tenants'].items():
+            try:
+                versions.append(self._version(self._paths(info)))
+            except OSError as e:
+                print(f"Warning: Could not read model variant for tenant '{tenant}': {e}")
+        return versions
+
+    def _load(self, tenant, info):
+        """Load a variant from disk and make it resident, evicting the least recently used"""
+        paths = self._paths(info)
+        variant = {
+            'tenant': tenant,
+            'model_version': self._version(paths),
+            'placement_model': joblib.load(paths[0]),
+            'salary_model': joblib.load(paths[1]) if len(paths) > 1 else None,
+            'bytes': sum(os.path.getsize(path) for path in paths),
+            'explainer': None
+        }
+
+        with self._lock:
+            self._stats['loads'] += 1
+            if variant['bytes'] > self.max_bytes:
+                # Larger than the whole budget: serve it without keeping it
+                return variant
+            self._entries[tenant] = variant
+            self._bytes += variant['bytes']
+            self._evict_locked()
+        return variant
+
+    def attach_explainer(self, variant, explainer):
+        """
+        Keep a variant's SHAP explainer with it, counting it against the budget
+
+        Returns:
+            The variant's explainer (an explainer attached concurrently wins)
+        """
+        size = estimate_bytes(explainer.placement_explainer, explainer.salary_explainer)
+        with self._lock:
+            if variant['explainer'] is not None:
+                return variant['explainer']
+            variant['explainer'] = explainer
+            variant['bytes'] += size
+            if self._entries.get(variant['tenant']) is variant:
+                self._bytes += size
+                self._evict_locked()
+        return explainer
+
+    def _evict_locked(self):
+        """Evict least recently used variants until the budget holds (caller holds the lock)"""
+        while self._entries and self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted['bytes']
+            self._stats['evictions'] += 1
+
+    def stats(self):
+        """Return cache counters and resident size"""
+        with self._lock:
+            return {
+                **self._stats,
+                'tenants': len(self.index['tenants']),
+                'tenant_column': self.index.get('tenant_column'),
+                'resident': len(self._entries),
+                'resident_mb': round(self._bytes / (1024 * 1024), 3),
+                'max_mb': round(self.max_bytes / (1024 * 1024), 3)
+            }
@@ -1,52 +1,66 @@
 """
 Model Training Module
 Trains classification and regression models for placement prediction.
+
+Usage:
+    python train.py [--family linear|gbt] [--compare] [--tenant-column college]
 """
 
+import argparse
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LogisticRegression, LinearRegression
+from sklearn.cluster import KMeans
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error, roc_auc_score
 import joblib
+import json
 import os
+import shutil
+import time
 from preprocessing import PlacementDataPreprocessor
+from explainer import BACKGROUND_SUMMARY_FILE
+from drift import DRIFT_REFERENCE_FILE, build_reference
+from dependence import REFERENCE_SAMPLE_FILE
+from tenants import TENANTS_DIR, TENANT_INDEX_FILE, tenant_dir_name
+from model_families import FAMILIES, DEFAULT_FAMILY, MODEL_META_FILE, get_family, save_model_meta
+
+DATA_PATH = "../data/Placement_Data_Full_Class.csv"
+
+# Parquet cache of the preprocessed dataset (reused while the CSV and
+# preprocessing code are unchanged)
+DATA_CACHE_DIR = "../data/.cache"
 
 class PlacementModelTrainer:
     """Train and evaluate placement prediction models"""
     
-    def __init__(self):
+    def __init__(self, family=DEFAULT_FAMILY):
+        """
+        Args:
+            family: Model family name (see model_families.FAMILIES)
+        """
+        self.family = get_family(family)
         self.placement_model = None
         self.salary_model = None
         self.preprocessor = PlacementDataPreprocessor()
         
     def train_placement_model(self, X_train, y_train):
-        """Train logistic regression for placement classification"""
+        """Train the family's placement classifier"""
         print("\n" + "="*60)
-        print("Training Placement Classification Model")
+        print(f"Training Placement Classification Model ({self.family.placement_model_name})")
         print("="*60)
         
-        # Initialize and train model
-        self.placement_model = LogisticRegression(
-            max_iter=1000,
-            random_state=42,
-            class_weight='balanced'
-        )
-        
-        self.placement_model.fit(X_train, y_train)
+        self.placement_model = self.family.train_placement(X_train, y_train)
         print("✓ Model training completed")
         
         return self.placement_model
     
     def train_salary_model(self, X_train, y_train):
-        """Train linear regression for salary prediction"""
+        """Train the family's salary regressor"""
         print("\n" + "="*60)
-        print("Training Salary Regression Model")
+        print(f"Training Salary Regression Model ({self.family.salary_model_name})")
         print("="*60)
         
-        # Initialize and train model
-        self.salary_model = LinearRegression()
-        self.salary_model.fit(X_train, y_train)
+        self.salary_model = self.family.train_salary(X_train, y_train)
         
         print("✓ Model training completed")
         
@@ -64,18 +78,21 @@ class PlacementModelTrainer:
         
         # Calculate metrics
         accuracy = accuracy_score(y_test, y_pred)
+        roc_auc = roc_auc_score(y_test, y_pred_proba[:, 1])
         
         print(f"\nAccuracy: {accuracy:.4f} ({accuracy*100:.2f}%)")
+        print(f"ROC AUC: {roc_auc:.4f}")
         print("\nClassification Report:")
         print(classification_report(y_test, y_pred, target_names=['Not Placed', 'Placed']))
         print("\nConfusion Matrix:")
         print(confusion_matrix(y_test, y_pred))
         
         # Feature importance
+        weight_name = self.family.weight_name
         feature_importance = pd.DataFrame({
             'feature': self.preprocessor.feature_columns,
-            'coefficient': self.placement_model.coef_[0]
-        }).sort_values('coefficient', ascending=False)
+            weight_name: self.family.feature_weights(self.placement_model)
+        }).sort_values(weight_name, ascending=False)
         
         print("\nTop 5 Most Important Features (Positive Impact):")
         print(feature_importance.head())
@@ -84,6 +101,7 @@ class PlacementModelTrainer:
         
         return {
             'accuracy': accuracy,
+            'roc_auc': roc_auc,
             'feature_importance': feature_importance
         }
     
@@ -106,10 +124,11 @@ class PlacementModelTrainer:
         print(f"MAE: ₹{mae:,.2f}")
         
         # Feature importance
+        weight_name = self.family.weight_name
         feature_importance = pd.DataFrame({
             'feature': self.preprocessor.feature_columns,
-            'coefficient': self.salary_model.coef_
-        }).sort_values('coefficient', ascending=False)
+            weight_name: self.family.feature_weights(self.salary_model)
+        }).sort_values(weight_name, ascending=False)
         
         print("\nTop 5 Most Important Features for Salary:")
         print(feature_importance.head())
@@ -121,32 +140,287 @@ class PlacementModelTrainer:
             'feature_importance': feature_importance
         }
     
-    def save_models(self, models_dir='../models'):
-        """Save trained models and preprocessor"""
+    def save_models(self, models_dir='../models', metrics=None):
+        """Save trained models, preprocessor and family metadata"""
         os.makedirs(models_dir, exist_ok=True)
         
         # Save models
         joblib.dump(self.placement_model, os.path.join(models_dir, 'placement_model.pkl'))
         joblib.dump(self.salary_model, os.path.join(models_dir, 'salary_model.pkl'))
         joblib.dump(self.preprocessor, os.path.join(models_dir, 'preprocessor.pkl'))
+        save_model_meta(models_dir, self.family, metrics)
         
         print(f"\n✓ Models saved to {models_dir}/")
         print("  - placement_model.pkl")
         print("  - salary_model.pkl")
         print("  - preprocessor.pkl")
+        print(f"  - {MODEL_META_FILE} ({self.family.name} family)")
+    
+    def measure_latency(self, X, background, batch_rows=10000, repeats=200):
+        """
+        Measure serving latency of the trained models
+        
+        Args:
+            X: Encoded feature rows to sample from
+            background: Background data for the family's explainer
+            batch_rows: Rows in the batch-throughput test
+            repeats: Single-row calls timed (median reported)
+            
+        Returns:
+            dict with single-row, batch and explanation timings
+        """
+        def median_ms(fn, arg, n):
+            timings = []
+            for _ in range(n):
+                start = time.perf_counter()
+                fn(arg)
+                timings.append((time.perf_counter() - start) * 1000)
+            return float(np.median(timings))
+        
+        row = X.iloc[[0]]
+        batch = X.sample(batch_rows, replace=True, random_state=42)
+        
+        def score(rows):
+            self.placement_model.predict_proba(rows)
+            self.salary_model.predict(rows)
+        
+        batch_ms = median_ms(score, batch, 3)
+        placement_explainer = self.family.explainer(self.placement_model, background)
+        
+        return {
+            'single_row_ms': median_ms(score, row, repeats),
+            'batch_ms': batch_ms,
+            'batch_rows_per_s': batch_rows / (batch_ms / 1000),
+            'explain_row_ms': median_ms(placement_explainer.shap_values, row, repeats // 4)
+        }
+
+    def save_background_summary(self, X_train, models_dir='../models', n_clusters=20):
+        """
+        Save a compact SHAP background summary of the training matrix
+        
+        The summary holds k-means centroids weighted by cluster size plus
+        the exact feature means and covariance, so the explainer can start
+        from a file read instead of generating background data.
+        """
+        os.makedirs(models_dir, exist_ok=True)
+        
+        X = X_train.to_numpy(dtype=np.float64)
+        kmeans = KMeans(n_clusters=min(n_clusters, len(X)), n_init=10, random_state=42).fit(X)
+        weights = np.bincount(kmeans.labels_, minlength=kmeans.n_clusters) / len(X)
+        
+        np.savez(
+            os.path.join(models_dir, BACKGROUND_SUMMARY_FILE),
+            centroids=kmeans.cluster_centers_,
+            weights=weights,
+            means=X.mean(axis=0),
+            cov=np.cov(X, rowvar=False),
+            feature_columns=np.array(self.preprocessor.feature_columns)
+        )
+        
+        print(f"  - {BACKGROUND_SUMMARY_FILE} ({kmeans.n_clusters} centroids)")
+    
+    def save_drift_reference(self, X_train, models_dir='../models'):
+        """Save per-feature reference histograms for live drift monitoring"""
+        os.makedirs(models_dir, exist_ok=True)
+        
+        reference = build_reference(X_train.to_numpy(), self.preprocessor.feature_columns)
+        np.savez(os.path.join(models_dir, DRIFT_REFERENCE_FILE), **reference)
+        
+        print(f"  - {DRIFT_REFERENCE_FILE}")
+    
+    def save_reference_sample(self, X_train, models_dir='../models', max_rows=2000):
+        """Save encoded training rows as the reference population for dependence curves"""
+        os.makedirs(models_dir, exist_ok=True)
+        
+        sample = X_train.sample(n=min(max_rows, len(X_train)), random_state=42)
+        np.savez(
+            os.path.join(models_dir, REFERENCE_SAMPLE_FILE),
+            X=sample.to_numpy(dtype=np.float64),
+            feature_columns=np.array(self.preprocessor.feature_columns)
+        )
+        
+        print(f"  - {REFERENCE_SAMPLE_FILE} ({len(sample)} rows)")
+    
+    def save_golden_set(self, df_test, y_test, models_dir='../models', max_rows=200):
+        """
+        Save held-out students with their true outcome as a golden set
+        
+        The serving side uses it to validate freshly loaded models before
+        they start taking traffic.
+        """
+        os.makedirs(models_dir, exist_ok=True)
+        
+        df_test = df_test.head(max_rows)
+        students = self.preprocessor.decode_inputs(df_test)
+        golden_set = [
+            {'student': student, 'placed': bool(placed)}
+            for student, placed in zip(students, y_test.loc[df_test.index])
+        ]
+        
+        with open(os.path.join(models_dir, 'golden_set.json'), 'w') as f:
+            json.dump(golden_set, f)
+        
+        print(f"  - golden_set.json ({len(golden_set)} students)")
+
+    def train_tenant_variants(self, df, tenant_column, train_index, test_index, salary_index,
+                              models_dir='../models', min_rows=100, min_salary_rows=30):
+        """
+        Train a placement (and, with enough placed students, salary) model per tenant
+        
+        Variants use the global preprocessor and the global train/test split,
+        so each is compared with the global model on the same held-out rows.
+        Tenants with fewer than min_rows training rows keep the global models.
+        
+        Args:
+            df: Preprocessed dataset with the tenant column
+            tenant_column: Column identifying the tenant (e.g. 'college')
+            train_index, test_index: Placement train/test split of df
+            salary_index: Salary training rows of df
+            
+        Returns:
+            The tenant index saved to models/tenants/index.json
+        """
+        print("\n" + "="*60)
+        print(f"Training Tenant Variants (by {tenant_column})")
+        print("="*60)
+        
+        root = os.path.join(models_dir, TENANTS_DIR)
+        shutil.rmtree(root, ignore_errors=True)
+        os.makedirs(root)
+        
+        X, status = self.preprocessor.prepare_features(df, 'status')
+        y = (status == 'Placed').astype(int)
+        index = {'tenant_column': tenant_column, 'family': self.family.name, 'min_rows': min_rows, 'tenants': {}}
+        skipped = 0
+        
+        for tenant, rows in df.groupby(tenant_column, observed=True).groups.items():
+            train = rows.intersection(train_index)
+            if len(train) < min_rows or y.loc[train].nunique() < 2:
+                skipped += 1
+                continue
+            
+            placement_model = self.family.train_placement(X.loc[train], y.loc[train])
+            salary_rows = rows.intersection(salary_index)
+            salary_model = None
+            if len(salary_rows) >= min_salary_rows:
+                salary_model = self.family.train_salary(X.loc[salary_rows], df.loc[salary_rows, 'salary'])
+            
+            entry = {
+                'dir': tenant_dir_name(tenant),
+                'rows': int(len(train)),
+                'salary_model': salary_model is not None
+            }
+            test = rows.intersection(test_index)
+            if len(test):
+                entry['test_rows'] = int(len(test))
+                entry['accuracy'] = float(accuracy_score(y.loc[test], placement_model.predict(X.loc[test])))
+                entry['global_accuracy'] = float(
+                    accuracy_score(y.loc[test], self.placement_model.predict(X.loc[test]))
+                )
+            
+            variant_dir = os.path.join(root, entry['dir'])
+            os.makedirs(variant_dir)
+            joblib.dump(placement_model, os.path.join(variant_dir, 'placement_model.pkl'))
+            if salary_model is not None:
+                joblib.dump(salary_model, os.path.join(variant_dir, 'salary_model.pkl'))
+            index['tenants'][str(tenant)] = entry
+        
+        with open(os.path.join(root, TENANT_INDEX_FILE), 'w') as f:
+            json.dump(index, f, indent=2)
+        
+        evaluated = [entry for entry in index['tenants'].values() if 'accuracy' in entry]
+        print(f"✓ Trained {len(index['tenants'])} tenant variants ({skipped} tenants below "
+              f"{min_rows} rows use the global models)")
+        if evaluated:
+            weights = np.array([entry['test_rows'] for entry in evaluated])
+            variant_accuracy = np.average([entry['accuracy'] for entry in evaluated], weights=weights)
+            global_accuracy = np.average([entry['global_accuracy'] for entry in evaluated], weights=weights)
+            print(f"  Held-out accuracy: variants {variant_accuracy:.4f} vs global {global_accuracy:.4f}")
+        print(f"  - {TENANTS_DIR}/{TENANT_INDEX_FILE}")
+        
+        return index
+    
+    def remove_tenant_variants(self, models_dir='../models'):
+        """Remove tenant variants of an earlier run (they were trained against other global models)"""
+        root = os.path.join(models_dir, TENANTS_DIR)
+        if os.path.isdir(root):
+            shutil.rmtree(root)
+            print(f"  - removed stale {TENANTS_DIR}/")
+
+def summarize_metrics(placement_metrics, salary_metrics, latency):
+    """Flatten evaluation and latency results into JSON-friendly metrics"""
+    return {
+        'accuracy': float(placement_metrics['accuracy']),
+        'roc_auc': float(placement_metrics['roc_auc']),
+        'salary_r2': float(salary_metrics['r2']),
+        'salary_rmse': float(salary_metrics['rmse']),
+        **latency
+    }
+
+def compare_families(preprocessor, placement_split, salary_split):
+    """
+    Train every model family on the same splits and print accuracy and
+    latency side by side
+    """
+    X_train_p, X_test_p, y_train_p, y_test_p = placement_split
+    X_train_s, X_test_s, y_train_s, y_test_s = salary_split
+    
+    results = {}
+    for name in FAMILIES:
+        trainer = PlacementModelTrainer(name)
+        trainer.preprocessor = preprocessor
+        trainer.train_placement_model(X_train_p, y_train_p)
+        placement_metrics = trainer.evaluate_placement_model(X_test_p, y_test_p)
+        trainer.train_salary_model(X_train_s, y_train_s)
+        salary_metrics = trainer.evaluate_salary_model(X_test_s, y_test_s)
+        latency = trainer.measure_latency(X_test_p, X_train_p)
+        results[name] = summarize_metrics(placement_metrics, salary_metrics, latency)
+    
+    print("\n" + "="*60)
+    print("MODEL FAMILY COMPARISON")
+    print("="*60)
+    header = f"{'':22}" + "".join(f"{name:>14}" for name in results)
+    print(header)
+    rows = [
+        ('Accuracy', 'accuracy', '{:.4f}'),
+        ('ROC AUC', 'roc_auc', '{:.4f}'),
+        ('Salary R²', 'salary_r2', '{:.4f}'),
+        ('Salary RMSE (₹)', 'salary_rmse', '{:,.0f}'),
+        ('1-row score (ms)', 'single_row_ms', '{:.3f}'),
+        ('10k-row score (ms)', 'batch_ms', '{:.1f}'),
+        ('Rows/s (batch)', 'batch_rows_per_s', '{:,.0f}'),
+        ('1-row SHAP (ms)', 'explain_row_ms', '{:.3f}')
+    ]
+    for label, key, fmt in rows:
+        print(f"{label:22}" + "".join(f"{fmt.format(metrics[key]):>14}" for metrics in results.values()))
+    
+    return results
 
 def main():
     """Main training pipeline"""
+    parser = argparse.ArgumentParser(description="Train placement and salary models")
+    parser.add_argument('--family', choices=sorted(FAMILIES), default=DEFAULT_FAMILY,
+                        help="Model family to train and save")
+    parser.add_argument('--compare', action='store_true',
+                        help="Also train every family and report accuracy and latency side by side")
+    parser.add_argument('--tenant-column',
+                        help="Also train per-tenant model variants keyed by this column (e.g. college)")
+    parser.add_argument('--min-tenant-rows', type=int, default=100,
+                        help="Training rows a tenant needs for its own variant")
+    args = parser.parse_args()
+    
     print("\n" + "="*60)
     print("COLLEGE PLACEMENT PREDICTION - MODEL TRAINING")
     print("="*60)
     
     # Initialize trainer
-    trainer = PlacementModelTrainer()
+    trainer = PlacementModelTrainer(args.family)
     
     # Preprocess data
     print("\n[1/5] Loading and preprocessing data...")
-    df = trainer.preprocessor.preprocess_pipeline("../data/Placement_Data_Full_Class.csv")
+    df = trainer.preprocessor.preprocess_pipeline(DATA_PATH, cache_dir=DATA_CACHE_DIR)
+    if args.tenant_column and args.tenant_column not in df.columns:
+        parser.error(f"tenant column '{args.tenant_column}' not in dataset")
     
     # Prepare placement classification data
     print("\n[2/5] Preparing placement classification data...")
@@ -176,18 +450,42 @@ def main():
     # Train salary model
     trainer.train_salary_model(X_train_s, y_train_s)
     salary_metrics = trainer.evaluate_salary_model(X_test_s, y_test_s)
+    metrics = summarize_metrics(
+        placement_metrics, salary_metrics, trainer.measure_latency(X_test_p, X_train_p)
+    )
     
     # Save models
     print("\n[5/5] Saving models...")
-    trainer.save_models()
+    trainer.save_models(metrics=metrics)
+    trainer.save_golden_set(df.loc[X_test_p.index], y_test_p)
+    trainer.save_background_summary(X_train_p)
+    trainer.save_drift_reference(X_train_p)
+    trainer.save_reference_sample(X_train_p)
+    
+    if args.tenant_column:
+        trainer.train_tenant_variants(
+            df, args.tenant_column, X_train_p.index, X_test_p.index, X_train_s.index,
+            min_rows=args.min_tenant_rows
+        )
+    else:
+        trainer.remove_tenant_variants()
+    
+    if args.compare:
+        compare_families(
+            trainer.preprocessor,
+            (X_train_p, X_test_p, y_train_p, y_test_p),
+            (X_train_s, X_test_s, y_train_s, y_test_s)
+        )
     
     # Summary
     print("\n" + "="*60)
     print("TRAINING SUMMARY")
     print("="*60)
+    print(f"✓ Model family: {trainer.family.name}")
     print(f"✓ Placement Model Accuracy: {placement_metrics['accuracy']*100:.2f}%")
     print(f"✓ Salary Model R² Score: {salary_metrics['r2']:.4f}")
     print(f"✓ Salary Model RMSE: ₹{salary_metrics['rmse']:,.2f}")
+    print(f"✓ Single-row scoring latency: {metrics['single_row_ms']:.3f}ms")
     print("\n✓ All models trained and saved successfully!")
     print("="*60)
 
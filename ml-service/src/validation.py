@@ -0,0 +1,228 @@
+"""
+Input Validation Module
+Validates raw student inputs against the fitted encoder vocabularies and score ranges.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import INPUT_COLUMNS, CATEGORICAL_COLUMNS
+
+# Percentage scores accepted by the models
+SCORE_RANGE = (0.0, 100.0)
+
+# Per-field error codes
+MISSING_FIELD = 'missing_field'
+INVALID_TYPE = 'invalid_type'
+UNKNOWN_CATEGORY = 'unknown_category'
+NOT_A_NUMBER = 'not_a_number'
+OUT_OF_RANGE = 'out_of_range'
+
+
+class InputValidationError(ValueError):
+    """Raised when a single student record fails validation"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(f"{error['field']}: {error['message']}" for error in errors))
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class InputValidator:
+    """
+    Validation rules compiled from a fitted preprocessor
+
+    Categorical fields must hold one of the values their label encoder was
+    fitted on; scores must be finite numbers in SCORE_RANGE (numeric strings
+    are accepted, as in the request models; booleans are not).
+    """
+
+    def __init__(self, vocabularies, score_range=SCORE_RANGE):
+        """
+        Args:
+            vocabularies: dict mapping each categorical column to its allowed values
+            score_range: (min, max) of the numeric columns
+        """
+        self.vocabularies = {col: list(values) for col, values in vocabularies.items()}
+        self._allowed = {col: frozenset(values) for col, values in self.vocabularies.items()}
+        self.score_range = score_range
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor):
+        """Build the rules from the preprocessor's fitted label encoders"""
+        return cls({
+            col: [str(value) for value in preprocessor.label_encoders[col].classes_]
+            for col in CATEGORICAL_COLUMNS if col in preprocessor.label_encoders
+        })
+
+    def _error(self, field, code, value):
+        """Error entry for one field of one row"""
+        if code == MISSING_FIELD:
+            message = "Field required"
+        elif code == INVALID_TYPE:
+            message = "Expected a string" if field in self._allowed else "Expected a number"
+        elif code == UNKNOWN_CATEGORY:
+            message = f"Unknown value {value!r}; expected one of: {', '.join(self.vocabularies[field])}"
+        elif code == NOT_A_NUMBER:
+            message = "Expected a finite number"
+        else:
+            message = f"Must be between {self.score_range[0]:g} and {self.score_range[1]:g}"
+        error = {'field': field, 'code': code, 'message': message}
+        if code != MISSING_FIELD:
+            error['value'] = value if isinstance(value, (str, int, float, bool)) else repr(value)
+        return error
+
+    def check_value(self, field, value):
+        """
+        Validate one field of one row
+
+        Returns:
+            error dict, or None if the value is valid
+        """
+        if _is_missing(value):
+            return self._error(field, MISSING_FIELD, value)
+
+        if field in self._allowed:
+            if not isinstance(value, str):
+                return self._error(field, INVALID_TYPE, value)
+            if value not in self._allowed[field]:
+                return self._error(field, UNKNOWN_CATEGORY, value)
+            return None
+
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return self._error(field, INVALID_TYPE, value)
+        try:
+            number = float(value)
+        except ValueError:
+            return self._error(field, NOT_A_NUMBER, value)
+        if not math.isfinite(number):
+            return self._error(field, NOT_A_NUMBER, value)
+        if not self.score_range[0] <= number <= self.score_range[1]:
+            return self._error(field, OUT_OF_RANGE, value)
+        return None
+
+    def validate_record(self, record):
+        """
+        Validate a single record (scalar path for /predict)
+
+        Returns:
+            list of error dicts (empty when the record is valid)
+        """
+        if not isinstance(record, dict):
+            return [self._error(None, INVALID_TYPE, record) | {'message': "Expected an object"}]
+        errors = []
+        for col in INPUT_COLUMNS:
+            error = self.check_value(col, record.get(col))
+            if error is not None:
+                errors.append(error)
+        return errors
+
+    def validate_records(self, records):
+        """
+        Validate a batch of loosely typed records with vectorized masks
+
+        Each column is checked for every row at once (vocabulary membership,
+        numeric conversion and range); only rows flagged by a mask are looked
+        at individually to report the precise error.
+
+        Args:
+            records: list of (ideally) dicts with student information
+
+        Returns:
+            (valid boolean array, dict mapping row index to its errors,
+             DataFrame of INPUT_COLUMNS with numeric columns as float64)
+        """
+        n_rows = len(records)
+        is_dict = np.fromiter((isinstance(record, dict) for record in records), dtype=bool, count=n_rows)
+        rows = [record if ok else {} for record, ok in zip(records, is_dict)]
+        # Columns of plain numbers or strings get a native dtype; mixed ones stay object
+        inputs = pd.DataFrame(rows, columns=list(INPUT_COLUMNS))
+
+        errors = {}
+        for i in np.flatnonzero(~is_dict):
+            errors[int(i)] = [self._error(None, INVALID_TYPE, records[i]) | {'message': "Expected an object"}]
+        valid = self._validate_frame(inputs, lambda col, i: rows[i].get(col), is_dict, errors)
+        return valid, errors, inputs
+
+    def validate_columns(self, columns):
+        """
+        Validate column arrays (binary transport) with the same vectorized masks
+
+        Args:
+            columns: dict mapping each of INPUT_COLUMNS to an array of equal length
+
+        Returns:
+            same as validate_records
+
+        Raises:
+            ValueError: if a column is missing (the payload, not a row, is malformed)
+        """
+        missing = [col for col in INPUT_COLUMNS if col not in columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+        arrays = {col: np.asarray(columns[col]) for col in INPUT_COLUMNS}
+        inputs = pd.DataFrame({
+            col: pd.Series(values, dtype=object) if col in self._allowed else pd.Series(values)
+            for col, values in arrays.items()
+        })
+
+        def raw(col, i):
+            value = arrays[col][i]
+            return value.item() if isinstance(value, np.generic) else value
+
+        errors = {}
+        valid = self._validate_frame(inputs, raw, np.ones(len(inputs), dtype=bool), errors)
+        return valid, errors, inputs
+
+    def _validate_frame(self, inputs, raw, rows_mask, errors):
+        """
+        Check every column of inputs with vectorized masks
+
+        Numeric columns of inputs are replaced by their float64 values.
+
+        Args:
+            inputs: DataFrame of INPUT_COLUMNS as submitted
+            raw: Callable (column, row) returning the submitted value, used
+                to report errors of flagged rows
+            rows_mask: Rows to check (others are already rejected)
+            errors: dict mapping row index to its errors, updated in place
+
+        Returns:
+            valid boolean array
+        """
+        bad = ~rows_mask
+        flagged = {}
+        for col in INPUT_COLUMNS:
+            values = inputs[col]
+            missing = values.isna().to_numpy()
+            if col in self._allowed:
+                invalid = missing | ~values.isin(self._allowed[col]).to_numpy()
+            else:
+                numbers = pd.to_numeric(values, errors='coerce').astype(np.float64)
+                invalid = missing | ~numbers.between(*self.score_range).to_numpy()
+                # Booleans convert to 0/1; only those values need a type check
+                suspect = ((numbers == 0) | (numbers == 1)).to_numpy() & ~invalid & rows_mask
+                for i in np.flatnonzero(suspect):
+                    if isinstance(raw(col, i), bool):
+                        invalid[i] = True
+                inputs[col] = numbers
+            invalid &= rows_mask
+            if invalid.any():
+                flagged[col] = np.flatnonzero(invalid)
+                bad |= invalid
+
+        for col, indices in flagged.items():
+            for i in indices:
+                error = self.check_value(col, raw(col, i))
+                if error is None:
+                    # Accepted by the scalar rules but not by the vectorized conversion
+                    error = self._error(col, NOT_A_NUMBER, raw(col, i))
+                errors.setdefault(int(i), []).append(error)
+
+        return ~bad
@@ -0,0 +1,39 @@
+"""
+Shared test fixtures
+
+Service modules are imported from src/. Tests that need trained models use
+MODELS_DIR (default models/) and are skipped until train.py has been run.
+"""
+
+import os
+import sys
+
+import pytest
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SERVICE_DIR, 'src'))
+os.environ.setdefault('MODELS_DIR', os.path.join(SERVICE_DIR, 'models'))
+
+STUDENT = {
+    "gender": "M", "ssc_p": 67.0, "ssc_b": "Others", "hsc_p": 91.0, "hsc_b": "Others",
+    "hsc_s": "Commerce", "degree_p": 58.0, "degree_t": "Sci&Tech", "workex": "No",
+    "etest_p": 55.0, "specialisation": "Mkt&HR", "mba_p": 58.8
+}
+
+
+@pytest.fixture(scope='session')
+def main_module():
+    """The service module with its models loaded"""
+    if not os.path.exists(os.path.join(os.environ['MODELS_DIR'], 'placement_model.pkl')):
+        pytest.skip("Models not trained (run train.py)")
+    import main
+    if main.predictor is None:
+        pytest.skip("Models could not be loaded")
+    return main
+
+
+@pytest.fixture
+def client(main_module):
+    """TestClient for the service (startup warmup is not run)"""
+    from fastapi.testclient import TestClient
+    return TestClient(main_module.app)
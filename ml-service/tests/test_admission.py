@@ -0,0 +1,114 @@
+"""Admission control: quotas, priorities and shedding on every admitted route"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+import columnar
+from admission import AdmissionController, AdmissionRejected, BULK, INTERACTIVE
+from cohort_store import CohortStore
+from conftest import STUDENT
+
+
+def test_anonymous_requests_skip_the_client_quota():
+    controller = AdmissionController(max_concurrent=8, max_per_client=1)
+
+    async def hold(client_id):
+        async with controller.admit(client_id):
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(hold(None) for _ in range(4)))
+        with pytest.raises(AdmissionRejected) as rejected:
+            await asyncio.gather(hold('a'), hold('a'))
+        return rejected.value
+
+    rejected = asyncio.run(run())
+    assert rejected.status_code == 429
+    assert controller.counters['shed']['client_limit'] == 1
+    assert controller.active == 0
+
+
+def test_interactive_request_preempts_queued_bulk_request():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def running():
+            async with controller.admit(None, BULK):
+                await release.wait()
+
+        async def queued(priority):
+            async with controller.admit(None, priority):
+                return priority
+
+        holder = asyncio.create_task(running())
+        await asyncio.sleep(0)
+        bulk = asyncio.create_task(queued(BULK))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(queued(INTERACTIVE))
+        await asyncio.sleep(0)
+        release.set()
+        await holder
+        return await asyncio.gather(bulk, interactive, return_exceptions=True)
+
+    bulk, interactive = asyncio.run(run())
+    assert isinstance(bulk, AdmissionRejected) and bulk.status_code == 503
+    assert interactive == INTERACTIVE
+    assert controller.counters['shed']['preempted'] == 1
+
+
+@pytest.fixture
+def saturated(main_module, monkeypatch, tmp_path):
+    """Admission controller whose only slot is taken and whose queue is full"""
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    controller.active = 1
+    monkeypatch.setattr(main_module, 'admission', controller)
+    monkeypatch.setattr(main_module, 'cohort_store', CohortStore(str(tmp_path)))
+    monkeypatch.setenv('ADMIN_TOKEN', 'test-token')
+    return controller
+
+
+# (method, path, request kwargs) of every route behind admission control
+ADMITTED_ROUTES = [
+    ('post', '/predict', {'json': STUDENT}),
+    ('post', '/predict/batch', {'json': {'students': [STUDENT]}}),
+    ('post', '/predict/columnar', {
+        'content': columnar.encode_columns({col: np.asarray([value]) for col, value in STUDENT.items()}),
+        'headers': {'Content-Type': columnar.MEDIA_TYPE}
+    }),
+    ('post', '/jobs', {'json': {'students': [STUDENT]}}),
+    ('post', '/cohorts/batch', {'json': {'students': [STUDENT]}, 'headers': {'X-Admin-Token': 'test-token'}}),
+    ('post', '/cohort/summary', {'json': {'students': [STUDENT]}}),
+    ('get', '/dependence/placement/mba_p', {}),
+]
+
+
+@pytest.mark.parametrize('method,path,kwargs', ADMITTED_ROUTES, ids=[route[1] for route in ADMITTED_ROUTES])
+def test_saturated_routes_shed_with_retry_after(client, saturated, method, path, kwargs):
+    response = getattr(client, method)(path, **kwargs)
+
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    assert saturated.counters['shed']['queue_full'] == 1
+
+
+def test_jobs_are_capped_per_client(client, main_module, monkeypatch):
+    from jobs import JobManager
+
+    manager = JobManager(lambda: None, max_workers=1, max_active_per_client=1)
+    # Hold the only worker so submitted jobs stay queued
+    blocker = threading.Event()
+    manager._executor.submit(blocker.wait)
+    monkeypatch.setattr(main_module, 'job_manager', manager)
+    body = {'json': {'students': [STUDENT]}}
+
+    assert client.post('/jobs', headers={'X-Client-Id': 'a'}, **body).status_code == 202
+    assert client.post('/jobs', headers={'X-Client-Id': 'a'}, **body).status_code == 429
+    assert client.post('/jobs', headers={'X-Client-Id': 'b'}, **body).status_code == 202
+    assert client.post('/jobs', **body).status_code == 202
+    blocker.set()
+    manager.shutdown()
@@ -0,0 +1,71 @@
+"""Cohort store re-scoring: idempotent and safe across concurrent processes"""
+
+import copy
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cohort_store import CohortStore
+
+
+@pytest.fixture
+def cohort(main_module, tmp_path):
+    """A stored cohort of synthetic students and a predictor with a new model version"""
+    predictor = main_module.predictor
+    store = CohortStore(str(tmp_path))
+    store.create('batch', predictor, pd.DataFrame(predictor.synthetic_records(500, seed=3)))
+    updated = copy.copy(predictor)
+    updated.model_version = 'next-version'
+    return store, predictor, updated
+
+
+def assert_outputs_equal(actual, expected):
+    for field in expected.dtype.names:
+        np.testing.assert_allclose(actual[field], expected[field], rtol=1e-9)
+
+
+def cohort_files(store):
+    return sorted(os.listdir(os.path.join(store.root, 'batch')))
+
+
+def test_rescore_is_idempotent(cohort):
+    store, predictor, updated = cohort
+    stored = np.asarray(store.open('batch')['outputs'])
+
+    first = store.rescore('batch', updated)
+    second = store.rescore('batch', updated)
+
+    assert not first.get('skipped') and first['changed'] == 0
+    assert second['skipped'] and second['to_version'] == 'next-version'
+    assert store.info('batch')['model_version'] == 'next-version'
+    assert_outputs_equal(store.open('batch')['outputs'], stored)
+    assert cohort_files(store) == [
+        'changes-' + predictor.model_version + '-next-version.npy', 'features.npy',
+        'meta.json', 'outputs-next-version.npy'
+    ]
+
+
+def _rescore_in_child(root, predictor, results):
+    results.put(CohortStore(root).rescore('batch', predictor).get('skipped', False))
+
+
+def test_concurrent_rescores_across_processes(cohort):
+    store, _, updated = cohort
+    stored = np.asarray(store.open('batch')['outputs'])
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    workers = [context.Process(target=_rescore_in_child, args=(store.root, updated, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    skipped = sorted(results.get(timeout=5) for _ in workers)
+
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert skipped == [False, True, True, True]
+    assert not any('.tmp' in filename for filename in cohort_files(store))
+    assert_outputs_equal(store.open('batch')['outputs'], stored)
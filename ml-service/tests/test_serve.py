@@ -0,0 +1,66 @@
+"""Pre-fork serving: shared model arrays and reloads run by the parent"""
+
+import gc
+
+import numpy as np
+import pytest
+
+import serve
+from conftest import STUDENT
+
+
+def model_arrays(predictor):
+    slots, seen = [], set()
+    for root in serve._shared_roots(predictor):
+        serve._array_slots(root, slots, seen)
+    return [array for _, _, array in slots]
+
+
+def test_shared_arrays_are_read_only_and_predict_the_same(main_module):
+    from predict import PlacementPredictor
+
+    predictor = PlacementPredictor(models_dir=main_module.MODELS_DIR)
+    records = predictor.synthetic_records(200, seed=5)
+    before = predictor.predict_batch(records, live=False)
+
+    shared = serve.share_arrays(serve._shared_roots(predictor))
+
+    assert shared['arrays'] > 0 and shared['bytes'] > 0
+    assert predictor.predict_batch(records, live=False) == before
+    assert not any(array.flags.writeable for array in model_arrays(predictor))
+
+
+@pytest.fixture
+def serving(main_module, monkeypatch):
+    """Keep the module's predictor and readiness across a reload in the test"""
+    monkeypatch.setattr(main_module, 'predictor', main_module.predictor)
+    monkeypatch.setattr(main_module, 'readiness', dict(main_module.readiness))
+    yield main_module
+    gc.unfreeze()
+
+
+def test_parent_reload_swaps_and_shares_the_new_models(serving):
+    old = serving.predictor
+
+    report = serve.reload_models(serving, 'test')
+
+    assert report['swapped']
+    assert serving.predictor is not old
+    assert serving.readiness['ready'] and serving.readiness['model_version'] == serving.predictor.model_version
+    assert old._shadow_executor is None
+    assert not any(array.flags.writeable for array in model_arrays(serving.predictor))
+    assert serving.predictor.predict_batch([STUDENT], live=False) == old.predict_batch([STUDENT], live=False)
+
+
+def test_worker_forwards_reload_to_the_parent(client, serving, monkeypatch):
+    signals = []
+    monkeypatch.setenv('ADMIN_TOKEN', 'test-token')
+    monkeypatch.setattr(serving, 'worker_pids', np.array([11, 12], dtype=np.int64))
+    monkeypatch.setattr(serving.os, 'kill', lambda pid, signum: signals.append((pid, signum)))
+
+    response = client.post('/admin/reload', headers={'X-Admin-Token': 'test-token'})
+
+    assert response.status_code == 202
+    assert signals == [(serving.os.getppid(), serve.signal.SIGHUP)]
+    stats = client.get('/admission/stats').json()
+    assert stats['scope'] == 'worker' and stats['workers'] == 2
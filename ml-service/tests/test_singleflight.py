@@ -0,0 +1,77 @@
+"""Request coalescing: identical concurrent calls share one computation"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def run_blocked(flight, key, fn, callers):
+    """Start callers for key while the first call is held, then release it"""
+    release = threading.Event()
+
+    def held():
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, held) for _ in range(callers)]
+        wait_for(lambda: flight.stats()['coalesced'] == callers - 1)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_identical_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    results = run_blocked(flight, 'key', lambda: calls.append(1) or object(), callers=8)
+
+    assert len(calls) == 1
+    assert len({id(result) for result, _ in results}) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    errors = run_blocked(flight, 'key', fail, callers=4)
+
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.stats()['errors'] == 1
+    assert flight.do('key', lambda: 42) == (42, False)
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('b', lambda: 2) == (2, False)
+    assert flight.stats()['executed'] == 2 and flight.stats()['coalesced'] == 0
+
+
+def test_concurrent_predictions_agree(main_module):
+    from conftest import STUDENT
+
+    predictor = main_module.predictor
+    if predictor.single_flight is None:
+        pytest.skip("Coalescing disabled (COALESCE_REQUESTS=0)")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: predictor.predict_complete(dict(STUDENT), explain=False), range(8)))
+
+    assert all(result == results[0] for result in results)